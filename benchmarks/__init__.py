@@ -0,0 +1,17 @@
+"""Benchmarks for page render time and data-path scaling.
+
+Pages are driven headlessly through Streamlit's AppTest against a store
+filled with ``rows`` funds, investors, KYC applications and ownership edges,
+one fresh process per size so caches and memory start cold. For each page
+the suite records the first run, the median of warm reruns, the size of the
+rendered element protos (what a browser session receives) and the peak
+Python heap during a rerun (tracemalloc). The data paths behind the pages
+(sample generation, KPI aggregation, chart building) are timed on their own
+at the same sizes.
+
+Results are written as JSON keyed by (suite, name, rows), so two runs can be
+compared across commits:
+
+    python -m benchmarks --sizes 10,1000,100000,1000000 --output bench.json
+    python -m benchmarks --compare baseline.json bench.json
+"""
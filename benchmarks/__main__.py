@@ -0,0 +1,115 @@
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+
+from benchmarks import data_paths
+from benchmarks.fixtures import activity_dir, build_store, fixture_path
+
+ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_SIZES = (10, 1_000, 100_000, 1_000_000)
+# Relative change below which --compare reports a metric as unchanged
+NOISE = 0.10
+
+
+def _git(*args):
+    try:
+        return subprocess.run(['git', *args], cwd=ROOT, capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_pages(db_path, rows, pages, reruns, timeout):
+    command = [sys.executable, '-m', 'benchmarks.pages', '--rows', str(rows), '--reruns', str(reruns),
+               '--timeout', str(timeout)]
+    if pages:
+        command += ['--pages', *pages]
+    env = {**os.environ, 'FUND_ADMIN_DB': str(db_path), 'FUND_ADMIN_ACTIVITY_DIR': str(activity_dir(db_path)),
+           'PYTHONPATH': os.pathsep.join(filter(None, (
+        str(ROOT), os.environ.get('PYTHONPATH'))))}
+    completed = subprocess.run(command, cwd=ROOT, env=env, capture_output=True, text=True)
+    records = [json.loads(line) for line in completed.stdout.splitlines() if line.startswith('{')]
+    if completed.returncode:
+        records.append({'suite': 'page', 'name': '*', 'rows': rows, 'error': completed.stderr.strip()[-2000:]})
+    return records
+
+
+def compare(baseline_path, current_path):
+    """Print every metric that moved by more than NOISE between two result files."""
+    def load(path):
+        with open(path) as f:
+            report = json.load(f)
+        return report, {(r['suite'], r['name'], r['rows']): r for r in report['results']}
+
+    (base_report, base), (report, current) = load(baseline_path), load(current_path)
+    print(f"{base_report.get('commit') or baseline_path} -> {report.get('commit') or current_path}")
+    for key, record in current.items():
+        before = base.get(key)
+        if before is None:
+            continue
+        for metric, value in record.items():
+            old = before.get(metric)
+            if metric in ('suite', 'name', 'rows') or not isinstance(value, (int, float)) or not old:
+                continue
+            change = value / old - 1
+            if abs(change) > NOISE:
+                print(f"  {key[0]:<4} {key[1]:<40} {key[2]:>9,}  {metric:<18} {old:>14,.1f} -> {value:>14,.1f} "
+                      f"({change:+.0%})")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Page render and data-path benchmarks")
+    parser.add_argument('--sizes', default=','.join(map(str, DEFAULT_SIZES)),
+                        help="comma-separated row counts (default: %(default)s)")
+    parser.add_argument('--pages', nargs='*', help="pages to render (default: all)")
+    parser.add_argument('--data', nargs='*', help="data-path benchmarks to run (default: all)")
+    parser.add_argument('--skip-pages', action='store_true')
+    parser.add_argument('--skip-data', action='store_true')
+    parser.add_argument('--reruns', type=int, default=5, help="warm reruns per page")
+    parser.add_argument('--repeat', type=int, default=5, help="repetitions per data-path benchmark")
+    parser.add_argument('--timeout', type=float, default=600, help="seconds allowed per page run")
+    parser.add_argument('--workdir', type=Path, default=Path(tempfile.gettempdir()) / 'fund_admin_bench',
+                        help="where fixture stores are kept between runs")
+    parser.add_argument('--output', type=Path, default=Path('bench.json'))
+    parser.add_argument('--compare', nargs=2, metavar=('BASELINE', 'CURRENT'), type=Path,
+                        help="compare two result files instead of running")
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    args.workdir.mkdir(parents=True, exist_ok=True)
+    results = []
+    for rows in (int(size) for size in args.sizes.split(',')):
+        path = fixture_path(args.workdir, rows)
+        store = build_store(path, rows)
+        if not args.skip_data:
+            results.extend(data_paths.run(store, rows, args.repeat, args.data))
+        if not args.skip_pages:
+            results.extend(run_pages(path, rows, args.pages, args.reruns, args.timeout))
+        for record in results:
+            if record['rows'] == rows:
+                metric = record.get('rerun_ms', record.get('ms'))
+                status = f"{metric:,.1f} ms" if metric is not None else f"error: {record.get('error', '')[:80]}"
+                print(f"{rows:>9,}  {record['suite']:<4} {record['name']:<40} {status}", flush=True)
+
+    report = {
+        'commit': _git('rev-parse', '--short', 'HEAD'),
+        'dirty': bool(_git('status', '--porcelain', '--untracked-files=no')),
+        'created_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'results': results,
+    }
+    args.output.write_text(json.dumps(report, indent=2))
+    print(f"Results written to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+"""Microbenchmarks of the data paths behind the pages, at a given size."""
+from benchmarks.fixtures import activity_dir
+from benchmarks.harness import peak_bytes, result, time_ms
+
+TRADING_DAYS = 252
+CHART_WIDTH_PX = 700
+KPI_UPDATES = 1_000
+FEED_EVENTS = 10
+
+
+def benchmarks(store, rows):
+    """(name, callable) pairs exercising ``rows`` rows each; ``store`` is the fixture store of that size."""
+    import plotly.express as px
+
+    from fund_admin import activity, analytics, charts, data, kpis, sample_data
+    from fund_admin.register import Register
+
+    n_funds = -(-rows // TRADING_DAYS)
+    periods = min(rows, TRADING_DAYS)
+    # One long series for the downsamplers; minute steps keep 10^6 points inside pandas' date range
+    series = sample_data.generate_performance(n_funds=1, periods=rows, freq='min')
+    x, y = series['Date'].to_numpy(), series['Index'].to_numpy()
+    funds = store.query_df(data.FUNDS_SQL)
+    levels = analytics.to_levels(sample_data.generate_performance(n_funds=n_funds, periods=periods, freq='B'))
+    returns = analytics.log_returns(levels.values)
+    aggregator = kpis.KpiAggregator.from_store(store)
+    log = activity.ActivityLog(activity_dir(store.path))
+
+    def kyc_summary():
+        params = {'jurisdiction': None, 'investor_type': None, 'months': 6}
+        for sql in (data.KYC_STATUS_SQL, data.KYC_RISK_SQL, data.KYC_TIMELINE_SQL):
+            store.query_df(sql, params)
+
+    def kpi_updates():
+        for _ in range(KPI_UPDATES):
+            aggregator.record_fund('Pending')
+            aggregator.snapshot()
+
+    return [
+        ('sample_data.generate_performance',
+         lambda: sample_data.generate_performance(n_funds=n_funds, periods=periods, freq='B')),
+        ('sample_data.generate_kyc_applications', lambda: sample_data.generate_kyc_applications(rows)),
+        ('data.funds_query', lambda: store.query_df(data.FUNDS_SQL)),
+        ('data.kyc_summary_queries', kyc_summary),
+        ('kpis.prime_from_store', lambda: kpis.KpiAggregator.from_store(store)),
+        (f'kpis.record_fund_x{KPI_UPDATES}', kpi_updates),
+        ('register.from_store', lambda: Register.from_store(store)),
+        ('analytics.rolling_metrics',
+         lambda: analytics.rolling_metrics(levels.values, min(TRADING_DAYS // 4, periods - 1), TRADING_DAYS)),
+        ('analytics.correlation', lambda: analytics.correlation(returns)),
+        ('charts.minmax_downsample', lambda: charts.minmax_downsample(x, y, CHART_WIDTH_PX)),
+        ('charts.lttb_downsample', lambda: charts.lttb_downsample(x, y, 2 * CHART_WIDTH_PX)),
+        ('activity.tail', lambda: log.tail(FEED_EVENTS)),
+        ('activity.tail_by_fund_status',
+         lambda: log.tail(FEED_EVENTS, fund=funds['Fund Name'].iloc[0], status=activity.FLAGGED)),
+        ('charts.aum_pie', lambda: px.pie(funds, values='AUM (Million $)', names='Fund Name').to_json()),
+    ]
+
+
+def run(store, rows, repeat=5, names=None):
+    """Time every data-path benchmark (or those in ``names``) at ``rows`` rows; returns result records."""
+    records = []
+    for name, func in benchmarks(store, rows):
+        if names and name not in names:
+            continue
+        ms, max_ms = time_ms(func, repeat)
+        records.append(result('data', name, rows, ms=ms, max_ms=max_ms, peak_memory_bytes=peak_bytes(func)))
+    return records
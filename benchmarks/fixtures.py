@@ -0,0 +1,101 @@
+"""Stores of a given size for the benchmarks.
+
+A fixture store holds ``rows`` funds (the four sample funds first, so the
+onboarding forms' fund lists still resolve), ``rows`` investors, ``rows``
+KYC applications and ``rows`` ownership edges into the sample funds, with an
+activity log of ``rows`` events beside it. NAV
+inputs are not generated: the engines have their own benchmarks in their
+CLIs, and the pages only read the published figures.
+"""
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from fund_admin import options
+from fund_admin.activity import STATUSES, ActivityLog
+from fund_admin.sample_data import SAMPLE_SEED, generate_kyc_applications, generate_sample_data
+from fund_admin.store import Store
+
+
+def fixture_path(workdir, rows):
+    return Path(workdir) / f'bench_{rows}.db'
+
+
+def activity_dir(path):
+    """Activity log directory of the fixture store at ``path``."""
+    return Path(path).with_suffix('.activity')
+
+
+def fund_frame(rows, seed=SAMPLE_SEED):
+    rng = np.random.default_rng(seed)
+    sample = generate_sample_data(seed)[0].rename(columns={
+        'Fund Name': 'name', 'AUM (Million $)': 'aum_musd', 'Investors': 'investors', 'Status': 'status',
+        'Launch Date': 'launch_date', 'Management Fee (%)': 'management_fee',
+        'Performance Fee (%)': 'performance_fee', 'Hurdle Rate (%)': 'hurdle_rate',
+    }).head(rows)
+    k = rows - len(sample)
+    generated = pd.DataFrame({
+        'name': [f'Bench Fund {i:07d}' for i in range(1, k + 1)],
+        'aum_musd': rng.lognormal(5, 1, k).round(1),
+        'investors': rng.integers(1, 500, k),
+        'status': rng.choice(options.FUND_STATUSES, k, p=[0.9, 0.1]),
+        'launch_date': (pd.Timestamp('2015-01-01') + pd.to_timedelta(rng.integers(0, 3300, k), unit='D'))
+        .strftime('%Y-%m-%d'),
+        'management_fee': rng.choice([1.0, 1.5, 2.0], k),
+        'performance_fee': rng.choice([10.0, 15.0, 20.0], k),
+        'hurdle_rate': rng.choice([0.0, 4.0, 8.0], k),
+    })
+    return pd.concat([sample, generated], ignore_index=True)
+
+
+def investor_frame(rows, seed=SAMPLE_SEED):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'investor_type': rng.choice(options.INVESTOR_TYPES, rows),
+        'first_name': 'Investor',
+        'last_name': [f'{i:07d}' for i in range(1, rows + 1)],
+        'fund': rng.choice(options.FUND_NAMES, rows),
+        'investment_amount': rng.integers(10, 5_000, rows) * 1_000.0,
+        'status': rng.choice(['Active', 'Pending'], rows, p=[0.8, 0.2]),
+    })
+
+
+def edge_frame(rows, seed=SAMPLE_SEED):
+    rng = np.random.default_rng(seed)
+    owned = rng.choice(options.FUND_NAMES, rows)
+    return pd.DataFrame({
+        'owner': [f'Holder {i:07d}' for i in range(1, rows + 1)],
+        'owned': owned,
+        'share': rng.uniform(0.1, 1.0, rows) / rows * len(options.FUND_NAMES),
+    })
+
+
+def build_store(path, rows, seed=SAMPLE_SEED):
+    """Fill the fixture store at ``path`` with ``rows`` rows per table, unless a previous run already did."""
+    store = Store(path, pool_size=1)
+    if store.is_empty('funds'):
+        # One transaction, so an interrupted build leaves an empty store behind
+        with store.transaction() as conn:
+            store.insert_many('funds', fund_frame(rows, seed), conn=conn)
+            store.insert_many('investors', investor_frame(rows, seed), conn=conn)
+            store.insert_many('kyc_applications', generate_kyc_applications(rows, seed), conn=conn)
+            store.insert_many('ownership_edges', edge_frame(rows, seed), conn=conn)
+    build_activity_log(activity_dir(path), rows, seed)
+    return store
+
+
+def build_activity_log(directory, rows, seed=SAMPLE_SEED, batch=100_000):
+    """Fill the activity log in ``directory`` with ``rows`` events spread over the sample funds."""
+    log = ActivityLog(directory)
+    rng = np.random.default_rng(seed)
+    try:
+        for start in range(len(log), rows, batch):
+            count = min(batch, rows - start)
+            funds = rng.choice(options.FUND_NAMES, count)
+            statuses = rng.choice(STATUSES, count, p=[0.7, 0.15, 0.1, 0.05])
+            log.append_many({'message': f"Benchmark event {start + i:,}", 'status': status, 'fund': fund}
+                            for i, (fund, status) in enumerate(zip(funds.tolist(), statuses.tolist())))
+    finally:
+        log.close()
+
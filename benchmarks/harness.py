@@ -0,0 +1,29 @@
+"""Timing and memory helpers shared by the page and data-path benchmarks."""
+import statistics
+import time
+import tracemalloc
+
+
+def time_ms(func, repeat=5):
+    """Median and max wall time of ``repeat`` calls to ``func``, in ms."""
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples), max(samples)
+
+
+def peak_bytes(func):
+    """Peak Python heap allocated while ``func`` runs (numpy buffers included, SQLite's own memory not)."""
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def result(suite, name, rows, **metrics):
+    return {'suite': suite, 'name': name, 'rows': rows, **metrics}
@@ -0,0 +1,62 @@
+"""Page render benchmarks, run in a child process per fixture store.
+
+The store is selected through FUND_ADMIN_DB, which fund_admin.store reads on
+import, so the parent starts one process per size:
+
+    FUND_ADMIN_DB=bench_1000.db python -m benchmarks.pages --rows 1000
+"""
+import argparse
+import json
+import logging
+import time
+from pathlib import Path
+
+from benchmarks.harness import peak_bytes, result, time_ms
+
+HOME = Path(__file__).resolve().parent.parent / 'Home.py'
+
+
+def payload_bytes(node):
+    """Serialized size of every element and block proto under ``node``."""
+    proto = getattr(node, 'proto', None)
+    size = proto.ByteSize() if hasattr(proto, 'ByteSize') else 0
+    return size + sum(payload_bytes(child) for child in (getattr(node, 'children', None) or {}).values())
+
+
+def bench_page(page, rows, reruns=5, timeout=600):
+    from streamlit.testing.v1 import AppTest
+
+    app = AppTest.from_file(str(HOME), default_timeout=timeout)
+    app.session_state.current_page = page
+    started = time.perf_counter()
+    app.run()
+    first_run_ms = (time.perf_counter() - started) * 1000
+    if app.exception:
+        return result('page', page, rows, error=app.exception[0].value)
+    rerun_ms, rerun_max_ms = time_ms(app.run, reruns)
+    return result('page', page, rows, first_run_ms=first_run_ms, rerun_ms=rerun_ms, rerun_max_ms=rerun_max_ms,
+                  payload_bytes=payload_bytes(app._tree), peak_memory_bytes=peak_bytes(app.run))
+
+
+def main(argv=None):
+    from fund_admin.views import PAGES
+
+    parser = argparse.ArgumentParser(description="Render every page of Home.py against the configured store")
+    parser.add_argument('--rows', type=int, required=True, help="size of the store, recorded with the results")
+    parser.add_argument('--pages', nargs='*', default=list(PAGES))
+    parser.add_argument('--reruns', type=int, default=5)
+    parser.add_argument('--timeout', type=float, default=600, help="seconds allowed per page run")
+    args = parser.parse_args(argv)
+
+    # Over-budget reruns are expected at the larger sizes
+    logging.getLogger('fund_admin.timing').setLevel(logging.ERROR)
+    for page in args.pages:
+        try:
+            record = bench_page(page, args.rows, args.reruns, args.timeout)
+        except RuntimeError as exc:  # AppTest timeout
+            record = result('page', page, args.rows, error=str(exc))
+        print(json.dumps(record), flush=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1 @@
+"""Support modules for the Fund Administration System demo (Home.py)."""
@@ -0,0 +1,346 @@
+"""Append-only activity log behind the Dashboard's Recent Activities feed.
+
+Every onboarding, relationship and KYC action appends one event (a JSON
+line) to the current segment file under FUND_ADMIN_ACTIVITY_DIR. Segments
+are named after the sequence number of their first event and rolled over
+once they reach SEGMENT_BYTES; nothing is ever rewritten, so the log doubles
+as the audit trail.
+
+Each segment has a fixed-width offset index alongside it: the byte offset
+and length of every event plus hashes of its fund and status. An unfiltered
+tail() walks the index backwards in chunks through a memory map and seeks
+straight to the events. Filtered reads go through per-key posting files
+under ``keys/``, one per fund, status and fund/status pair, each listing
+the sequence numbers of its events in order: tail() reads the end of one
+posting file and looks each event up through its segment's index, so the
+cost of a read grows with the number of events returned, however rare the
+key, rather than with the size of the history. Appends from threads and
+processes are serialised with a lock file; postings are written after the
+index, and ``keys/WATERMARK`` records how far they are complete, so they are
+caught up from the index after a writer dies between the two (or for a log
+written before postings existed).
+"""
+import argparse
+import bisect
+import json
+import mmap
+import os
+import threading
+import zlib
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+from fund_admin.store import DB_PATH
+
+try:
+    import fcntl
+except ImportError:  # Windows: appends are serialised within the process only
+    fcntl = None
+
+ACTIVITY_DIR = Path(os.environ.get('FUND_ADMIN_ACTIVITY_DIR', DB_PATH.parent / 'activity'))
+SEGMENT_BYTES = int(os.environ.get('FUND_ADMIN_ACTIVITY_SEGMENT_BYTES', 64 * 2 ** 20))
+# Index entries scanned per step of a tail read
+INDEX_CHUNK = 4096
+
+INDEX_DTYPE = np.dtype([('offset', '<u8'), ('length', '<u4'), ('fund', '<u4'), ('status', '<u4')])
+POSTING_DTYPE = np.dtype('<u8')
+
+COMPLETED, PENDING, IN_PROGRESS, FLAGGED = STATUSES = 'Completed', 'Pending', 'In Progress', 'Flagged'
+
+
+def _key(value):
+    # 0 is reserved for "no value", so a hash that lands on it is moved to 1
+    return (zlib.crc32(value.encode()) or 1) if value else 0
+
+
+def _segment_name(first_seq):
+    return f'{first_seq:020d}'
+
+
+def _posting_names(fund_key, status_key):
+    """Posting files listing an event with these key hashes (or, for a query, the one file to read)."""
+    if fund_key and status_key:
+        return [f'f{fund_key:08x}', f's{status_key:08x}', f'p{fund_key:08x}{status_key:08x}']
+    return [f'f{fund_key:08x}'] if fund_key else [f's{status_key:08x}'] if status_key else []
+
+
+class ActivityLog:
+    def __init__(self, directory=ACTIVITY_DIR, segment_bytes=SEGMENT_BYTES):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.segment_bytes = segment_bytes
+        self._keys = self.directory / 'keys'
+        self._keys.mkdir(exist_ok=True)
+        self._lock = threading.Lock()
+        self._lock_file = open(self.directory / 'LOCK', 'a')
+        self._head = None  # (first_seq, log file, index file) of the segment being appended to
+
+    def _segments(self):
+        """First sequence number of every segment, oldest first."""
+        return sorted(int(path.stem) for path in self.directory.glob('*.log'))
+
+    def _paths(self, first_seq):
+        name = _segment_name(first_seq)
+        return self.directory / f'{name}.log', self.directory / f'{name}.idx'
+
+    def _open_head(self):
+        segments = self._segments()
+        first_seq = segments[-1] if segments else 0
+        if self._head is None or self._head[0] != first_seq:
+            self._close_head()
+            log_path, index_path = self._paths(first_seq)
+            self._head = (first_seq, open(log_path, 'ab+'), open(index_path, 'ab+'))
+        self._repair()
+        self._sync_postings()
+
+    def _close_head(self):
+        if self._head is not None:
+            self._head[1].close()
+            self._head[2].close()
+            self._head = None
+
+    def _repair(self):
+        """Bring the head's index in line with its log after a writer died between the two writes."""
+        _, log, index = self._head
+        log_size = os.fstat(log.fileno()).st_size
+        index_size = os.fstat(index.fileno()).st_size
+        index.truncate(index_size - index_size % INDEX_DTYPE.itemsize)
+        entries = index_size // INDEX_DTYPE.itemsize
+        end = 0
+        if entries:
+            index.seek((entries - 1) * INDEX_DTYPE.itemsize)
+            last = np.frombuffer(index.read(INDEX_DTYPE.itemsize), INDEX_DTYPE)[0]
+            end = int(last['offset'] + last['length'])
+        if end == log_size:
+            return
+        log.seek(end)
+        tail = log.read()
+        complete = tail[:tail.rfind(b'\n') + 1]
+        rows, offset = [], end
+        for line in complete.splitlines(keepends=True):
+            event = json.loads(line)
+            rows.append((offset, len(line), _key(event.get('fund')), _key(event.get('status'))))
+            offset += len(line)
+        log.truncate(offset)
+        index.seek(0, os.SEEK_END)
+        index.write(np.array(rows, INDEX_DTYPE).tobytes())
+        index.flush()
+
+    def _watermark(self):
+        """Sequence number up to which the posting files are complete."""
+        try:
+            return int.from_bytes((self._keys / 'WATERMARK').read_bytes(), 'little')
+        except FileNotFoundError:
+            return 0
+
+    def _set_watermark(self, seq):
+        tmp = self._keys / 'WATERMARK.tmp'
+        tmp.write_bytes(seq.to_bytes(8, 'little'))
+        os.replace(tmp, self._keys / 'WATERMARK')
+
+    def _append_postings(self, first_seq, fund_keys, status_keys, truncate=False):
+        """List events ``first_seq``, ``first_seq + 1``, ... in the posting files of their keys.
+
+        With ``truncate``, entries from ``first_seq`` on left by an interrupted write are dropped first.
+        """
+        postings = {}
+        for seq, fund_key, status_key in zip(range(first_seq, first_seq + len(fund_keys)), fund_keys, status_keys):
+            for name in _posting_names(fund_key, status_key):
+                postings.setdefault(name, []).append(seq)
+        for name, seqs in postings.items():
+            with open(self._keys / f'{name}.pos', 'ab+') as f:
+                if truncate:
+                    count = os.fstat(f.fileno()).st_size // POSTING_DTYPE.itemsize
+                    keep = count - min(count, len(seqs))
+                    f.seek(keep * POSTING_DTYPE.itemsize)
+                    keep += int(np.searchsorted(np.frombuffer(f.read(), POSTING_DTYPE), first_seq))
+                    f.truncate(keep * POSTING_DTYPE.itemsize)
+                f.write(np.array(seqs, POSTING_DTYPE).tobytes())
+
+    def _sync_postings(self):
+        """Catch the posting files up with the segment indexes, one segment at a time."""
+        done, total = self._watermark(), len(self)
+        if done >= total:
+            return
+        for first_seq in self._segments():
+            index_path = self._paths(first_seq)[1]
+            entries = index_path.stat().st_size // INDEX_DTYPE.itemsize if index_path.exists() else 0
+            if first_seq + entries <= done:
+                continue
+            start = max(done - first_seq, 0)
+            rows = np.fromfile(index_path, INDEX_DTYPE, count=entries - start,
+                               offset=start * INDEX_DTYPE.itemsize)
+            self._append_postings(first_seq + start, rows['fund'].tolist(), rows['status'].tolist(), truncate=True)
+            done = first_seq + entries
+            self._set_watermark(done)
+
+    def _lock_files(self):
+        if fcntl is not None:
+            fcntl.flock(self._lock_file, fcntl.LOCK_EX)
+
+    def _unlock_files(self):
+        if fcntl is not None:
+            fcntl.flock(self._lock_file, fcntl.LOCK_UN)
+
+    def append_many(self, events):
+        """Append events (dicts with at least ``message``) in order; returns their sequence numbers."""
+        events = list(events)
+        if not events:
+            return range(0)
+        now = datetime.now().isoformat(timespec='seconds')
+        with self._lock:
+            self._lock_files()
+            try:
+                self._open_head()
+                first_seq, log, index = self._head
+                if os.fstat(log.fileno()).st_size >= self.segment_bytes:
+                    entries = os.fstat(index.fileno()).st_size // INDEX_DTYPE.itemsize
+                    log_path, index_path = self._paths(first_seq + entries)
+                    self._close_head()
+                    self._head = (first_seq + entries, open(log_path, 'ab+'), open(index_path, 'ab+'))
+                    first_seq, log, index = self._head
+                seq = first_seq + os.fstat(index.fileno()).st_size // INDEX_DTYPE.itemsize
+                offset = os.fstat(log.fileno()).st_size
+                lines, rows = [], []
+                for i, event in enumerate(events):
+                    event = {'seq': seq + i, 'ts': now, 'status': COMPLETED, **event}
+                    line = (json.dumps(event, separators=(',', ':'), default=str) + '\n').encode()
+                    lines.append(line)
+                    rows.append((offset, len(line), _key(event.get('fund')), _key(event['status'])))
+                    offset += len(line)
+                log.seek(0, os.SEEK_END)
+                log.write(b''.join(lines))
+                log.flush()
+                index.seek(0, os.SEEK_END)
+                index.write(np.array(rows, INDEX_DTYPE).tobytes())
+                index.flush()
+                self._append_postings(seq, [row[2] for row in rows], [row[3] for row in rows])
+                self._set_watermark(seq + len(events))
+            finally:
+                self._unlock_files()
+        return range(seq, seq + len(events))
+
+    def append(self, message, status=COMPLETED, fund=None, **fields):
+        return self.append_many([{'message': message, 'status': status, 'fund': fund, **fields}])[0]
+
+    def tail(self, n, fund=None, status=None):
+        """The last ``n`` events, newest first, optionally only those of one fund and/or status."""
+        if fund or status:
+            return self._tail_key(n, fund, status)
+        events = []
+        for first_seq in reversed(self._segments()):
+            log_path, index_path = self._paths(first_seq)
+            try:
+                size = index_path.stat().st_size // INDEX_DTYPE.itemsize
+            except FileNotFoundError:
+                continue
+            if not size:
+                continue
+            with open(index_path, 'rb') as index_file, open(log_path, 'rb') as log, \
+                    mmap.mmap(index_file.fileno(), size * INDEX_DTYPE.itemsize, access=mmap.ACCESS_READ) as view:
+                stop = size
+                while stop > 0 and len(events) < n:
+                    start = max(stop - INDEX_CHUNK, 0)
+                    # Copied out of the map, so no buffer is still exported when it closes
+                    chunk = np.frombuffer(view, INDEX_DTYPE, count=stop - start,
+                                          offset=start * INDEX_DTYPE.itemsize).copy()
+                    for offset, length in chunk[['offset', 'length']][::-1].tolist():
+                        log.seek(offset)
+                        events.append(json.loads(log.read(length)))
+                        if len(events) == n:
+                            break
+                    stop = start
+            if len(events) == n:
+                break
+        return events
+
+    def _tail_key(self, n, fund, status):
+        """tail() of one fund and/or status, read through its posting file."""
+        if self._watermark() < len(self):
+            with self._lock:
+                self._lock_files()
+                try:
+                    self._sync_postings()
+                finally:
+                    self._unlock_files()
+        name, = _posting_names(_key(fund), _key(status))[-1:]
+        segments = self._segments()
+        files = {}  # first_seq -> (index file, log file)
+        events = []
+        try:
+            with open(self._keys / f'{name}.pos', 'rb') as postings:
+                stop = os.fstat(postings.fileno()).st_size // POSTING_DTYPE.itemsize
+                while stop > 0 and len(events) < n:
+                    start = max(stop - min(INDEX_CHUNK, 2 * n), 0)
+                    postings.seek(start * POSTING_DTYPE.itemsize)
+                    for seq in np.frombuffer(postings.read((stop - start) * POSTING_DTYPE.itemsize),
+                                             POSTING_DTYPE)[::-1].tolist():
+                        first_seq = segments[bisect.bisect_right(segments, seq) - 1]
+                        if first_seq not in files:
+                            index_path, log_path = self._paths(first_seq)[::-1]
+                            files[first_seq] = (open(index_path, 'rb'), open(log_path, 'rb'))
+                        index, log = files[first_seq]
+                        index.seek((seq - first_seq) * INDEX_DTYPE.itemsize)
+                        entry = np.frombuffer(index.read(INDEX_DTYPE.itemsize), INDEX_DTYPE)[0]
+                        log.seek(int(entry['offset']))
+                        event = json.loads(log.read(int(entry['length'])))
+                        # Hashes can collide, so the event itself decides
+                        if (not fund or event.get('fund') == fund) and (not status or event.get('status') == status):
+                            events.append(event)
+                            if len(events) == n:
+                                break
+                    stop = start
+        except FileNotFoundError:
+            pass
+        finally:
+            for index, log in files.values():
+                index.close()
+                log.close()
+        return events
+
+    def __len__(self):
+        segments = self._segments()
+        if not segments:
+            return 0
+        index_path = self._paths(segments[-1])[1]
+        return segments[-1] + (index_path.stat().st_size // INDEX_DTYPE.itemsize if index_path.exists() else 0)
+
+    def close(self):
+        with self._lock:
+            self._close_head()
+            self._lock_file.close()
+
+
+_log = None
+_log_lock = threading.Lock()
+
+
+def get_log():
+    """Return the process-wide ActivityLog."""
+    global _log
+    if _log is None:
+        with _log_lock:
+            if _log is None:
+                _log = ActivityLog()
+    return _log
+
+
+def record(message, status=COMPLETED, fund=None, **fields):
+    """Append one event to the process-wide log; returns its sequence number."""
+    return get_log().append(message, status, fund, **fields)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Activity log")
+    parser.add_argument('-n', type=int, default=20, help="number of events (default: %(default)s)")
+    parser.add_argument('--fund')
+    parser.add_argument('--status')
+    args = parser.parse_args(argv)
+    for event in reversed(get_log().tail(args.n, args.fund, args.status)):
+        print(f"{event['seq']:>10}  {event['ts']}  {event['status']:<12} {event['message']}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,263 @@
+"""Risk/return analytics over the fund performance series.
+
+Levels are held as one (dates x funds) matrix and every metric is computed
+for all funds at once. Rolling-window kernels use cumulative sums along the
+date axis, so a full rolling series costs O(dates x funds) whatever the
+window length:
+
+- return: level change over the window;
+- volatility: annualised standard deviation of log returns;
+- Sharpe / Sortino: annualised mean excess log return over volatility /
+  downside deviation (returns below the per-period risk-free rate);
+- max drawdown: largest peak-to-trough fall inside the window;
+- correlation of log returns across funds, as one matrix product.
+
+RollingWindow keeps the sums behind the latest window (per-fund sums and
+the funds x funds cross-products) and moves it forward one date at a time:
+each step adds the new row of returns and subtracts the one that leaves the
+window, O(funds^2) instead of O(window x funds^2). snapshot() results are
+cached per (fund set, window, as-of date); the RollingWindows of the
+WINDOW_CACHE_ENTRIES most recently used (fund set, window) pairs are kept
+between calls, so asking for the next date after a new day of prices only
+advances it by that day. Funds with no level on a
+date (not yet launched) count as flat for that period.
+"""
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from fund_admin import data
+
+RISK_FREE_RATE = float(os.environ.get('FUND_ADMIN_RISK_FREE_RATE', 0.02))
+SNAPSHOT_CACHE_ENTRIES = 256
+# RollingWindows kept, least recently used dropped first; each holds a funds x funds matrix
+WINDOW_CACHE_ENTRIES = 32
+# Exact recomputation of a RollingWindow's sums after this many windows of
+# incremental steps, so floating-point drift cannot accumulate
+REBASE_WINDOWS = 4
+
+
+def periods_per_year(dates):
+    """Annualisation factor implied by the median spacing of ``dates``."""
+    if len(dates) < 2:
+        return 252
+    days = float(np.median(np.diff(dates.astype('datetime64[D]').astype(np.int64))))
+    for max_days, periods in ((4, 252), (8, 52), (32, 12), (95, 4)):
+        if days <= max_days:
+            return periods
+    return 1
+
+
+def log_returns(levels):
+    """Per-period log returns of a (dates x funds) level matrix; missing periods are 0."""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        returns = np.diff(np.log(levels), axis=0)
+    return np.nan_to_num(returns, nan=0.0, posinf=0.0, neginf=0.0)
+
+
+def rolling_sum(x, window):
+    """Sums of every ``window`` consecutive rows of ``x``: shape (rows - window + 1, funds)."""
+    cumulative = np.zeros((len(x) + 1, *x.shape[1:]))
+    np.cumsum(x, axis=0, out=cumulative[1:])
+    return cumulative[window:] - cumulative[:-window]
+
+
+def _ratios(sum_r, sum_r2, sum_down2, n, per_year, risk_free):
+    """Annualised volatility, Sharpe and Sortino from window sums of returns, squares and downside squares."""
+    mean = sum_r / n
+    variance = np.maximum(sum_r2 / n - mean ** 2, 0.0) * n / max(n - 1, 1)
+    volatility = np.sqrt(variance * per_year)
+    excess = (mean - risk_free / per_year) * per_year
+    with np.errstate(divide='ignore', invalid='ignore'):
+        sharpe = np.where(volatility > 0, excess / volatility, np.nan)
+        downside = np.sqrt(sum_down2 / n * per_year)
+        sortino = np.where(downside > 0, excess / downside, np.nan)
+    return volatility, sharpe, sortino
+
+
+def rolling_metrics(levels, window, per_year, risk_free=RISK_FREE_RATE):
+    """Rolling return, volatility, Sharpe and Sortino for every fund.
+
+    Each array has one row per date from the first full window (``window``
+    returns, so ``window + 1`` levels) to the last.
+    """
+    returns = log_returns(levels)
+    threshold = risk_free / per_year
+    sum_r = rolling_sum(returns, window)
+    sum_r2 = rolling_sum(returns ** 2, window)
+    sum_down2 = rolling_sum(np.minimum(returns - threshold, 0.0) ** 2, window)
+    volatility, sharpe, sortino = _ratios(sum_r, sum_r2, sum_down2, window, per_year, risk_free)
+    return {'return': np.expm1(sum_r), 'volatility': volatility, 'sharpe': sharpe, 'sortino': sortino}
+
+
+def max_drawdown(levels):
+    """Largest peak-to-trough fall of each fund over the rows of ``levels`` (a negative fraction)."""
+    filled = pd.DataFrame(levels).ffill().to_numpy()
+    peaks = np.fmax.accumulate(filled, axis=0)
+    with np.errstate(invalid='ignore'):
+        return np.nan_to_num(np.nanmin(filled / peaks - 1.0, axis=0), nan=0.0)
+
+
+def correlation(returns):
+    """Correlation matrix of the columns of ``returns``; constant columns get NaN."""
+    centred = returns - returns.mean(axis=0)
+    scale = np.sqrt((centred ** 2).sum(axis=0))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        centred = centred / np.where(scale > 0, scale, np.nan)
+    matrix = centred.T @ centred
+    np.fill_diagonal(matrix, np.where(scale > 0, 1.0, np.nan))
+    return matrix
+
+
+class RollingWindow:
+    """Sums over the last ``window`` rows of returns, moved forward one row at a time."""
+
+    def __init__(self, returns, window, per_year, risk_free=RISK_FREE_RATE):
+        self.window, self.per_year, self.risk_free = window, per_year, risk_free
+        self.threshold = risk_free / per_year
+        self._rebase(np.array(returns[-window:], dtype=float))
+
+    def _rebase(self, rows):
+        self.rows = rows
+        self.head = 0  # index in ``rows`` of the oldest return in the window
+        self.steps = 0
+        self.sum_r = rows.sum(axis=0)
+        self.sum_r2 = (rows ** 2).sum(axis=0)
+        self.sum_down2 = (np.minimum(rows - self.threshold, 0.0) ** 2).sum(axis=0)
+        self.cross = rows.T @ rows
+
+    def push(self, row):
+        """Slide the window forward by one period of returns."""
+        row = np.asarray(row, dtype=float)
+        old = self.rows[self.head]
+        self.sum_r += row - old
+        self.sum_r2 += row ** 2 - old ** 2
+        self.sum_down2 += np.minimum(row - self.threshold, 0.0) ** 2 - np.minimum(old - self.threshold, 0.0) ** 2
+        # Rank-2 update as one matrix product: + row row^T - old old^T
+        self.cross += np.stack((row, old), axis=1) @ np.stack((row, -old))
+        self.rows[self.head] = row
+        self.head = (self.head + 1) % self.window
+        self.steps += 1
+        if self.steps >= REBASE_WINDOWS * self.window:
+            self._rebase(np.roll(self.rows, -self.head, axis=0))
+
+    def stats(self):
+        """(return, volatility, Sharpe, Sortino) per fund over the current window."""
+        volatility, sharpe, sortino = _ratios(self.sum_r, self.sum_r2, self.sum_down2, self.window, self.per_year,
+                                              self.risk_free)
+        return np.expm1(self.sum_r), volatility, sharpe, sortino
+
+    def correlation(self):
+        n = self.window
+        covariance = self.cross - np.outer(self.sum_r, self.sum_r) / n
+        scale = np.sqrt(np.maximum(np.diag(covariance), 0.0))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            matrix = covariance / np.outer(scale, scale)
+        matrix[scale == 0, :] = np.nan
+        matrix[:, scale == 0] = np.nan
+        np.fill_diagonal(matrix, np.where(scale > 0, 1.0, np.nan))
+        return np.clip(matrix, -1.0, 1.0)
+
+
+@dataclass(frozen=True)
+class Levels:
+    dates: np.ndarray
+    funds: list
+    # (dates x funds), NaN where a fund has no level
+    values: np.ndarray
+
+    @property
+    def per_year(self):
+        return periods_per_year(self.dates)
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    as_of: np.datetime64
+    window: int
+    # Fund -> Return, Volatility, Sharpe, Sortino, Max Drawdown over the window
+    stats: pd.DataFrame
+    correlation: pd.DataFrame
+
+
+def to_levels(performance):
+    """A long (Date, Fund, Index) performance frame as one (dates x funds) matrix."""
+    wide = performance.pivot_table(index='Date', columns='Fund', values='Index', observed=True, sort=True)
+    return Levels(wide.index.to_numpy(), [str(fund) for fund in wide.columns], wide.to_numpy(dtype=float))
+
+
+@data.cached
+def load_levels():
+    """The Dashboard performance series as a Levels matrix."""
+    return to_levels(data.load_datasets().performance)
+
+
+# (fund set, window) -> (date and levels of the last row the RollingWindow covers, RollingWindow)
+_windows = OrderedDict()
+_windows_lock = threading.Lock()
+
+
+def _window_metrics(levels, funds, columns, window, row):
+    """RollingWindow stats() and correlation() of ``funds`` over the ``window`` returns up to level ``row``.
+
+    A kept window is moved forward when it ends at most ``window`` rows
+    earlier and the levels it ended on are unchanged (the performance data may
+    have been reloaded since); otherwise it is rebuilt from the levels. Both
+    results are read under the lock, as another call may move the window on.
+    """
+    key = (funds, window)
+    with _windows_lock:
+        kept = _windows.get(key)
+        rolling = None
+        if kept is not None:
+            last_date, last_levels, rolling = kept
+            position = int(np.searchsorted(levels.dates, last_date))
+            if not (position < len(levels.dates) and levels.dates[position] == last_date
+                    and row - window < position <= row
+                    and np.array_equal(levels.values[position, columns], last_levels, equal_nan=True)):
+                rolling = None
+        if rolling is None:
+            rolling = RollingWindow(log_returns(levels.values[row - window:row + 1, columns]), window,
+                                    levels.per_year)
+        else:
+            for returns in log_returns(levels.values[position:row + 1, columns]):
+                rolling.push(returns)
+        _windows[key] = (levels.dates[row], levels.values[row, columns], rolling)
+        _windows.move_to_end(key)
+        while len(_windows) > WINDOW_CACHE_ENTRIES:
+            _windows.popitem(last=False)
+        return rolling.stats(), rolling.correlation()
+
+
+@data.cached(max_entries=SNAPSHOT_CACHE_ENTRIES)
+def snapshot(funds, window, as_of):
+    """Window metrics and correlation matrix of ``funds`` (a tuple) for the ``window`` periods up to ``as_of``."""
+    levels = load_levels()
+    columns = [levels.funds.index(fund) for fund in funds]
+    row = int(np.searchsorted(levels.dates, np.datetime64(as_of), 'right')) - 1
+    if row < window:
+        raise ValueError(f"Need {window + 1} levels up to {as_of}, have {row + 1}")
+    (total, volatility, sharpe, sortino), correlation = _window_metrics(levels, funds, columns, window, row)
+    stats = pd.DataFrame({
+        'Return': total,
+        'Volatility': volatility,
+        'Sharpe': sharpe,
+        'Sortino': sortino,
+        'Max Drawdown': max_drawdown(levels.values[row - window:row + 1, columns]),
+    }, index=pd.Index(funds, name='Fund'))
+    matrix = pd.DataFrame(correlation, index=list(funds), columns=list(funds))
+    return Snapshot(levels.dates[row], window, stats, matrix)
+
+
+@data.cached(max_entries=SNAPSHOT_CACHE_ENTRIES)
+def rolling_series(funds, window, as_of):
+    """Rolling metrics of ``funds`` for every date up to ``as_of``: (dates, {metric: (dates x funds)})."""
+    levels = load_levels()
+    columns = [levels.funds.index(fund) for fund in funds]
+    row = int(np.searchsorted(levels.dates, np.datetime64(as_of), 'right')) - 1
+    metrics = rolling_metrics(levels.values[:row + 1, columns], window, levels.per_year)
+    return levels.dates[window:row + 1], metrics
@@ -0,0 +1,194 @@
+"""Streaming bulk import of investor and client onboarding files.
+
+Files (CSV or Parquet) are read in fixed-size chunks, so memory use depends on
+the chunk size rather than the file size. Every chunk is validated column by
+column against the rules the onboarding forms enforce; valid rows are
+inserted in one transaction per chunk and invalid rows are appended to a
+rejects CSV with the reasons in an ``errors`` column.
+
+    python -m fund_admin.bulk_import investors migration.parquet --rejects rejects.csv
+"""
+import argparse
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+
+from fund_admin import onboarding, options
+
+CHUNK_SIZE = 50_000
+TRUE_VALUES = {'true', '1', 'yes', 'y'}
+
+OPTIONAL_COLUMNS = {'address_line2', 'investment_goals', 'preferred_funds', 'email', 'phone'}
+
+
+@dataclass(frozen=True)
+class ImportSpec:
+    columns: list
+    validate: Callable
+    load: Callable
+
+
+@dataclass
+class ImportResult:
+    accepted: int = 0
+    rejected: int = 0
+    rejects_path: Path = None
+
+
+class _Reasons:
+    """Accumulates per-row error messages one vectorised rule at a time."""
+
+    def __init__(self, n):
+        self.messages = np.full(n, '', dtype=object)
+
+    def add(self, mask, message):
+        mask = np.asarray(mask, dtype=bool)
+        if mask.any():
+            self.messages[mask] = self.messages[mask] + message + '; '
+
+    def require(self, chunk, column):
+        self.add(chunk[column].str.strip().eq('').to_numpy(), f'{column} is required')
+
+    def one_of(self, chunk, column, allowed):
+        self.add(~chunk[column].isin(allowed).to_numpy(), f'{column} must be one of: {", ".join(allowed)}')
+
+    @property
+    def valid(self):
+        return self.messages == ''
+
+
+def _flag(series):
+    return series.str.strip().str.lower().isin(TRUE_VALUES)
+
+
+def validate_investors(chunk):
+    reasons = _Reasons(len(chunk))
+    reasons.require(chunk, 'first_name')
+    reasons.require(chunk, 'last_name')
+    reasons.one_of(chunk, 'investor_type', options.INVESTOR_TYPES)
+    reasons.one_of(chunk, 'fund', options.FUND_NAMES)
+    reasons.one_of(chunk, 'source_of_funds', options.SOURCES_OF_FUNDS)
+    reasons.one_of(chunk, 'annual_income', options.ANNUAL_INCOME_RANGES)
+    reasons.one_of(chunk, 'net_worth', options.NET_WORTH_RANGES)
+    reasons.one_of(chunk, 'investment_experience', options.INVESTMENT_EXPERIENCE)
+    reasons.one_of(chunk, 'risk_tolerance', options.RISK_TOLERANCE)
+
+    amount = pd.to_numeric(chunk['investment_amount'], errors='coerce')
+    reasons.add(amount.isna().to_numpy(), 'investment_amount is not a number')
+    reasons.add((amount < options.MIN_INVESTMENT_AMOUNT).to_numpy(),
+                f'investment_amount is below the {options.MIN_INVESTMENT_AMOUNT:,} minimum')
+    for column in ('kyc_completed', 'aml_check', 'suitability_assessment'):
+        reasons.add(~_flag(chunk[column]).to_numpy(), f'{column} must be completed')
+
+    valid = chunk.assign(
+        investment_amount=amount,
+        kyc_completed=True,
+        aml_check=True,
+        suitability_assessment=True,
+    )
+    return valid, reasons
+
+
+def validate_clients(chunk):
+    reasons = _Reasons(len(chunk))
+    reasons.require(chunk, 'first_name')
+    reasons.require(chunk, 'last_name')
+    reasons.one_of(chunk, 'country', options.COUNTRIES)
+    reasons.one_of(chunk, 'annual_income', options.ANNUAL_INCOME_RANGES)
+    reasons.one_of(chunk, 'net_worth', options.NET_WORTH_RANGES)
+    reasons.one_of(chunk, 'investment_experience', options.INVESTMENT_EXPERIENCE)
+    reasons.one_of(chunk, 'risk_tolerance', options.RISK_TOLERANCE)
+
+    date_of_birth = pd.to_datetime(chunk['date_of_birth'], errors='coerce', format='ISO8601')
+    reasons.add(date_of_birth.isna().to_numpy(), 'date_of_birth is not a valid date')
+
+    valid = chunk.assign(date_of_birth=date_of_birth.dt.strftime('%Y-%m-%d'))
+    return valid, reasons
+
+
+IMPORTERS = {
+    'investors': ImportSpec(options.BULK_IMPORT_COLUMNS['investors'], validate_investors, onboarding.import_investors),
+    'clients': ImportSpec(options.BULK_IMPORT_COLUMNS['clients'], validate_clients, onboarding.import_clients),
+}
+
+
+def _file_format(source, fmt):
+    if fmt is not None:
+        return fmt
+    name = str(getattr(source, 'name', source)).lower()
+    return 'parquet' if name.endswith(('.parquet', '.pq')) else 'csv'
+
+
+def iter_chunks(source, fmt=None, chunksize=CHUNK_SIZE):
+    """Yield the file as DataFrames of at most ``chunksize`` rows, all values as strings."""
+    if _file_format(source, fmt) == 'parquet':
+        import pyarrow.parquet as pq
+
+        for batch in pq.ParquetFile(source).iter_batches(batch_size=chunksize):
+            yield batch.to_pandas().astype('string').fillna('').astype(object)
+    else:
+        yield from pd.read_csv(source, chunksize=chunksize, dtype=str, keep_default_na=False)
+
+
+def import_file(source, kind, rejects_path=None, fmt=None, chunksize=CHUNK_SIZE, progress=None):
+    """Stream ``source`` into the store as ``kind`` ('investors' or 'clients').
+
+    ``progress``, if given, is called with the running ImportResult after
+    each chunk.
+    """
+    spec = IMPORTERS[kind]
+    rejects_path = Path(rejects_path) if rejects_path else None
+    result = ImportResult(rejects_path=rejects_path)
+    rejects_file = None
+    try:
+        for chunk in iter_chunks(source, fmt, chunksize):
+            missing = [c for c in spec.columns if c not in chunk.columns and c not in OPTIONAL_COLUMNS]
+            if missing:
+                raise ValueError(f"Missing required columns: {', '.join(missing)}")
+            chunk = chunk.reindex(columns=spec.columns, fill_value='')
+            normalized, reasons = spec.validate(chunk)
+            valid = reasons.valid
+
+            if valid.any():
+                result.accepted += spec.load(normalized[valid])
+            if not valid.all():
+                rejects = chunk[~valid].assign(errors=reasons.messages[~valid])
+                rejects['errors'] = rejects['errors'].str.rstrip('; ')
+                result.rejected += len(rejects)
+                if rejects_path is not None:
+                    if rejects_file is None:
+                        rejects_path.parent.mkdir(parents=True, exist_ok=True)
+                        rejects_file = open(rejects_path, 'w', newline='')
+                        rejects.to_csv(rejects_file, index=False)
+                    else:
+                        rejects.to_csv(rejects_file, index=False, header=False)
+            if progress is not None:
+                progress(result)
+    finally:
+        if rejects_file is not None:
+            rejects_file.close()
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('kind', choices=sorted(IMPORTERS))
+    parser.add_argument('path', type=Path)
+    parser.add_argument('--rejects', type=Path, help="CSV file for rejected rows (default: <path>.rejects.csv)")
+    parser.add_argument('--format', choices=['csv', 'parquet'])
+    parser.add_argument('--chunksize', type=int, default=CHUNK_SIZE)
+    args = parser.parse_args(argv)
+
+    rejects = args.rejects or args.path.with_suffix('.rejects.csv')
+    result = import_file(args.path, args.kind, rejects, fmt=args.format, chunksize=args.chunksize,
+                         progress=lambda r: print(f"\r{r.accepted:,} accepted, {r.rejected:,} rejected", end=''))
+    print()
+    if result.rejected:
+        print(f"Rejected rows written to {rejects}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,117 @@
+"""Fund Performance chart with server-side downsampling.
+
+Each series is reduced to roughly two points per horizontal pixel before it
+is sent to the browser (min/max bucketing by default, LTTB optionally), and
+the figure switches to WebGL (Scattergl) once the total point count passes
+WEBGL_THRESHOLD. Downsampled windows are cached per (fund, range, width), so
+narrowing the date range re-queries that window at full resolution whenever
+it fits the pixel budget.
+"""
+import numpy as np
+import plotly.graph_objects as go
+
+from fund_admin import data
+
+DEFAULT_WIDTH_PX = 700
+WEBGL_THRESHOLD = 5_000
+SERIES_CACHE_ENTRIES = 4_096
+
+
+def minmax_downsample(x, y, n_buckets):
+    """Keep the min and max point of each of ``n_buckets`` equal-count buckets."""
+    n = len(y)
+    if n <= 2 * n_buckets:
+        return x, y
+    width = -(-n // n_buckets)
+    pad = width * n_buckets - n
+    buckets = np.pad(y, (0, pad), mode='edge').reshape(n_buckets, width)
+    offsets = np.arange(n_buckets) * width
+    lo = np.minimum(offsets + buckets.argmin(axis=1), n - 1)
+    hi = np.minimum(offsets + buckets.argmax(axis=1), n - 1)
+    # Keep both extremes in time order; the first and last points always survive
+    keep = np.unique(np.concatenate(([0, n - 1], lo, hi)))
+    return x[keep], y[keep]
+
+
+def lttb_downsample(x, y, n_out):
+    """Largest-Triangle-Three-Buckets: keep ``n_out`` visually significant points."""
+    n = len(y)
+    if n <= n_out or n_out < 3:
+        return x, y
+    xf = x.astype(np.float64)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    keep = np.empty(n_out, dtype=np.int64)
+    keep[0], keep[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        next_end = edges[i + 2] if i + 2 < len(edges) else n
+        # Average of the next bucket is the third triangle vertex
+        cx, cy = xf[end:next_end].mean(), y[end:next_end].mean()
+        bx, by = xf[start:end], y[start:end]
+        area = np.abs((xf[a] - cx) * (by - y[a]) - (xf[a] - bx) * (cy - y[a]))
+        a = start + int(area.argmax())
+        keep[i + 1] = a
+    return x[keep], y[keep]
+
+
+DOWNSAMPLERS = {
+    'minmax': lambda x, y, width: minmax_downsample(x, y, width),
+    'lttb': lambda x, y, width: lttb_downsample(x, y, 2 * width),
+}
+
+
+@data.cached
+def load_performance_series():
+    """Split the long performance frame into per-fund (dates, levels) arrays once."""
+    performance = data.load_datasets().performance.sort_values(['Fund', 'Date'], kind='stable')
+    codes = performance['Fund'].cat.codes.to_numpy()
+    dates = performance['Date'].to_numpy()
+    levels = performance['Index'].to_numpy()
+    categories = performance['Fund'].cat.categories
+    bounds = np.searchsorted(codes, np.arange(len(categories) + 1))
+    return {
+        fund: (dates[bounds[i]:bounds[i + 1]], levels[bounds[i]:bounds[i + 1]])
+        for i, fund in enumerate(categories)
+        if bounds[i + 1] > bounds[i]
+    }
+
+
+@data.cached(max_entries=SERIES_CACHE_ENTRIES)
+def series_window(fund, start, end, width_px, method='minmax'):
+    """Return the (dates, levels) of ``fund`` between ``start`` and ``end``, downsampled to ``width_px``."""
+    dates, levels = load_performance_series()[fund]
+    lo, hi = np.searchsorted(dates, np.datetime64(start), 'left'), np.searchsorted(dates, np.datetime64(end), 'right')
+    return DOWNSAMPLERS[method](dates[lo:hi], levels[lo:hi], width_px)
+
+
+def performance_figure(funds, start, end, width_px=DEFAULT_WIDTH_PX, method='minmax'):
+    windows = {fund: series_window(fund, start, end, width_px, method) for fund in funds}
+    total_points = sum(len(levels) for _, levels in windows.values())
+    use_webgl = total_points > WEBGL_THRESHOLD
+    trace = go.Scattergl if use_webgl else go.Scatter
+
+    fig = go.Figure()
+    for fund, (dates, levels) in windows.items():
+        fig.add_trace(trace(
+            x=dates,
+            y=levels,
+            # Markers only while they can still be told apart
+            mode='lines' if use_webgl or len(levels) > width_px // 8 else 'lines+markers',
+            name=fund,
+            line=dict(width=2)
+        ))
+    fig.update_layout(
+        height=400,
+        showlegend=True,
+        xaxis_title="Date",
+        yaxis_title="Performance Index"
+    )
+    return fig
+
+
+@data.cached
+def performance_date_bounds():
+    series = load_performance_series().values()
+    return (min(dates[0] for dates, _ in series).astype('datetime64[D]').item(),
+            max(dates[-1] for dates, _ in series).astype('datetime64[D]').item())
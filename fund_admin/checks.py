@@ -0,0 +1,135 @@
+"""Background KYC checks, run as fund_admin.jobs handlers.
+
+Each check works on one KYC application: it screens the applicant if that
+has not happened yet (bulk-imported applicants are not screened on submit),
+checks that the source record carries the details KYC needs, records the
+outcome on the application and appends it to the activity log. Running a
+check again recomputes the same result, and the application keeps the
+sequence number of its logged event (activity_seq), so a retry after the
+outcome was logged does not log it twice.
+
+Bulk imports queue one kyc_verification_batch job per BATCH_SIZE imported
+records instead of a job each, naming the records by source and source id;
+it reads the batch with one query per table and records every outcome in
+one transaction and one log append. The batches are CPU-bound, so
+jobs.PROCESS_KINDS runs them in a worker process rather than on the app's
+threads.
+"""
+from fund_admin import activity, data
+from fund_admin.store import get_store
+
+# Applications per kyc_verification_batch job
+BATCH_SIZE = 500
+
+SOURCE_TABLES = {'client': 'clients', 'person': 'persons', 'investor': 'investors'}
+# Fields (or, for investors, attestations) the source record must carry
+REQUIRED_FIELDS = {
+    'client': ('email', 'phone', 'date_of_birth', 'address_line1', 'city', 'postal_code', 'country'),
+    'person': ('email', 'phone', 'date_of_birth', 'address_line1', 'city', 'postal_code', 'country',
+               'job_title', 'company'),
+    'investor': ('email', 'phone', 'kyc_completed', 'suitability_assessment'),
+}
+
+APPLICATION_SQL = """
+SELECT id, applicant_name, source, source_id, risk_level, screening_status, screening_score, activity_seq
+FROM kyc_applications WHERE id = ?
+"""
+APPLICATIONS_SQL = """
+SELECT id, applicant_name, source, source_id, risk_level, screening_status, screening_score, activity_seq
+FROM kyc_applications WHERE source = ? AND source_id BETWEEN ? AND ? ORDER BY id
+"""
+UPDATE_APPLICATION_SQL = """
+UPDATE kyc_applications SET documents = ?, risk_level = ?, screening_status = ?, screening_score = ? WHERE id = ?
+"""
+LOGGED_SQL = "UPDATE kyc_applications SET activity_seq = ? WHERE id = ?"
+
+
+def _records(conn, table, sql, params):
+    cursor = conn.execute(f"SELECT * FROM {table} WHERE {sql}", params)
+    columns = [column[0] for column in cursor.description]
+    return [dict(zip(columns, row)) for row in cursor]
+
+
+def _load(application_id, store):
+    with store.reader() as conn:
+        application = conn.execute(APPLICATION_SQL, (application_id,)).fetchone()
+        if application is None:
+            raise LookupError(f"KYC application {application_id} not found")
+        records = _records(conn, SOURCE_TABLES[application[2]], "id = ?", (application[3],))
+    return application, records[0] if records else {}
+
+
+def _check(application, record, label, extra_names=()):
+    """(application update row, activity event, result) of one check."""
+    from fund_admin import screening
+
+    application_id, name, source, source_id, risk_level, screening_status, screening_score = application[:7]
+    if screening_status == 'Not Screened':
+        screening_status, screening_score, _ = screening.screen_name(name)
+    flagged = [other for other in extra_names if screening.screen_name(other)[0] == 'Potential Match']
+    missing = [field for field in REQUIRED_FIELDS[source] if not record.get(field)]
+    documents = 'Incomplete' if missing else 'Complete'
+    if screening_status == 'Potential Match' or flagged:
+        risk_level = 'High'
+        message, status = f"{label} flagged {name} for enhanced due diligence", activity.FLAGGED
+    elif missing:
+        message, status = f"{label} for {name}: documents incomplete", activity.PENDING
+    else:
+        message, status = f"{label} completed for {name}", activity.COMPLETED
+    event = {'message': message, 'status': status, 'fund': record.get('fund'), 'source': source,
+             'source_id': source_id}
+    result = {'documents': documents, 'missing': missing, 'screening_status': screening_status,
+              'risk_level': risk_level, 'flagged': flagged}
+    return (documents, risk_level, screening_status, screening_score, application_id), event, result
+
+
+def _record(store, applications, updates, events):
+    """Store the outcomes, then log the events of applications whose outcome is not logged yet."""
+    with store.transaction() as conn:
+        conn.executemany(UPDATE_APPLICATION_SQL, updates)
+    unlogged = [(application[0], event) for application, event in zip(applications, events) if application[7] is None]
+    if unlogged:
+        seqs = activity.get_log().append_many([event for _, event in unlogged])
+        with store.transaction() as conn:
+            conn.executemany(LOGGED_SQL, zip(seqs, [application_id for application_id, _ in unlogged]))
+    data.invalidate()
+
+
+def _verify(application_id, store, label, extra_names=()):
+    store = store or get_store()
+    application, record = _load(application_id, store)
+    update, event, result = _check(application, record, label, extra_names)
+    _record(store, [application], [update], [event])
+    return result
+
+
+def kyc_verification(payload, store=None):
+    """Screening and document check for a client or investor application."""
+    return _verify(payload['application_id'], store, "KYC verification")
+
+
+def background_check(payload, store=None):
+    """kyc_verification() for a person, plus screening of their employer."""
+    store = store or get_store()
+    _, record = _load(payload['application_id'], store)
+    employer = (record.get('company') or '').strip()
+    return _verify(payload['application_id'], store, "Background check", [employer] if employer else [])
+
+
+def kyc_verification_batch(payload, store=None):
+    """kyc_verification() for the applications of the ``count`` ``source`` records from ``first_source_id``."""
+    store = store or get_store()
+    source, first = payload['source'], payload['first_source_id']
+    last = first + payload['count'] - 1
+    with store.reader() as conn:
+        applications = conn.execute(APPLICATIONS_SQL, (source, first, last)).fetchall()
+        records = {record['id']: record for record in _records(
+            conn, SOURCE_TABLES[source], "id BETWEEN ? AND ?", (first, last))}
+    updates, events, counts = [], [], {}
+    for application in applications:
+        update, event, result = _check(application, records.get(application[3], {}), "KYC verification")
+        updates.append(update)
+        events.append(event)
+        counts[event['status']] = counts.get(event['status'], 0) + 1
+    _record(store, applications, updates, events)
+    return {'applications': len(applications), 'by_status': counts}
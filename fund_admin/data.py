@@ -0,0 +1,138 @@
+"""Process-wide data-access layer for the dashboard datasets.
+
+Datasets are built once per process and the same objects are handed to every
+session, so a rerun only pays for a cache lookup no matter how large the
+frames are. Treat returned frames as read-only: copy before mutating.
+"""
+import os
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+import streamlit as st
+
+from fund_admin import options
+from fund_admin.store import get_store
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Cache policy: entries expire after DATASET_TTL seconds and at most
+# DATASET_MAX_ENTRIES datasets are kept alive at once (least recently used
+# entries are evicted first).
+DATASET_TTL = int(os.environ.get('FUND_ADMIN_DATASET_TTL', 15 * 60))
+DATASET_MAX_ENTRIES = int(os.environ.get('FUND_ADMIN_DATASET_MAX_ENTRIES', 8))
+
+_loaders = []
+
+
+def cached(func=None, *, max_entries=DATASET_MAX_ENTRIES):
+    """Cache a loader process-wide under the dataset policy and register it for invalidate().
+
+    Use as ``@cached`` or, for loaders keyed by many argument combinations,
+    ``@cached(max_entries=...)``.
+    """
+    if func is None:
+        return lambda f: cached(f, max_entries=max_entries)
+    # cache_resource (not cache_data) so sessions share the objects instead of
+    # each unpickling its own copy on every rerun.
+    loader = st.cache_resource(ttl=DATASET_TTL, max_entries=max_entries, show_spinner=False)(func)
+    _loaders.append(loader)
+    return loader
+
+
+FUNDS_SQL = """
+SELECT name AS "Fund Name", aum_musd AS "AUM (Million $)", investors AS "Investors",
+       status AS "Status", launch_date AS "Launch Date"
+FROM funds ORDER BY id
+"""
+# The largest funds by AUM, then one "Other" row totalling the rest (if any)
+AUM_SLICES_SQL = """
+SELECT * FROM (SELECT name AS "Fund Name", COALESCE(aum_musd, 0) AS "AUM (Million $)" FROM funds
+               ORDER BY aum_musd DESC, id LIMIT :slices)
+UNION ALL
+SELECT 'Other', COALESCE(SUM(aum_musd), 0)
+FROM (SELECT aum_musd FROM funds ORDER BY aum_musd DESC, id LIMIT -1 OFFSET :slices) HAVING COUNT(*) > 0
+"""
+
+# AML/KYC summaries read the trigger-maintained kyc_rollup table (see
+# fund_admin.store), optionally drilled down to one jurisdiction and/or
+# investor type ('' selects applications that have none).
+KYC_ROLLUP_FILTER = """
+(:jurisdiction IS NULL OR jurisdiction = :jurisdiction) AND (:investor_type IS NULL OR investor_type = :investor_type)
+"""
+KYC_STATUS_SQL = f"""
+SELECT status, SUM(count) AS count FROM kyc_rollup WHERE {KYC_ROLLUP_FILTER}
+GROUP BY status HAVING SUM(count) > 0
+"""
+KYC_RISK_SQL = f"SELECT risk_level, SUM(count) AS count FROM kyc_rollup WHERE {KYC_ROLLUP_FILTER} GROUP BY risk_level"
+KYC_TIMELINE_SQL = f"""
+SELECT month, SUM(count) AS applications, SUM(CASE WHEN status = 'Approved' THEN count ELSE 0 END) AS approvals
+FROM kyc_rollup WHERE {KYC_ROLLUP_FILTER}
+GROUP BY month HAVING SUM(count) > 0 ORDER BY month DESC LIMIT :months
+"""
+KYC_DIMENSION_SQL = "SELECT {column} FROM kyc_rollup GROUP BY {column} HAVING SUM(count) > 0 ORDER BY {column}"
+KYC_DIMENSIONS = ('jurisdiction', 'investor_type')
+
+
+@dataclass(frozen=True)
+class Datasets:
+    funds: 'pd.DataFrame'
+    performance: 'pd.DataFrame'
+    # Date of the NAV behind the funds' AUM, if any run has been published
+    nav_date: str = None
+
+
+@dataclass(frozen=True)
+class KycSummary:
+    by_status: 'pd.Series'
+    by_risk: 'pd.Series'
+    timeline: 'pd.DataFrame'
+
+
+@cached
+def load_datasets():
+    from fund_admin.sample_data import generate_dashboard_performance
+
+    store = get_store()
+    return Datasets(
+        funds=store.query_df(FUNDS_SQL),
+        performance=generate_dashboard_performance(),
+        nav_date=store.query_one("SELECT MAX(nav_date) FROM nav")[0],
+    )
+
+
+@cached
+def load_aum_slices(slices):
+    """(Fund Name, AUM) rows of the ``slices`` largest funds plus an "Other" row, for the AUM pie."""
+    return get_store().query_df(AUM_SLICES_SQL, {'slices': slices})
+
+
+@cached
+def load_kyc_summary(months=6, jurisdiction=None, investor_type=None):
+    import pandas as pd
+
+    store = get_store()
+    params = {'jurisdiction': jurisdiction, 'investor_type': investor_type, 'months': months}
+    by_status = store.query_df(KYC_STATUS_SQL, params).set_index('status')['count']
+    by_risk = store.query_df(KYC_RISK_SQL, params).set_index('risk_level')['count']
+    timeline = store.query_df(KYC_TIMELINE_SQL, params).iloc[::-1].reset_index(drop=True)
+    timeline['Month'] = pd.to_datetime(timeline['month']).dt.strftime('%b')
+    return KycSummary(
+        by_status=by_status,
+        by_risk=by_risk.reindex(options.KYC_RISK_LEVELS, fill_value=0),
+        timeline=timeline.rename(columns={'applications': 'Applications', 'approvals': 'Approvals'}),
+    )
+
+
+@cached
+def load_kyc_dimensions():
+    """Values present in each drill-down dimension of the KYC rollup."""
+    with get_store().reader() as conn:
+        return {column: [row[0] for row in conn.execute(KYC_DIMENSION_SQL.format(column=column))]
+                for column in KYC_DIMENSIONS}
+
+
+def invalidate():
+    """Drop every cached dataset; the next load_*() call rebuilds it."""
+    for loader in _loaders:
+        loader.clear()
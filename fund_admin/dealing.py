@@ -0,0 +1,367 @@
+"""Dealing-day processing of subscription and redemption orders.
+
+Orders are queued with the fund's next dealing date under its subscription
+or redemption frequency. A dealing run picks up every pending order whose
+dealing date has a struck NAV and, per fund, in one pass of array operations:
+
+* rejects subscriptions below the fund's minimum investment;
+* rejects redemptions still inside the lock period of their series, or
+  asking for more units than the series holds;
+* gates redemptions: when the redemptions of a dealing date exceed the fund's
+  gate (a percentage of its NAV) every one of them is scaled back pro rata
+  and the remainder rolls to the next redemption dealing date;
+* issues or cancels units at that date's NAV per unit.
+
+Funds are independent, so fund id ranges are dealt in parallel worker
+processes; the parent applies every result in one transaction: order
+statuses, new fee series for subscriptions, units cancelled on redeemed
+series, share class units and the cash moved, which is booked in accruals so
+the next NAV includes it. The orders are read again inside that transaction,
+and a (fund, dealing date) whose pending orders changed since the workers
+read them (another run dealt them, or a new order arrived) is left to the
+next run, so overlapping runs never deal an order twice.
+
+    python -m fund_admin.dealing --date 2023-12-29 --workers 8
+    python -m fund_admin.dealing queue-redemption SERIES_ID UNITS
+"""
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import date
+
+import numpy as np
+
+from fund_admin.store import Store, get_store
+
+FUNDS_PER_TASK = int(os.environ.get('FUND_ADMIN_DEALING_FUNDS_PER_TASK', 500))
+DEFAULT_FREQUENCY = 'Monthly'
+# Months per dealing period; dealing happens on the last business day of the
+# period. 'Daily' and 'Weekly' are handled separately.
+PERIOD_MONTHS = {'Monthly': 1, 'Quarterly': 3, 'Semi-annually': 6, 'Annually': 12}
+
+SUBSCRIPTION, REDEMPTION = 'Subscription', 'Redemption'
+
+FUND_TERMS_SQL = """
+SELECT f.id, c.class_name, COALESCE(f.subscription_frequency, ?), COALESCE(f.redemption_frequency, ?)
+FROM funds f JOIN share_classes c ON c.fund_id = f.id
+WHERE f.name = ? ORDER BY c.class_name LIMIT 1
+"""
+SERIES_TERMS_SQL = """
+SELECT s.fund_id, s.class_name, s.investor_id, COALESCE(f.redemption_frequency, ?)
+FROM fee_series s JOIN funds f ON f.id = s.fund_id WHERE s.id = ?
+"""
+INSERT_ORDER_SQL = """
+INSERT INTO orders (fund_id, class_name, investor_id, series_id, order_type, amount, units, trade_date, dealing_date)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+DUE_ORDERS_SQL = """
+SELECT o.id, o.fund_id, o.class_name, o.investor_id, o.series_id, o.order_type = 'Redemption',
+       COALESCE(o.amount, 0), COALESCE(o.units, 0), o.dealing_date,
+       n.nav_per_unit,
+       (SELECT SUM(nav) FROM nav WHERE fund_id = o.fund_id AND nav_date = o.dealing_date),
+       COALESCE(s.units, 0), COALESCE(s.opened_on, o.dealing_date),
+       COALESCE(f.min_investment, 0), COALESCE(f.lock_period_months, 0), f.redemption_gate,
+       COALESCE(f.redemption_frequency, ?)
+FROM orders o
+JOIN funds f ON f.id = o.fund_id
+JOIN nav n ON n.fund_id = o.fund_id AND n.class_name = o.class_name AND n.nav_date = o.dealing_date
+LEFT JOIN fee_series s ON s.id = o.series_id
+WHERE o.status = 'Pending' AND o.dealing_date <= ? AND o.fund_id BETWEEN ? AND ? AND n.nav_per_unit > 0
+ORDER BY o.fund_id, o.dealing_date, o.id
+"""
+PENDING_ORDERS_SQL = """
+SELECT id, fund_id, dealing_date FROM orders
+WHERE status = 'Pending' AND dealing_date <= ? AND fund_id BETWEEN ? AND ?
+"""
+UPDATE_ORDER_SQL = """
+UPDATE orders SET status = ?, note = ?, series_id = COALESCE(series_id, ?), units = COALESCE(?, units), dealing_date = ?,
+    dealt_units = dealt_units + ?, dealt_amount = dealt_amount + ?, nav_per_unit = ?
+WHERE id = ? AND status = 'Pending' AND dealing_date = ?
+"""
+
+
+@dataclass
+class DealingRun:
+    dealing_date: str
+    dealt: int = 0
+    rejected: int = 0
+    gated: int = 0
+    subscribed: float = 0.0
+    redeemed: float = 0.0
+    seconds: float = 0.0
+
+
+def dealing_dates(frequencies, trade_dates):
+    """Next dealing date on or after each trade date under the given frequency."""
+    trade = np.asarray(trade_dates, dtype='datetime64[D]')
+    frequencies = np.asarray(frequencies, dtype=object)
+    result = np.busday_offset(trade, 0, roll='forward')  # Daily
+    weekly = frequencies == 'Weekly'
+    if weekly.any():
+        weekday = (trade[weekly].astype(np.int64) + 3) % 7  # Monday = 0
+        result[weekly] = np.busday_offset(trade[weekly] + (4 - weekday) % 7, 0, roll='backward')
+    for frequency, months in PERIOD_MONTHS.items():
+        mask = frequencies == frequency
+        if mask.any():
+            result[mask] = _period_end(trade[mask], months)
+    return result
+
+
+def _period_end(trade, months):
+    month = trade.astype('datetime64[M]')
+    end = month + (months - 1 - month.astype(np.int64) % 12 % months)
+    last = np.busday_offset((end + 1).astype('datetime64[D]') - 1, 0, roll='backward')
+    # Trades after the period's last business day deal at the end of the next period
+    later = last < trade
+    last[later] = np.busday_offset((end[later] + months + 1).astype('datetime64[D]') - 1, 0, roll='backward')
+    return last
+
+
+def queue_subscriptions(conn, subscriptions, trade_date=None):
+    """Queue a subscription for each (investor_id, fund name, amount) in the caller's transaction.
+
+    Returns the dealing dates assigned, in input order (None where the fund has
+    no share class).
+    """
+    trade_date = trade_date or date.today().isoformat()
+    terms, rows = {}, []
+    for investor_id, fund, amount in subscriptions:
+        if fund not in terms:
+            terms[fund] = conn.execute(FUND_TERMS_SQL, (DEFAULT_FREQUENCY, DEFAULT_FREQUENCY, fund)).fetchone()
+        rows.append((terms[fund], investor_id, amount))
+    queued = [(t, investor_id, amount) for t, investor_id, amount in rows if t is not None]
+    due = dealing_dates([t[2] for t, _, _ in queued], [trade_date] * len(queued)).astype(str).tolist()
+    conn.executemany(INSERT_ORDER_SQL, [
+        (t[0], t[1], investor_id, None, SUBSCRIPTION, amount, None, trade_date, dealing_date)
+        for (t, investor_id, amount), dealing_date in zip(queued, due)
+    ])
+    due = iter(due)
+    return [next(due) if t is not None else None for t, _, _ in rows]
+
+
+def queue_redemption(conn, series_id, units, trade_date=None):
+    """Queue the redemption of ``units`` from a fee series; returns its dealing date.
+
+    Lock-up, units held and the gate are checked when the order is dealt.
+    """
+    if not units > 0:
+        raise ValueError(f"Units to redeem must be positive, got {units}")
+    trade_date = trade_date or date.today().isoformat()
+    terms = conn.execute(SERIES_TERMS_SQL, (DEFAULT_FREQUENCY, series_id)).fetchone()
+    if terms is None:
+        raise LookupError(f"Fee series {series_id} not found")
+    fund_id, class_name, investor_id, frequency = terms
+    dealing_date = str(dealing_dates([frequency], [trade_date])[0])
+    conn.execute(INSERT_ORDER_SQL, (fund_id, class_name, investor_id, series_id, REDEMPTION, None, units,
+                                    trade_date, dealing_date))
+    return dealing_date
+
+
+def compute_dealing(is_redemption, amount, units, dealing_date, nav_per_unit, fund_nav, series_id, held_units,
+                    opened_on, min_investment, lock_months, gate_percent, group):
+    """Vectorised dealing decisions for a batch of orders.
+
+    ``group`` labels orders sharing a fund and dealing date; orders are in
+    (fund, dealing date, id) order. Returns (status, note, units issued or
+    cancelled, units left to deal).
+    """
+    n = len(amount)
+    status = np.full(n, 'Dealt', dtype=object)
+    note = np.full(n, None, dtype=object)
+
+    subscription = ~is_redemption
+    below_minimum = subscription & (amount < min_investment)
+    status[below_minimum], note[below_minimum] = 'Rejected', 'Below minimum investment'
+    issued = np.where(subscription & ~below_minimum, amount / nav_per_unit, 0.0)
+
+    opened = opened_on.astype('datetime64[D]')
+    opened_month = opened.astype('datetime64[M]')
+    unlock = (opened_month + lock_months.astype(np.int64)).astype('datetime64[D]') + (opened - opened_month)
+    locked = is_redemption & (dealing_date < unlock)
+    status[locked], note[locked] = 'Rejected', 'Within lock-up period'
+
+    # Earlier orders against the same series have first claim on its units
+    requested = np.where(is_redemption & ~locked, units, 0.0)
+    by_series = np.lexsort((np.arange(n), series_id))
+    before = np.cumsum(requested[by_series]) - requested[by_series]
+    sorted_series = series_id[by_series]
+    starts = np.flatnonzero(np.r_[True, sorted_series[1:] != sorted_series[:-1]]) if n else np.empty(0, dtype=int)
+    claimed = np.empty(n)
+    claimed[by_series] = before - np.repeat(before[starts], np.diff(np.r_[starts, n]))
+    overdrawn = is_redemption & ~locked & (claimed + requested > held_units * (1 + 1e-12))
+    status[overdrawn], note[overdrawn] = 'Rejected', 'Exceeds units held'
+    requested[overdrawn] = 0.0
+
+    # Gate: each (fund, dealing date) pays out at most gate_percent of the fund's NAV
+    groups, slot = np.unique(group, return_inverse=True)
+    total = np.bincount(slot, weights=requested * nav_per_unit, minlength=len(groups))
+    limit = np.zeros(len(groups))
+    limit[slot] = fund_nav * gate_percent / 100
+    fill = np.minimum(1.0, np.divide(limit, total, out=np.ones(len(groups)), where=total > 0))[slot]
+    cancelled = requested * fill
+    gated = is_redemption & (requested > 0) & (fill < 1.0)
+    status[gated] = 'Pending'
+    note[gated] = [f'Gated: {f:.0%} dealt' for f in fill[gated].tolist()]
+    return status, note, issued + cancelled, requested - cancelled
+
+
+def _columns(rows, count):
+    if not rows:
+        return [np.empty(0) for _ in range(count)]
+    return [np.array(column) for column in zip(*rows)]
+
+
+# Worker state: one Store (and reader connection) per process
+_worker = {}
+
+
+def _init_worker(db_path):
+    _worker['store'] = Store(db_path, pool_size=1)
+
+
+def _deal_range(as_of, fund_range, store=None):
+    """Read and decide every due order of the funds in ``fund_range`` (lo, hi)."""
+    store = store or _worker['store']
+    with store.reader() as conn:
+        rows = conn.execute(DUE_ORDERS_SQL, (DEFAULT_FREQUENCY, as_of, *fund_range)).fetchall()
+    if not rows:
+        return None
+    (order_id, fund_id, class_name, investor_id, series_id, is_redemption, amount, units, dealing_date,
+     nav_per_unit, fund_nav, held_units, opened_on, min_investment, lock_months, gate_percent,
+     redemption_frequency) = _columns(rows, 17)
+    dealing_date = dealing_date.astype('datetime64[D]')
+    series_key = np.array([-1 if s is None else s for s in series_id.tolist()], dtype=np.int64)
+    nav_per_unit = nav_per_unit.astype(float)
+    fund_nav = fund_nav.astype(float)
+    group = fund_id.astype(np.int64) * 100_000 + (dealing_date - np.datetime64('2000-01-01')).astype(np.int64)
+    status, note, dealt_units, remaining = compute_dealing(
+        is_redemption.astype(bool), amount.astype(float), units.astype(float), dealing_date, nav_per_unit,
+        fund_nav, series_key, held_units.astype(float), opened_on, min_investment.astype(float),
+        lock_months.astype(np.int64), gate_percent.astype(float), group)
+    gated = remaining > 0
+    next_date = dealing_date.copy()
+    next_date[gated] = dealing_dates(redemption_frequency[gated], dealing_date[gated] + 1)
+    # Gated orders keep only the units still to redeem
+    units_left = np.where(gated, remaining, None)
+    return (order_id, fund_id, class_name, investor_id, series_id, is_redemption.astype(bool), status, note,
+            dealt_units, units_left, gated, dealing_date, next_date, nav_per_unit)
+
+
+def run(as_of=None, store=None, workers=None, funds_per_task=FUNDS_PER_TASK):
+    """Deal every pending order due on or before ``as_of`` (default: the latest NAV date) whose NAV is struck."""
+    started = time.perf_counter()
+    store = store or get_store()
+    as_of = as_of or store.query_one("SELECT MAX(nav_date) FROM nav")[0]
+    result = DealingRun(dealing_date=as_of)
+    if as_of is None:
+        return result
+    with store.reader() as conn:
+        funds = [row[0] for row in conn.execute(
+            "SELECT DISTINCT fund_id FROM orders WHERE status = 'Pending' AND dealing_date <= ? ORDER BY fund_id",
+            (as_of,))]
+    ranges = [(int(batch[0]), int(batch[-1]))
+              for batch in np.array_split(np.array(funds), -(-len(funds) // funds_per_task))] if funds else []
+    if len(ranges) <= 1 or workers == 1:
+        batches = [_deal_range(as_of, fund_range, store) for fund_range in ranges]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(store.path,)) as pool:
+            batches = list(pool.map(_deal_range, [as_of] * len(ranges), ranges))
+
+    with store.transaction() as conn:
+        next_series = conn.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM fee_series").fetchone()[0]
+        for batch in batches:
+            if batch is not None:
+                next_series = _apply(conn, _unchanged(conn, as_of, batch), next_series, result)
+    result.seconds = time.perf_counter() - started
+    return result
+
+
+def _unchanged(conn, as_of, batch):
+    """The orders of ``batch`` whose (fund, dealing date) still has exactly the pending orders that were read."""
+    order_id, fund_id, dealing_date = batch[0], batch[1], batch[11].astype(str)
+    pending = {}
+    for row_id, fund, day in conn.execute(PENDING_ORDERS_SQL, (as_of, int(fund_id.min()), int(fund_id.max()))):
+        pending.setdefault((fund, day), set()).add(row_id)
+    read = {}
+    for row_id, fund, day in zip(order_id.tolist(), fund_id.tolist(), dealing_date.tolist()):
+        read.setdefault((fund, day), set()).add(row_id)
+    keep = np.array([read[key] == pending.get(key) for key in zip(fund_id.tolist(), dealing_date.tolist())], bool)
+    return tuple(column[keep] for column in batch)
+
+
+def _apply(conn, batch, next_series, result):
+    (order_id, fund_id, class_name, investor_id, series_id, is_redemption, status, note, dealt_units, units_left,
+     gated, dealing_date, next_date, nav_per_unit) = batch
+    dealt_amount = dealt_units * nav_per_unit
+    issued = ~is_redemption & (status == 'Dealt')
+    cancelled = is_redemption & (dealt_units > 0)
+
+    # Writes are serialised by Store.transaction(), so the series inserted
+    # below receive consecutive ids starting at next_series.
+    new_series = np.full(len(order_id), None, dtype=object)
+    new_series[issued] = np.arange(next_series, next_series + int(issued.sum()))
+    dates = dealing_date.astype(str)
+    conn.executemany(
+        "INSERT INTO fee_series (id, fund_id, class_name, investor_id, opened_on, units, high_water_mark, "
+        "period_start, period_start_nav, last_accrual_date) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        zip(new_series[issued].tolist(), fund_id[issued].tolist(), class_name[issued].tolist(),
+            investor_id[issued].tolist(), dates[issued].tolist(), dealt_units[issued].tolist(),
+            nav_per_unit[issued].tolist(), dates[issued].tolist(), nav_per_unit[issued].tolist(),
+            dates[issued].tolist()))
+    conn.executemany("UPDATE fee_series SET units = units - ? WHERE id = ?",
+                     zip(dealt_units[cancelled].tolist(), series_id[cancelled].tolist()))
+    updated = conn.executemany(UPDATE_ORDER_SQL, zip(
+        status.tolist(), note.tolist(), new_series.tolist(), units_left.tolist(), next_date.astype(str).tolist(),
+        dealt_units.tolist(), dealt_amount.tolist(), nav_per_unit.tolist(), order_id.tolist(), dates.tolist()))
+    if updated.rowcount != len(order_id):
+        raise RuntimeError(f"{len(order_id) - updated.rowcount} orders were dealt by another run")
+
+    # Net units and cash per fund, class and dealing date
+    signed = np.where(is_redemption, -1.0, 1.0)
+    keys = list(zip(fund_id.tolist(), class_name.tolist(), dates.tolist()))
+    unit_moves, cash_moves = {}, {}
+    for key, units, cash in zip(keys, (signed * dealt_units).tolist(), (signed * dealt_amount).tolist()):
+        unit_moves[key[:2]] = unit_moves.get(key[:2], 0.0) + units
+        cash_moves[(key[0], key[2])] = cash_moves.get((key[0], key[2]), 0.0) + cash
+    conn.executemany("UPDATE share_classes SET units = units + ? WHERE fund_id = ? AND class_name = ?",
+                     [(units, fund, class_name) for (fund, class_name), units in unit_moves.items() if units])
+    conn.executemany("INSERT INTO accruals (fund_id, accrual_date, description, amount) VALUES (?, ?, ?, ?)",
+                     [(fund, day, 'Subscriptions less redemptions', cash)
+                      for (fund, day), cash in cash_moves.items() if cash])
+
+    result.dealt += int(((status == 'Dealt') & (dealt_units > 0)).sum())
+    result.rejected += int((status == 'Rejected').sum())
+    result.gated += int(gated.sum())
+    result.subscribed += float(dealt_amount[~is_redemption].sum())
+    result.redeemed += float(dealt_amount[is_redemption].sum())
+    return next_series + int(issued.sum())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Deal pending subscriptions and redemptions")
+    parser.add_argument('--date', help="deal orders due up to this date (default: the latest NAV date)")
+    parser.add_argument('--workers', type=int, help="worker processes (default: one per CPU)")
+    parser.add_argument('--funds-per-task', type=int, default=FUNDS_PER_TASK)
+    commands = parser.add_subparsers(dest='command')
+    redeem = commands.add_parser('queue-redemption', help="queue a redemption instead of dealing")
+    redeem.add_argument('series_id', type=int, help="fee series to redeem from")
+    redeem.add_argument('units', type=float)
+    redeem.add_argument('--trade-date', help="trade date (default: today)")
+    args = parser.parse_args(argv)
+
+    if args.command == 'queue-redemption':
+        with get_store().transaction() as conn:
+            dealing_date = queue_redemption(conn, args.series_id, args.units, args.trade_date)
+        print(f"Queued redemption of {args.units:,.4f} units from series {args.series_id} "
+              f"for dealing on {dealing_date}")
+        return
+    result = run(args.date, workers=args.workers, funds_per_task=args.funds_per_task)
+    print(f"Dealing up to {result.dealing_date}: {result.dealt:,} dealt, {result.rejected:,} rejected, "
+          f"{result.gated:,} gated; subscribed ${result.subscribed:,.2f}, redeemed ${result.redeemed:,.2f} "
+          f"in {result.seconds:.1f}s")
+
+
+if __name__ == '__main__':
+    main()
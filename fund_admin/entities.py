@@ -0,0 +1,354 @@
+"""Duplicate party detection across clients, persons and investors.
+
+Every party is reduced to normalised identity fields (name key as in
+fund_admin.screening, email lower-cased without a ``+tag``, phone as its last
+10 digits, date of birth, postal code) and filed under blocking keys:
+
+- ``e:`` its email;
+- ``p:`` its phone number;
+- ``n:`` the Soundex code of its last name, first initial and date of birth;
+- ``a:`` its postal code and the Soundex code of its last name.
+
+Only parties sharing a block are compared. A pair's score is the weighted
+share of agreeing fields among those both parties have, with the name
+counting by its similarity (1 - normalised edit distance); pairs scoring at
+least DUPLICATE_THRESHOLD are duplicates. Blocks larger than MAX_BLOCK_SIZE
+(a shared office phone, a placeholder email) carry little signal and are
+skipped.
+
+The onboarding handlers look a submission up in the process-wide index
+before writing it and warn about its likely duplicates; a lookup touches a
+handful of blocks. The dedupe pass scores every block of the register in
+parallel worker processes, each pair once (in the first block the two
+parties share that is not too large to score), and joins the duplicate
+pairs into clusters:
+
+    python -m fund_admin.entities dedupe --workers 8 --output duplicates.csv
+    python -m fund_admin.entities find "Jon Smith" --email jon@example.com
+"""
+import argparse
+import csv
+import os
+import re
+import threading
+import time
+from collections import Counter
+from functools import lru_cache
+from itertools import groupby
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+from fund_admin.screening import normalize, similarity
+from fund_admin.store import Store, get_store
+
+DUPLICATE_THRESHOLD = float(os.environ.get('FUND_ADMIN_DUPLICATE_THRESHOLD', 0.75))
+MAX_BLOCK_SIZE = 500
+CANDIDATE_LIMIT = 10
+# Blocks are handed to dedupe workers in tasks of about this many pairs
+PAIRS_PER_TASK = 200_000
+
+NAME_WEIGHT = 3.0
+FIELD_WEIGHTS = {'email': 3.0, 'phone': 2.0, 'date_of_birth': 2.0, 'postal_code': 1.0}
+
+PARTIES_SQL = """
+SELECT 'client', id, first_name, last_name, email, phone, date_of_birth, postal_code FROM clients
+UNION ALL
+SELECT 'person', id, first_name, last_name, email, phone, date_of_birth, postal_code FROM persons
+UNION ALL
+SELECT 'investor', id, first_name, last_name, email, phone, NULL, NULL FROM investors
+"""
+
+# Soundex digits; vowels (and y) become '0', which separates equal codes, while h and w are dropped so they do not
+# (Ashcraft is a261, not a226)
+_SOUNDEX = str.maketrans('bfpvcgjkqsxzdtlmnraeiouy', '111122222222334556000000', 'hw')
+_NON_LETTER = re.compile(r'[^a-z]+')
+_NON_DIGIT = re.compile(r'\D+')
+_NON_ALNUM = re.compile(r'[^A-Z0-9]+')
+
+
+@lru_cache(maxsize=65_536)
+def soundex(word):
+    """American Soundex code of ``word`` (a normalised, lower-case key), e.g. 'r163' for 'robert'."""
+    letters = _NON_LETTER.sub('', word)
+    if not letters:
+        return ''
+    digits = [digit for digit, _ in groupby((letters[0] + letters[1:].translate(_SOUNDEX)).translate(_SOUNDEX))]
+    return (letters[0] + ''.join(digit for digit in digits[1:] if digit != '0') + '000')[:4]
+
+
+def normalize_email(email):
+    email = (email or '').strip().lower()
+    local, at, domain = email.partition('@')
+    return f"{local.split('+')[0]}@{domain}" if at and local and domain else ''
+
+
+def normalize_phone(phone):
+    # Trunk and country prefixes vary between forms; the last 10 digits identify the line
+    digits = _NON_DIGIT.sub('', phone or '')
+    return digits[-10:] if len(digits) >= 7 else ''
+
+
+@dataclass(slots=True)
+class Party:
+    source: str
+    source_id: int
+    name: str
+    name_key: str
+    email: str
+    phone: str
+    date_of_birth: str
+    postal_code: str
+    keys: tuple
+
+    @classmethod
+    def from_fields(cls, source, source_id, first_name, last_name, email=None, phone=None, date_of_birth=None,
+                    postal_code=None):
+        name = ' '.join(part.strip() for part in (first_name or '', last_name or '') if part.strip())
+        first, last = normalize(first_name or ''), normalize(last_name or '')
+        email, phone = normalize_email(email), normalize_phone(phone)
+        date_of_birth = str(date_of_birth or '')[:10]
+        postal_code = _NON_ALNUM.sub('', str(postal_code or '').upper())
+        keys = []
+        if email:
+            keys.append(f'e:{email}')
+        if phone:
+            keys.append(f'p:{phone}')
+        if last:
+            code = soundex(last)
+            if date_of_birth:
+                keys.append(f'n:{code}{first[:1]}{date_of_birth}')
+            if postal_code:
+                keys.append(f'a:{postal_code}{code}')
+        # Same key as normalize(name): tokens of both parts, sorted
+        name_key = ' '.join(sorted(f'{first} {last}'.split()))
+        return cls(source, source_id, name, name_key, email, phone, date_of_birth, postal_code, tuple(keys))
+
+    @classmethod
+    def from_record(cls, source, source_id, record):
+        """A Party from an onboarding form record (a dict or a DataFrame row)."""
+        return cls.from_fields(source, source_id, *(record.get(field) for field in (
+            'first_name', 'last_name', 'email', 'phone', 'date_of_birth', 'postal_code')))
+
+
+@dataclass(frozen=True)
+class Duplicate:
+    source: str
+    source_id: int
+    name: str
+    score: float
+    # Identity fields the two parties share
+    matched: tuple
+
+
+def score(a, b, threshold=0.0):
+    """(score in 0..1, names of the fields that agree) for two parties.
+
+    The name's edit distance is the expensive part, so it is skipped (and
+    the score returned as 0) when even identical names could not lift the
+    pair to ``threshold``.
+    """
+    total, possible, matched = 0.0, NAME_WEIGHT, []
+    for field, field_weight in FIELD_WEIGHTS.items():
+        value, other = getattr(a, field), getattr(b, field)
+        if value and other:
+            possible += field_weight
+            if value == other:
+                total += field_weight
+                matched.append(field)
+    if (total + NAME_WEIGHT) / possible < threshold:
+        return 0.0, ()
+    name_score = similarity(a.name_key, b.name_key)
+    if name_score >= DUPLICATE_THRESHOLD:
+        matched.insert(0, 'name')
+    return (total + NAME_WEIGHT * name_score) / possible, tuple(matched)
+
+
+class EntityIndex:
+    def __init__(self, parties=()):
+        self.parties = []
+        self.blocks = {}
+        self._lock = threading.Lock()
+        self.add_many(parties)
+
+    def __len__(self):
+        return len(self.parties)
+
+    @classmethod
+    def from_store(cls, store=None):
+        store = store or get_store()
+        with store.reader() as conn:
+            return cls(Party.from_fields(*row) for row in conn.execute(PARTIES_SQL))
+
+    def add_many(self, parties):
+        with self._lock:
+            for party in parties:
+                position = len(self.parties)
+                self.parties.append(party)
+                for key in party.keys:
+                    self.blocks.setdefault(key, []).append(position)
+
+    def add(self, party):
+        self.add_many([party])
+
+    def find(self, party, threshold=DUPLICATE_THRESHOLD, limit=CANDIDATE_LIMIT):
+        """Indexed parties likely to be ``party``, best first (``party`` itself excluded)."""
+        candidates = set()
+        for key in party.keys:
+            block = self.blocks.get(key, ())
+            if len(block) <= MAX_BLOCK_SIZE:
+                candidates.update(block)
+        duplicates = []
+        for position in candidates:
+            other = self.parties[position]
+            if (other.source, other.source_id) == (party.source, party.source_id):
+                continue
+            value, matched = score(party, other, threshold)
+            if value >= threshold:
+                duplicates.append(Duplicate(other.source, other.source_id, other.name, round(value, 3), matched))
+        duplicates.sort(key=lambda d: d.score, reverse=True)
+        return duplicates[:limit]
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_index():
+    """Return the process-wide EntityIndex, loading it from the store on first use."""
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = EntityIndex.from_store()
+    return _index
+
+
+def preload():
+    """Start loading the process-wide index in the background, so the first lookup does not wait for all of it."""
+    if _index is None and not _index_lock.locked():
+        threading.Thread(target=get_index, name='entity-index', daemon=True).start()
+
+
+# Worker state: every party of the register, in PARTIES_SQL order (each table in id order), and the size of every
+# block
+_worker = {}
+
+
+def _init_worker(db_path):
+    with Store(db_path, pool_size=1).reader() as conn:
+        _worker['parties'] = [Party.from_fields(*row) for row in conn.execute(PARTIES_SQL)]
+    _worker['sizes'] = Counter(key for party in _worker['parties'] for key in party.keys)
+
+
+def _score_blocks(blocks, threshold):
+    """Duplicate pairs (i, j, score) within ``blocks`` of (key, positions), each pair scored in one block only."""
+    parties, sizes = _worker['parties'], _worker['sizes']
+    pairs = []
+    for key, positions in blocks:
+        for n, i in enumerate(positions):
+            a = parties[i]
+            for j in positions[n + 1:]:
+                b = parties[j]
+                # The pair belongs to the first key the two parties share among the blocks that are scored
+                if min(k for k in set(a.keys) & set(b.keys) if sizes[k] <= MAX_BLOCK_SIZE) != key:
+                    continue
+                value, _ = score(a, b, threshold)
+                if value >= threshold:
+                    pairs.append((i, j, value))
+    return pairs
+
+
+def _tasks(index, pairs_per_task):
+    tasks, task, size = [], [], 0
+    for key, positions in index.blocks.items():
+        if 1 < len(positions) <= MAX_BLOCK_SIZE:
+            task.append((key, positions))
+            size += len(positions) * (len(positions) - 1) // 2
+            if size >= pairs_per_task:
+                tasks.append(task)
+                task, size = [], 0
+    if task:
+        tasks.append(task)
+    return tasks
+
+
+def _clusters(pairs, count):
+    """Groups of party positions joined by ``pairs`` (union-find), largest first."""
+    parent = list(range(count))
+
+    def root(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for i, j, _ in pairs:
+        parent[root(i)] = root(j)
+    groups = {}
+    for i in {position for pair in pairs for position in pair[:2]}:
+        groups.setdefault(root(i), []).append(i)
+    return sorted((sorted(group) for group in groups.values()), key=len, reverse=True)
+
+
+def dedupe(store=None, workers=None, threshold=DUPLICATE_THRESHOLD, pairs_per_task=PAIRS_PER_TASK):
+    """Every duplicate pair in the register; returns (parties, pairs, clusters of party positions)."""
+    store = store or get_store()
+    _init_worker(store.path)
+    parties = _worker['parties']
+    tasks = _tasks(EntityIndex(parties), pairs_per_task)
+    if len(tasks) <= 1 or workers == 1:
+        results = [_score_blocks(task, threshold) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(store.path,)) as pool:
+            results = list(pool.map(_score_blocks, tasks, [threshold] * len(tasks)))
+    pairs = [pair for result in results for pair in result]
+    return parties, pairs, _clusters(pairs, len(parties))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Duplicate party detection")
+    commands = parser.add_subparsers(dest='command', required=True)
+    run = commands.add_parser('dedupe', help="find duplicate parties across the register")
+    run.add_argument('--workers', type=int, help="worker processes (default: one per CPU)")
+    run.add_argument('--output', type=Path, help="write the clusters to this CSV")
+    find = commands.add_parser('find', help="look up the likely duplicates of one party")
+    find.add_argument('name', help="first and last name")
+    for option in ('--email', '--phone', '--date-of-birth', '--postal-code'):
+        find.add_argument(option)
+    args = parser.parse_args(argv)
+
+    if args.command == 'find':
+        first_name, _, last_name = args.name.strip().rpartition(' ')
+        party = Party.from_fields(None, None, first_name, last_name, args.email, args.phone, args.date_of_birth,
+                                  args.postal_code)
+        index = get_index()
+        started = time.perf_counter()
+        duplicates = index.find(party)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        for duplicate in duplicates:
+            print(f"{duplicate.score:.3f}  {duplicate.source:<8} {duplicate.source_id:>8}  {duplicate.name}  "
+                  f"({', '.join(duplicate.matched)})")
+        print(f"{len(duplicates)} likely duplicates among {len(index):,} parties ({elapsed_ms:.2f} ms)")
+        return
+
+    started = time.perf_counter()
+    parties, pairs, clusters = dedupe(workers=args.workers)
+    if args.output:
+        best = {}
+        for i, j, value in pairs:
+            best[i] = max(best.get(i, 0.0), value)
+            best[j] = max(best.get(j, 0.0), value)
+        with open(args.output, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(['cluster', 'source', 'source_id', 'name', 'best_score'])
+            for cluster_id, cluster in enumerate(clusters, 1):
+                for i in cluster:
+                    party = parties[i]
+                    writer.writerow([cluster_id, party.source, party.source_id, party.name, round(best[i], 3)])
+    print(f"{len(pairs):,} duplicate pairs in {len(clusters):,} clusters among {len(parties):,} parties "
+          f"({time.perf_counter() - started:.1f}s)")
+
+
+if __name__ == '__main__':
+    main()
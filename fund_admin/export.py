@@ -0,0 +1,355 @@
+"""Static HTML export of the Dashboard and a report for every fund.
+
+    python -m fund_admin.export site/ --workers 8
+
+writes ``site/index.html`` (the Dashboard: metric cards, performance and AUM
+charts, KYC summary, recent activity and a fund table linking to the
+reports) and ``site/funds/fund-<id>.html`` per fund (NAV per unit history,
+AUM, investors by status and KYC status of its investors). Pages open
+offline: plotly.js and the stylesheet are written once to ``site/assets/``
+and shared by every page instead of being inlined into each.
+
+Figures are pre-rendered to their Plotly JSON specs (no plotly figure
+objects are built), and pages are streamed to disk from templates split
+into literal and placeholder segments once per process. The investor and
+KYC breakdowns of every fund are grouped once from the typed register
+(fund_admin.register; its Arrow snapshot when FUND_ADMIN_REGISTER_SNAPSHOT
+is set) and handed to the workers. Funds are split into contiguous id
+ranges; each range is read with one query per table and rendered by its own
+worker process, which writes its pages itself and returns only counts.
+"""
+import argparse
+import html
+import json
+import os
+import re
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from fund_admin.store import Store, get_store
+
+FUNDS_PER_TASK = int(os.environ.get('FUND_ADMIN_EXPORT_FUNDS_PER_TASK', 200))
+CHART_WIDTH_PX = 700
+# Funds shown as their own slice of the exported AUM pie; the rest are merged into "Other"
+PIE_SLICES = 20
+RECENT_ACTIVITIES = 10
+
+STYLESHEET = """
+body { margin: 0 auto; max-width: 1200px; padding: 1rem 2rem; font-family: Arial, sans-serif; color: #333; }
+.main-header { background: linear-gradient(90deg, #0c4a6e 0%, #145374 100%); padding: 1rem; border-radius: 10px;
+               color: white; text-align: center; margin-bottom: 2rem; }
+.cards { display: flex; gap: 1rem; flex-wrap: wrap; }
+.metric-card { flex: 1 1 200px; background: linear-gradient(135deg, #e8f0fc 0%, #cce0ff 100%); padding: 1.5rem;
+               border-radius: 10px; border-left: 4px solid #0c4a6e; margin: 0.5rem 0; }
+.charts { display: flex; gap: 1rem; flex-wrap: wrap; }
+.charts > div { flex: 1 1 500px; }
+table { border-collapse: collapse; width: 100%; margin-bottom: 1.5rem; }
+th, td { border-bottom: 1px solid #ddd; padding: 0.4rem 0.6rem; text-align: left; }
+th { background: #f4f8fb; color: #0c4a6e; }
+.meta, .footer { color: #666; font-size: 0.9rem; }
+"""
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="UTF-8" />
+<meta name="viewport" content="width=device-width, initial-scale=1" />
+<title>$title</title>
+<link rel="stylesheet" href="$assets/report.css" />
+<script src="$assets/plotly.min.js"></script>
+</head>
+<body>
+<div class="main-header"><h1>$title</h1></div>
+<p class="meta">$subtitle</p>
+<div class="cards">$cards</div>
+$body
+<p class="footer">Generated $generated</p>
+</body>
+</html>
+"""
+
+FUNDS_SQL = """
+SELECT id, name, status, aum_musd, investors, launch_date, fund_type, jurisdiction, management_fee, performance_fee
+FROM funds WHERE id BETWEEN ? AND ? ORDER BY id
+"""
+NAV_SQL = """
+SELECT fund_id, class_name, nav_date, nav_per_unit FROM nav
+WHERE fund_id BETWEEN ? AND ? AND nav_per_unit IS NOT NULL ORDER BY fund_id, class_name, nav_date
+"""
+INDEX_FUNDS_SQL = "SELECT id, name, status, aum_musd, investors, launch_date FROM funds ORDER BY id"
+
+
+class Template:
+    """A page template split once into literal text and ``$name`` placeholders."""
+
+    def __init__(self, text):
+        self.segments = re.split(r'\$(\w+)', text)
+
+    def stream(self, f, **parts):
+        """Write the page to the text file ``f``; a part is a string or an iterable of strings."""
+        for i, segment in enumerate(self.segments):
+            if i % 2 == 0:
+                f.write(segment)
+            elif isinstance(parts[segment], str):
+                f.write(parts[segment])
+            else:
+                f.writelines(parts[segment])
+
+    def write(self, path, **parts):
+        """Stream the page to ``path``."""
+        with open(path, 'w', encoding='utf-8') as f:
+            self.stream(f, **parts)
+
+
+@dataclass
+class ExportRun:
+    directory: Path
+    funds: int = 0
+    bytes: int = 0
+    seconds: float = 0.0
+
+
+def cards(pairs):
+    return ''.join(f'<div class="metric-card"><h3>{html.escape(label)}</h3><h2>{html.escape(value)}</h2></div>'
+                   for label, value in pairs)
+
+
+def table(headers, rows):
+    """An HTML table; cells are escaped unless wrapped in Markup."""
+    yield '<table><thead><tr>' + ''.join(f'<th>{html.escape(h)}</th>' for h in headers) + '</tr></thead><tbody>'
+    for row in rows:
+        cells = (c if isinstance(c, Markup) else html.escape(str(c)) for c in row)
+        yield '<tr>' + ''.join(f'<td>{cell}</td>' for cell in cells) + '</tr>'
+    yield '</tbody></table>'
+
+
+class Markup(str):
+    pass
+
+
+def _plot(div_id, traces, layout):
+    """A pre-rendered Plotly figure: its JSON spec and the newPlot() call that draws it."""
+    spec = json.dumps({'data': traces, 'layout': {'height': 400, 'margin': {'t': 40}, **layout}}, default=str)
+    # A name containing "</script>" must not end the script element early
+    spec = spec.replace('</', '<\\/')
+    return (f'<div id="{div_id}"></div><script>(function(f){{Plotly.newPlot("{div_id}", f.data, f.layout, '
+            f'{{"displayModeBar": false, "responsive": true}});}})({spec});</script>')
+
+
+def _line_traces(series):
+    """Line traces from ``{name: (dates, values)}``, each downsampled to the chart width."""
+    from fund_admin.charts import minmax_downsample
+
+    traces = []
+    for name, (dates, values) in series.items():
+        dates, values = minmax_downsample(np.asarray(dates), np.asarray(values, dtype=float), CHART_WIDTH_PX)
+        traces.append({'type': 'scatter', 'mode': 'lines', 'name': name,
+                       'x': np.datetime_as_string(dates.astype('datetime64[D]')).tolist(),
+                       'y': values.round(4).tolist()})
+    return traces
+
+
+def _group(rows):
+    """{fund_id: [rest of row, ...]} from rows sorted or grouped by fund id."""
+    grouped = {}
+    for fund_id, *rest in rows:
+        grouped.setdefault(fund_id, []).append(rest)
+    return grouped
+
+
+def _breakdowns(register):
+    """Per fund id: [(status, investors, committed $)] of its investors and [(status, applications)] of their KYC."""
+    investors = register.investors[register.investors['fund_id'] > 0]
+    by_status = investors.groupby(['fund_id', 'status'], observed=True, dropna=False)['investment_amount'].agg(
+        ['size', 'sum'])
+    kyc = register.kyc[register.kyc['source'] == 'investor'].merge(
+        investors[['investor_id', 'fund_id']], left_on='source_id', right_on='investor_id')
+    kyc_by_status = kyc.groupby(['fund_id', 'status'], observed=True, dropna=False).size()
+    return (
+        _group((int(fund_id), None if pd.isna(status) else status, int(count), total / 100)
+               for (fund_id, status), count, total in zip(by_status.index, by_status['size'], by_status['sum'])),
+        _group((int(fund_id), None if pd.isna(status) else status, int(count))
+               for (fund_id, status), count in kyc_by_status.items()),
+    )
+
+
+# Worker state: one store connection, the parsed template and the register breakdowns per process
+_worker = {}
+
+
+def _init_worker(db_path, directory, generated, investors, kyc):
+    _worker['store'] = Store(db_path, pool_size=1)
+    _worker['directory'] = Path(directory)
+    _worker['generated'] = generated
+    _worker['template'] = Template(PAGE_TEMPLATE)
+    _worker['investors'] = investors
+    _worker['kyc'] = kyc
+
+
+def _fund_page(fund, nav_rows, investor_rows, kyc_rows):
+    fund_id, name, status, aum_musd, investors, launch_date, fund_type, jurisdiction, management_fee, \
+        performance_fee = fund
+    classes = {}
+    for class_name, nav_date, per_unit in nav_rows:
+        dates, values = classes.setdefault(f'Class {class_name}', ([], []))
+        dates.append(nav_date)
+        values.append(per_unit)
+    if classes:
+        performance = _plot('performance', _line_traces({
+            label: (np.array(dates, dtype='datetime64[D]'), values) for label, (dates, values) in classes.items()
+        }), {'title': 'NAV per Unit', 'xaxis': {'title': 'Date'}, 'yaxis': {'title': 'NAV per Unit'}})
+    else:
+        performance = '<p class="meta">No NAV published yet.</p>'
+    investor_table = table(['Status', 'Investors', 'Committed ($)'], [
+        (row_status, f'{count:,}', f'{amount or 0:,.0f}') for row_status, count, amount in sorted(investor_rows)])
+    kyc_table = table(['KYC Status', 'Applications'], [(row_status, f'{count:,}') for row_status, count in
+                                                        sorted(kyc_rows)])
+    body = ['<h2>📈 Performance</h2>', performance, '<h2>👥 Investors</h2>', *investor_table,
+            '<h2>🔒 KYC Status</h2>', *kyc_table, '<p><a href="../index.html">← Dashboard</a></p>']
+    subtitle = ' · '.join(html.escape(str(part)) for part in (
+        fund_type, jurisdiction, f'launched {launch_date}' if launch_date else None,
+        f'{management_fee or 0:g}% management / {performance_fee or 0:g}% performance fee') if part)
+    path = _worker['directory'] / 'funds' / f'fund-{fund_id}.html'
+    _worker['template'].write(
+        path, title=html.escape(name), subtitle=subtitle, assets='../assets', generated=_worker['generated'],
+        cards=cards([('💰 AUM', f'${aum_musd or 0:,.1f}M'), ('👥 Investors', f'{investors:,}'),
+                      ('📌 Status', status)]),
+        body=body,
+    )
+    return path.stat().st_size
+
+
+def _export_range(lo, hi):
+    """Render the reports of funds with ids ``lo``..``hi``; returns (funds, bytes written)."""
+    with _worker['store'].reader() as conn:
+        funds = conn.execute(FUNDS_SQL, (lo, hi)).fetchall()
+        nav = _group(conn.execute(NAV_SQL, (lo, hi)))
+    investors, kyc = _worker['investors'], _worker['kyc']
+    written = sum(_fund_page(fund, nav.get(fund[0], ()), investors.get(fund[0], ()), kyc.get(fund[0], ()))
+                  for fund in funds)
+    return len(funds), written
+
+
+def _write_assets(directory):
+    from plotly.offline import get_plotlyjs
+
+    assets = directory / 'assets'
+    assets.mkdir(parents=True, exist_ok=True)
+    (assets / 'plotly.min.js').write_text(get_plotlyjs(), encoding='utf-8')
+    (assets / 'report.css').write_text(STYLESHEET.lstrip(), encoding='utf-8')
+
+
+def _write_dashboard(directory, store, generated):
+    from fund_admin import activity, data, kpis
+    from fund_admin.sample_data import generate_dashboard_performance
+
+    with store.reader() as conn:
+        funds = conn.execute(INDEX_FUNDS_SQL).fetchall()
+        by_status = {row[0]: row for row in conn.execute(kpis.FUND_STATUS_TOTALS_SQL)}
+        kyc = conn.execute(data.KYC_STATUS_SQL, {'jurisdiction': None, 'investor_type': None}).fetchall()
+        nav_date = conn.execute("SELECT MAX(nav_date) FROM nav").fetchone()[0]
+    aum = sum(row[2] for row in by_status.values())
+    investors = sum(row[3] for row in by_status.values())
+    metric_cards = cards([
+        ('💰 Total AUM', f'${aum:,.0f}M'), ('👥 Total Investors', f'{investors:,}'),
+        ('📈 Active Funds', f"{by_status.get('Active', (0, 0))[1]:,}"),
+        ('⏳ Pending Approvals', f"{by_status.get('Pending', (0, 0))[1]:,}"),
+    ])
+
+    performance = generate_dashboard_performance()
+    series = {fund: (group['Date'].to_numpy(), group['Index'].to_numpy())
+              for fund, group in performance.groupby('Fund', observed=True, sort=True)}
+    series = dict(list(series.items())[:10])
+    ranked = sorted(funds, key=lambda row: row[3] or 0, reverse=True)
+    slices = [(row[1], row[3] or 0) for row in ranked[:PIE_SLICES]]
+    if len(ranked) > PIE_SLICES:
+        slices.append(('Other', sum(row[3] or 0 for row in ranked[PIE_SLICES:])))
+    charts = ('<div class="charts"><div><h2>📈 Fund Performance</h2>'
+              + _plot('performance', _line_traces(series), {'xaxis': {'title': 'Date'},
+                                                             'yaxis': {'title': 'Performance Index'}})
+              + '</div><div><h2>💰 AUM Distribution</h2>'
+              + _plot('aum', [{'type': 'pie', 'labels': [s[0] for s in slices], 'values': [s[1] for s in slices]}],
+                      {'title': 'Assets Under Management by Fund'})
+              + '</div></div>')
+
+    events = activity.get_log().tail(RECENT_ACTIVITIES)
+    body = [
+        charts,
+        '<h2>🔒 KYC Applications</h2>', *table(['Status', 'Applications'], [(s, f'{c:,}') for s, c in kyc]),
+        '<h2>🔄 Recent Activities</h2>',
+        *table(['Date', 'Activity', 'Status'], [(e['ts'].replace('T', ' ')[:16], e['message'], e['status'])
+                                                 for e in events]),
+        '<h2>📋 Fund Overview</h2>',
+        *table(['Fund Name', 'AUM (Million $)', 'Investors', 'Status', 'Launch Date'], (
+            (Markup(f'<a href="funds/fund-{fund_id}.html">{html.escape(name)}</a>'), f'{aum_musd or 0:,.1f}',
+             f'{count:,}', status, launch_date or '')
+            for fund_id, name, status, aum_musd, count, launch_date in funds)),
+    ]
+    path = directory / 'index.html'
+    Template(PAGE_TEMPLATE).write(
+        path, title='📊 Dashboard Overview', assets='assets', cards=metric_cards, body=body,
+        subtitle=f'NAV as of {nav_date}' if nav_date else 'No NAV published yet', generated=generated,
+    )
+    return path.stat().st_size
+
+
+def export_site(directory, store=None, workers=None, funds_per_task=FUNDS_PER_TASK, register=None):
+    """Write the Dashboard and every fund report under ``directory``; returns an ExportRun.
+
+    Investor and KYC breakdowns come from ``register`` (default: the process-wide register, or one built from
+    ``store`` when given).
+    """
+    from fund_admin.register import Register, get_register
+
+    started = time.perf_counter()
+    if register is None:
+        register = get_register() if store is None else Register.from_store(store)
+    store = store or get_store()
+    directory = Path(directory)
+    if (directory / 'funds').exists():
+        shutil.rmtree(directory / 'funds')
+    (directory / 'funds').mkdir(parents=True)
+    generated = datetime.now().strftime('%Y-%m-%d %H:%M')
+    _write_assets(directory)
+    run = ExportRun(directory)
+    run.bytes = _write_dashboard(directory, store, generated)
+    investors, kyc = _breakdowns(register)
+
+    with store.reader() as conn:
+        fund_ids = np.array([row[0] for row in conn.execute("SELECT id FROM funds ORDER BY id")], dtype=np.int64)
+    ranges = [(int(batch[0]), int(batch[-1])) for batch in np.array_split(fund_ids, -(-len(fund_ids) // funds_per_task))
+              ] if len(fund_ids) else []
+    if len(ranges) <= 1 or workers == 1:
+        _init_worker(store.path, directory, generated, investors, kyc)
+        results = [_export_range(lo, hi) for lo, hi in ranges]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(store.path, directory, generated, investors, kyc)) as pool:
+            results = list(pool.map(_export_range, *zip(*ranges)))
+    run.funds = sum(count for count, _ in results)
+    run.bytes += sum(written for _, written in results)
+    run.seconds = time.perf_counter() - started
+    return run
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Static HTML export of the Dashboard and fund reports")
+    parser.add_argument('directory', type=Path)
+    parser.add_argument('--workers', type=int, help="worker processes (default: one per CPU)")
+    parser.add_argument('--funds-per-task', type=int, default=FUNDS_PER_TASK)
+    args = parser.parse_args(argv)
+
+    run = export_site(args.directory, workers=args.workers, funds_per_task=args.funds_per_task)
+    print(f"Exported the Dashboard and {run.funds:,} fund reports ({run.bytes / 2 ** 20:,.1f} MB, shared assets "
+          f"excluded) to {run.directory} in {run.seconds:.1f}s")
+
+
+if __name__ == '__main__':
+    main()
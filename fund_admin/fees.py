@@ -0,0 +1,219 @@
+"""Management and performance fee accrual per investor series.
+
+Every subscription opens a series holding its own units, high-water mark and
+hurdle base. A daily run values each series at that day's class NAV per unit
+and updates its state in place:
+
+* management fee: accrues units x NAV per unit x rate x days since the last
+  accrual / 365;
+* performance fee: rate x the gain per unit (net of accrued management fee)
+  above the higher of the high-water mark and the hurdle (the period's
+  opening NAV per unit grown at the hurdle rate), re-marked every day.
+
+Because the state carries everything the formulas need, a day's run reads
+only the series and that day's NAV rows, never the history. At month end
+accrued fees crystallise: they are posted to fee_postings (and, per series,
+to fee_series_postings for investor statements) and booked as fund payables
+in accruals (so the next NAV is net of them), the high-water mark of
+series that paid a performance fee moves up, and a new hurdle period starts.
+A run only touches series not yet accrued for its date, and reads them in
+the transaction that updates them, so running a date again, or twice at
+once, posts nothing twice.
+All of it runs as array operations over every series of every fund at once.
+
+    python -m fund_admin.fees --date 2023-12-29
+"""
+import argparse
+import time
+from dataclasses import dataclass
+
+import numpy as np
+
+from fund_admin.store import get_store
+
+DAYS_PER_YEAR = 365
+
+# Series of classes without a NAV that day keep their state until the next run,
+# and series already accrued for the day are left alone, so a rerun for the
+# same date is a no-op. CROSS JOIN keeps fee_series as the outer loop, so it is scanned in id order
+# (and later updated in id order) rather than probed through an index.
+SERIES_SQL = """
+SELECT s.id, s.fund_id, s.units, s.high_water_mark, s.period_start, s.period_start_nav,
+       s.accrued_management, s.last_accrual_date, n.nav_per_unit,
+       COALESCE(f.management_fee, 0), f.performance_fee, f.hurdle_rate
+FROM fee_series s
+CROSS JOIN nav n ON n.fund_id = s.fund_id AND n.class_name = s.class_name AND n.nav_date = ?
+JOIN funds f ON f.id = s.fund_id
+WHERE s.units > 0 AND s.last_accrual_date < ? AND n.nav_per_unit IS NOT NULL
+"""
+UPDATE_SERIES_SQL = """
+UPDATE fee_series SET accrued_management = ?, accrued_performance = ?, last_accrual_date = ?,
+    high_water_mark = ?, period_start = ?, period_start_nav = ?
+WHERE id = ?
+"""
+# A later run for the same date only covers series the earlier one skipped, so its totals add to the day's row
+UPSERT_FEE_ACCRUAL_SQL = """
+INSERT INTO fee_accruals (fund_id, accrual_date, management_fee, performance_fee) VALUES (?, ?, ?, ?)
+ON CONFLICT (fund_id, accrual_date) DO UPDATE SET
+    management_fee = management_fee + excluded.management_fee,
+    performance_fee = performance_fee + excluded.performance_fee
+"""
+# Latest published NAV per unit of a fund's first share class, for opening series
+OPENING_PRICE_SQL = """
+SELECT c.fund_id, c.class_name, COALESCE(n.nav_per_unit, c.launch_price), n.nav_date
+FROM funds f
+JOIN share_classes c ON c.fund_id = f.id
+LEFT JOIN nav n ON n.fund_id = c.fund_id AND n.class_name = c.class_name AND n.nav_date = (
+    SELECT MAX(nav_date) FROM nav WHERE fund_id = c.fund_id AND class_name = c.class_name AND nav_date <= ?
+)
+WHERE f.name = ? ORDER BY c.class_name LIMIT 1
+"""
+
+
+@dataclass
+class FeeRun:
+    accrual_date: str
+    series: int = 0
+    management_fee: float = 0.0
+    performance_fee: float = 0.0
+    crystallised: bool = False
+    seconds: float = 0.0
+
+
+def open_series(conn, investments, as_of=None):
+    """Open a series for each (investor_id, fund name, amount) at the fund's current NAV per unit.
+
+    Runs inside the caller's transaction; returns the number of series opened.
+    Investments in funds without a share class are skipped.
+    """
+    from datetime import date
+
+    as_of = as_of or date.today().isoformat()
+    terms = {}
+    rows = []
+    for investor_id, fund, amount in investments:
+        if fund not in terms:
+            terms[fund] = conn.execute(OPENING_PRICE_SQL, (as_of, fund)).fetchone()
+        if terms[fund] is None or not amount:
+            continue
+        fund_id, class_name, price, nav_date = terms[fund]
+        opened_on = nav_date or as_of
+        rows.append((fund_id, class_name, investor_id, opened_on, amount / price, price, opened_on, price, opened_on))
+    conn.executemany(
+        "INSERT INTO fee_series (fund_id, class_name, investor_id, opened_on, units, high_water_mark, "
+        "period_start, period_start_nav, last_accrual_date) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+    return len(rows)
+
+
+def is_month_end(accrual_date):
+    day = np.datetime64(accrual_date, 'D')
+    return np.busday_offset(day, 1, roll='forward').astype('datetime64[M]') != day.astype('datetime64[M]')
+
+
+def compute_fees(units, price, days, accrued_management, management_rate, performance_rate, hurdle_rate,
+                 high_water_mark, period_start_nav, period_days):
+    """Vectorised fee state update for one day; rates are in percent. Returns
+    (accrued management, accrued performance, net NAV per unit)."""
+    management = accrued_management + units * price * management_rate / 100 * days / DAYS_PER_YEAR
+    net = price - management / units
+    hurdle = period_start_nav * (1 + hurdle_rate / 100 * period_days / DAYS_PER_YEAR)
+    performance = units * np.maximum(net - np.maximum(high_water_mark, hurdle), 0) * performance_rate / 100
+    return management, performance, net
+
+
+def _columns(rows, count):
+    if not rows:
+        return [np.empty(0) for _ in range(count)]
+    return [np.array(column) for column in zip(*rows)]
+
+
+def run(accrual_date=None, store=None, crystallise=None):
+    """Accrue fees for ``accrual_date`` (default: the latest NAV date) and, at
+    month end or when ``crystallise`` is true, crystallise them."""
+    started = time.perf_counter()
+    store = store or get_store()
+    accrual_date = accrual_date or store.query_one("SELECT MAX(nav_date) FROM nav")[0]
+    result = FeeRun(accrual_date=accrual_date)
+    if accrual_date is None:
+        return result
+    crystallise = is_month_end(accrual_date) if crystallise is None else crystallise
+
+    # The series are read inside the write transaction, so concurrent runs for a
+    # date are serialised and the second finds nothing left to accrue
+    with store.transaction() as conn:
+        series_rows = conn.execute(SERIES_SQL, (accrual_date, accrual_date)).fetchall()
+        (series_id, fund_id, units, hwm, period_start, period_start_nav, accrued_management, last_accrual,
+         price, management_rate, performance_rate, hurdle_rate) = _columns(series_rows, 12)
+        units, hwm, period_start_nav, price, management_rate, performance_rate, hurdle_rate = (
+            column.astype(float) for column in (units, hwm, period_start_nav, price, management_rate,
+                                                performance_rate, hurdle_rate))
+
+        today = np.datetime64(accrual_date, 'D')
+        days = (today - last_accrual.astype('datetime64[D]')).astype(np.int64)
+        period_days = (today - period_start.astype('datetime64[D]')).astype(np.int64)
+        previous_management = accrued_management.astype(float)
+        management, performance, net = compute_fees(units, price, days, previous_management, management_rate,
+                                                    performance_rate, hurdle_rate, hwm, period_start_nav, period_days)
+
+        funds, slot = np.unique(fund_id.astype(np.int64), return_inverse=True)
+        daily_management = np.bincount(slot, weights=management - previous_management, minlength=len(funds))
+        performance_to_date = np.bincount(slot, weights=performance, minlength=len(funds))
+        fee_accruals = list(zip(funds.tolist(), [accrual_date] * len(funds),
+                                daily_management.tolist(), performance_to_date.tolist()))
+
+        postings, payables, series_postings = [], [], []
+        if crystallise:
+            # A series whose hurdle period already starts on this date has crystallised for it
+            due = period_start != accrual_date
+            crystallised_management = np.bincount(slot, weights=np.where(due, management, 0.0), minlength=len(funds))
+            crystallised_performance = np.bincount(slot, weights=np.where(due, performance, 0.0), minlength=len(funds))
+            after_fees = net - performance / units
+            hwm = np.where(due & (performance > 0), np.maximum(hwm, after_fees), hwm)
+            period_start = np.where(due, accrual_date, period_start)
+            period_start_nav = np.where(due, after_fees, period_start_nav)
+            for fee_type, totals in (('Management Fee', crystallised_management),
+                                     ('Performance Fee', crystallised_performance)):
+                for fund, amount in zip(funds.tolist(), totals.tolist()):
+                    if amount:
+                        postings.append((fund, accrual_date, fee_type, amount))
+                        payables.append((fund, accrual_date, f'{fee_type} payable', -amount))
+            paid = due & ((management != 0) | (performance != 0))
+            series_postings = list(zip(series_id[paid].tolist(), [accrual_date] * int(paid.sum()),
+                                       management[paid].tolist(), performance[paid].tolist()))
+            management = np.where(due, 0.0, management)
+            performance = np.where(due, 0.0, performance)
+
+        updates = zip(management.tolist(), performance.tolist(), [accrual_date] * len(series_id), hwm.tolist(),
+                      period_start.tolist(), period_start_nav.tolist(), series_id.tolist())
+        conn.executemany(UPDATE_SERIES_SQL, updates)
+        conn.executemany(UPSERT_FEE_ACCRUAL_SQL, fee_accruals)
+        conn.executemany("INSERT INTO fee_postings (fund_id, posting_date, fee_type, amount) VALUES (?, ?, ?, ?)",
+                         postings)
+        conn.executemany("INSERT INTO accruals (fund_id, accrual_date, description, amount) VALUES (?, ?, ?, ?)",
+                         payables)
+        conn.executemany("INSERT INTO fee_series_postings (series_id, posting_date, management_fee, performance_fee) "
+                         "VALUES (?, ?, ?, ?)", series_postings)
+
+    result.series = len(series_id)
+    result.management_fee = float(daily_management.sum())
+    result.performance_fee = float(performance_to_date.sum())
+    result.crystallised = bool(crystallise)
+    result.seconds = time.perf_counter() - started
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Daily fee accrual and month-end crystallisation")
+    parser.add_argument('--date', help="accrual date (YYYY-MM-DD); defaults to the latest NAV date")
+    parser.add_argument('--crystallise', action=argparse.BooleanOptionalAction, default=None,
+                        help="force (or suppress) crystallisation; by default it happens at month end")
+    args = parser.parse_args(argv)
+
+    result = run(args.date, crystallise=args.crystallise)
+    print(f"Fees {result.accrual_date}: {result.series:,} series, management ${result.management_fee:,.2f} today, "
+          f"performance ${result.performance_fee:,.2f} accrued"
+          f"{' (crystallised)' if result.crystallised else ''} in {result.seconds:.1f}s")
+
+
+if __name__ == '__main__':
+    main()
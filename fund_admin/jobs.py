@@ -0,0 +1,346 @@
+"""Persistent background job queue for submit-time work.
+
+Jobs live in the store's ``jobs`` table, so they survive restarts and are
+enqueued in the same transaction as the record they belong to. An optional
+idempotency key makes enqueueing the same work twice a no-op that returns the
+existing job. Workers claim jobs in small batches with one UPDATE ...
+RETURNING, run the handler registered for the job's kind, and record the
+outcome; a failing job is retried with exponential backoff until it runs out
+of attempts. Handlers must therefore be safe to run more than once.
+
+The app runs FUND_ADMIN_JOB_WORKERS threads (started with the app by
+start(), 0 to disable) for the quick per-submit jobs. Kinds in
+PROCESS_KINDS (the CPU-bound bulk-import batches and register rescreens)
+are left to one worker process, so they do not compete with page reruns
+for the interpreter. The app starts it when it queues such a job or finds
+one already queued at startup, and restarts it if it exits; the process
+reports each finished batch back so the app can drop its cached datasets.
+Heavier loads can be drained by worker processes of any kind, each running
+its own claim loop:
+
+    python -m fund_admin.jobs work --processes 4 [--kind kyc_verification_batch]
+    python -m fund_admin.jobs status 42
+"""
+import argparse
+import importlib
+import json
+import logging
+import os
+import subprocess
+import sys
+import threading
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+from fund_admin.store import Store, get_store
+
+logger = logging.getLogger(__name__)
+
+WORKERS = int(os.environ.get('FUND_ADMIN_JOB_WORKERS', 2))
+MAX_ATTEMPTS = int(os.environ.get('FUND_ADMIN_JOB_MAX_ATTEMPTS', 5))
+RETRY_BASE_SECONDS = float(os.environ.get('FUND_ADMIN_JOB_RETRY_SECONDS', 5))
+# Jobs a worker claims per transaction, and how long an idle worker sleeps
+# before polling again (an enqueue in the same process wakes it earlier).
+CLAIM_BATCH = 8
+IDLE_POLL_SECONDS = 2.0
+# Running jobs not finished within this many seconds are assumed lost with
+# their worker and are requeued.
+LEASE_SECONDS = 600
+# Pause before the app restarts a worker process that exited
+PROCESS_RESTART_SECONDS = 5.0
+
+QUEUED, RUNNING, SUCCEEDED, FAILED = 'Queued', 'Running', 'Succeeded', 'Failed'
+
+# Job kind -> handler, imported on first use; a handler takes the payload
+# dict and returns a JSON-serialisable result.
+HANDLERS = {
+    'kyc_verification': 'fund_admin.checks.kyc_verification',
+    'background_check': 'fund_admin.checks.background_check',
+    'kyc_verification_batch': 'fund_admin.checks.kyc_verification_batch',
+    'rescreen_register': 'fund_admin.screening.rescreen_job',
+}
+# Kinds the app runs in its worker process rather than on its threads
+PROCESS_KINDS = ('kyc_verification_batch', 'rescreen_register')
+
+ENQUEUE_SQL = """
+INSERT INTO jobs (kind, payload, idempotency_key, max_attempts, run_after) VALUES (?, ?, ?, ?, ?)
+ON CONFLICT (idempotency_key) DO NOTHING
+"""
+CLAIM_SQL = """
+UPDATE jobs SET status = 'Running', attempts = attempts + 1, started_at = ?, updated_at = ?
+WHERE id IN (SELECT id FROM jobs WHERE status = 'Queued' AND run_after <= ? {kinds} ORDER BY run_after, id LIMIT ?)
+RETURNING id, kind, payload, attempts, max_attempts
+"""
+FINISH_SQL = "UPDATE jobs SET status = ?, result = ?, last_error = ?, finished_at = ?, updated_at = ? WHERE id = ?"
+RETRY_SQL = "UPDATE jobs SET status = 'Queued', last_error = ?, run_after = ?, updated_at = ? WHERE id = ?"
+RECOVER_SQL = "UPDATE jobs SET status = 'Queued', updated_at = ? WHERE status = 'Running' AND started_at < ?"
+QUEUED_KINDS_SQL = "SELECT 1 FROM jobs WHERE status = 'Queued' AND kind IN ({kinds}) LIMIT 1"
+
+
+@dataclass(frozen=True)
+class Job:
+    id: int
+    kind: str
+    status: str
+    attempts: int
+    max_attempts: int
+    result: object = None
+    last_error: str = None
+
+    @property
+    def done(self):
+        return self.status in (SUCCEEDED, FAILED)
+
+
+def enqueue(conn, kind, payload, key=None, max_attempts=MAX_ATTEMPTS):
+    """Queue one job in the caller's transaction; returns its id (the existing job's for a known key)."""
+    if kind not in HANDLERS:
+        raise ValueError(f"Unknown job kind: {kind}")
+    cursor = conn.execute(ENQUEUE_SQL, (kind, json.dumps(payload), key, max_attempts, time.time()))
+    if cursor.rowcount:
+        return cursor.lastrowid
+    return conn.execute("SELECT id FROM jobs WHERE idempotency_key = ?", (key,)).fetchone()[0]
+
+
+def enqueue_many(conn, kind, items, max_attempts=MAX_ATTEMPTS):
+    """Queue a (payload, key) pair per job in the caller's transaction; returns the number queued."""
+    if kind not in HANDLERS:
+        raise ValueError(f"Unknown job kind: {kind}")
+    now = time.time()
+    return conn.executemany(ENQUEUE_SQL, ((kind, json.dumps(payload), key, max_attempts, now)
+                                          for payload, key in items)).rowcount
+
+
+def get_job(job_id, store=None):
+    row = (store or get_store()).query_one(
+        "SELECT id, kind, status, attempts, max_attempts, result, last_error FROM jobs WHERE id = ?", (job_id,))
+    if row is None:
+        return None
+    return Job(*row[:5], json.loads(row[5]) if row[5] else None, row[6])
+
+
+def counts(store=None):
+    """Number of jobs per status."""
+    with (store or get_store()).reader() as conn:
+        return dict(conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall())
+
+
+_handlers = {}
+
+
+def _handler(kind):
+    if kind not in _handlers:
+        module, _, name = HANDLERS[kind].rpartition('.')
+        _handlers[kind] = getattr(importlib.import_module(module), name)
+    return _handlers[kind]
+
+
+def retry_delay(attempts):
+    return RETRY_BASE_SECONDS * 2 ** (attempts - 1)
+
+
+def claim(store, limit=CLAIM_BATCH, kinds=None):
+    """Claim up to ``limit`` due jobs (of ``kinds`` only, if given)."""
+    now = time.time()
+    kinds = list(kinds or ())
+    sql = CLAIM_SQL.format(kinds=f"AND kind IN ({', '.join('?' * len(kinds))})" if kinds else '')
+    with store.transaction() as conn:
+        return conn.execute(sql, (now, now, now, *kinds, limit)).fetchall()
+
+
+def run_job(store, job_id, kind, payload, attempts, max_attempts):
+    """Run one claimed job and record its outcome; returns True if it succeeded."""
+    try:
+        result = _handler(kind)(json.loads(payload))
+    except Exception as exc:
+        error = ''.join(traceback.format_exception_only(type(exc), exc)).strip()
+        now = time.time()
+        with store.transaction() as conn:
+            if attempts < max_attempts:
+                conn.execute(RETRY_SQL, (error, now + retry_delay(attempts), now, job_id))
+            else:
+                conn.execute(FINISH_SQL, (FAILED, None, error, now, now, job_id))
+        logger.warning("Job %d (%s) attempt %d/%d failed: %s", job_id, kind, attempts, max_attempts, error)
+        return False
+    now = time.time()
+    with store.transaction() as conn:
+        conn.execute(FINISH_SQL, (SUCCEEDED, json.dumps(result), None, now, now, job_id))
+    return True
+
+
+def recover(store, lease_seconds=LEASE_SECONDS):
+    """Requeue running jobs whose worker has held them longer than the lease; returns how many."""
+    now = time.time()
+    with store.transaction() as conn:
+        return conn.execute(RECOVER_SQL, (now, now - lease_seconds)).rowcount
+
+
+def drain(store, stop=None, wake=None, idle_exit=False, kinds=None, on_batch=None):
+    """Claim and run jobs (of ``kinds`` only, if given) until ``stop`` is set or, with ``idle_exit``, the queue
+    has nothing due. ``on_batch`` is called with the number of jobs after each claimed batch has run."""
+    processed = 0
+    while stop is None or not stop.is_set():
+        try:
+            jobs = claim(store, kinds=kinds)
+            for job in jobs:
+                run_job(store, *job)
+        except Exception:  # e.g. the store is locked; claimed jobs are recovered after the lease
+            logger.exception("Job worker error")
+            jobs = []
+        processed += len(jobs)
+        if jobs and on_batch is not None:
+            on_batch(len(jobs))
+        if not jobs:
+            if idle_exit:
+                return processed
+            if wake is not None:
+                wake.wait(IDLE_POLL_SECONDS)
+                wake.clear()
+            else:
+                time.sleep(IDLE_POLL_SECONDS)
+    return processed
+
+
+class WorkerPool:
+    """Daemon threads draining the queue inside the app process, and its worker process for PROCESS_KINDS."""
+
+    def __init__(self, store, workers=WORKERS):
+        self.store = store
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._process = None
+        self._process_lock = threading.Lock()
+        recover(store)
+        thread_kinds = [kind for kind in HANDLERS if kind not in PROCESS_KINDS]
+        self._threads = [threading.Thread(target=drain, args=(store, self._stop, self._wake),
+                                          kwargs={'kinds': thread_kinds},
+                                          name=f'fund-admin-jobs-{i}', daemon=True) for i in range(workers)]
+        for thread in self._threads:
+            thread.start()
+        # Jobs left queued by an earlier run of the app, or requeued by recover() above
+        if store.query_one(QUEUED_KINDS_SQL.format(kinds=', '.join('?' * len(PROCESS_KINDS))), PROCESS_KINDS):
+            self._start_process()
+
+    def notify(self, process=False):
+        if process:
+            self._start_process()
+        else:
+            self._wake.set()
+
+    def _start_process(self):
+        """Start the worker process for PROCESS_KINDS unless it is running."""
+        with self._process_lock:
+            if self._stop.is_set() or (self._process is not None and self._process.poll() is None):
+                return
+            command = [sys.executable, '-m', 'fund_admin.jobs', 'work', '--follow', str(os.getpid()),
+                       *(f'--kind={kind}' for kind in PROCESS_KINDS)]
+            env = {**os.environ, 'FUND_ADMIN_DB': str(self.store.path)}
+            self._process = subprocess.Popen(command, stdout=subprocess.PIPE, text=True, env=env,
+                                             cwd=Path(__file__).resolve().parent.parent)
+            threading.Thread(target=self._follow, args=(self._process,), name='fund-admin-jobs-process',
+                             daemon=True).start()
+
+    def _follow(self, process):
+        # The process prints a line per finished batch; what the jobs wrote is in the store, not in this
+        # process's caches
+        from fund_admin import data
+
+        for _ in process.stdout:
+            data.invalidate()
+        code = process.wait()
+        # It only exits by itself when it fails; its running jobs are requeued once their lease runs out
+        if not self._stop.wait(PROCESS_RESTART_SECONDS):
+            logger.warning("Job worker process exited with status %s; restarting it", code)
+            recover(self.store)
+            self._start_process()
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        self._wake.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        with self._process_lock:
+            if self._process is not None:
+                self._process.terminate()
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def start():
+    """Start the app's workers unless they are running (no-op with 0 workers); returns the WorkerPool."""
+    global _pool
+    if WORKERS <= 0:
+        return None
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = WorkerPool(get_store(), WORKERS)
+    return _pool
+
+
+def notify(kind=None):
+    """Wake the app's workers after enqueueing jobs of ``kind``, starting them on first use (no-op with 0
+    workers); a kind in PROCESS_KINDS starts the app's worker process instead."""
+    pool = start()
+    if pool is not None:
+        pool.notify(process=kind in PROCESS_KINDS)
+
+
+class _ParentExited:
+    """Stop condition of a worker process that should not outlive the process ``pid`` that started it."""
+
+    def __init__(self, pid):
+        self.pid = pid
+
+    def is_set(self):
+        return os.getppid() != self.pid
+
+
+def _report_batch(count):
+    print(count, flush=True)
+
+
+def _work_process(db_path, idle_exit, kinds=None):
+    return drain(Store(db_path, pool_size=1), idle_exit=idle_exit, kinds=kinds)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Background job queue")
+    commands = parser.add_subparsers(dest='command', required=True)
+    work = commands.add_parser('work', help="run worker processes")
+    work.add_argument('--processes', type=int, default=os.cpu_count())
+    work.add_argument('--until-idle', action='store_true', help="exit once no job is due")
+    work.add_argument('--kind', action='append', choices=sorted(HANDLERS), help="only run jobs of this kind")
+    work.add_argument('--follow', type=int, metavar='PID',
+                      help="run in this process until its parent PID exits, printing a line per finished batch")
+    status = commands.add_parser('status', help="show one job, or job counts by status")
+    status.add_argument('job_id', type=int, nargs='?')
+    args = parser.parse_args(argv)
+
+    store = get_store()
+    if args.command == 'status':
+        if args.job_id is None:
+            for job_status, count in sorted(counts(store).items()):
+                print(f"{job_status:<10} {count:>9,}")
+        else:
+            print(get_job(args.job_id, store) or f"No job {args.job_id}")
+        return
+
+    if args.follow:
+        drain(store, stop=_ParentExited(args.follow), kinds=args.kind, on_batch=_report_batch)
+        return
+    started = time.perf_counter()
+    print(f"Requeued {recover(store):,} lost jobs")
+    with ProcessPoolExecutor(max_workers=args.processes) as pool:
+        processed = sum(pool.map(_work_process, [store.path] * args.processes, [args.until_idle] * args.processes,
+                                 [args.kind] * args.processes))
+    print(f"Processed {processed:,} jobs in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,124 @@
+"""Running totals behind the Dashboard metric cards.
+
+The aggregator is primed once per process from a single SQL aggregate and
+then kept current by the submit handlers and the NAV run, so each update and
+each snapshot is O(1) regardless of how many funds or holdings sit behind
+the numbers. A NAV published by another process (the NAV CLI) is picked up
+by the Dashboard when its datasets reload with a later NAV date. Nothing
+else moves the totals: funds keep the status they were onboarded with,
+dealing changes AUM only through the next NAV run, and KYC and investor
+statuses are not counted.
+"""
+import threading
+from collections import Counter
+from dataclasses import dataclass, field
+
+FUND_STATUS_TOTALS_SQL = """
+SELECT status, COUNT(*), COALESCE(SUM(aum_musd), 0), COALESCE(SUM(investors), 0)
+FROM funds GROUP BY status
+"""
+NAV_DATE_SQL = "SELECT MAX(nav_date) FROM nav"
+
+
+@dataclass(frozen=True)
+class KpiSnapshot:
+    aum_musd: float
+    investors: int
+    funds_by_status: dict = field(default_factory=dict)
+    # Date of the latest NAV run the AUM includes
+    nav_date: str = None
+
+    @property
+    def active_funds(self):
+        return self.funds_by_status.get('Active', 0)
+
+    @property
+    def pending_funds(self):
+        return self.funds_by_status.get('Pending', 0)
+
+
+class KpiAggregator:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._aum_musd = 0.0
+        self._investors = 0
+        self._funds_by_status = Counter()
+        self._nav_date = None
+        self._snapshot = None
+        self.store_path = None
+
+    @classmethod
+    def from_store(cls, store):
+        aggregator = cls()
+        aggregator.resync(store)
+        return aggregator
+
+    def resync(self, store):
+        """Rebuild the totals from the store (e.g. after an out-of-process bulk load)."""
+        with store.reader() as conn:
+            rows = conn.execute(FUND_STATUS_TOTALS_SQL).fetchall()
+            nav_date = conn.execute(NAV_DATE_SQL).fetchone()[0]
+        with self._lock:
+            self._funds_by_status = Counter({status: count for status, count, _, _ in rows})
+            self._aum_musd = float(sum(aum for _, _, aum, _ in rows))
+            self._investors = int(sum(investors for _, _, _, investors in rows))
+            self._nav_date = nav_date
+            self._snapshot = None
+            self.store_path = store.path
+
+    def record_fund(self, status, aum_musd=0.0, investors=0):
+        with self._lock:
+            self._funds_by_status[status] += 1
+            self._aum_musd += aum_musd
+            self._investors += investors
+            self._snapshot = None
+
+    def record_investor(self, count=1, aum_musd=0.0):
+        with self._lock:
+            self._investors += count
+            self._aum_musd += aum_musd
+            self._snapshot = None
+
+    def record_aum_change(self, delta_musd, nav_date=None):
+        with self._lock:
+            self._aum_musd += delta_musd
+            if nav_date is not None:
+                self._nav_date = max(self._nav_date or nav_date, nav_date)
+            self._snapshot = None
+
+    def snapshot(self):
+        snapshot = self._snapshot
+        if snapshot is None:
+            with self._lock:
+                snapshot = self._snapshot = KpiSnapshot(
+                    aum_musd=self._aum_musd,
+                    investors=self._investors,
+                    funds_by_status={k: v for k, v in self._funds_by_status.items() if v},
+                    nav_date=self._nav_date,
+                )
+        return snapshot
+
+
+_aggregator = None
+_aggregator_lock = threading.Lock()
+
+
+def get_aggregator():
+    """Return the process-wide aggregator, priming it from the store on first use."""
+    global _aggregator
+    if _aggregator is None:
+        with _aggregator_lock:
+            if _aggregator is None:
+                from fund_admin.store import get_store
+                _aggregator = KpiAggregator.from_store(get_store())
+    return _aggregator
+
+
+def record_nav(store, delta_musd, nav_date):
+    """Apply a NAV run's change in total AUM to the process-wide aggregator, if one is primed from ``store``.
+
+    Never primes it: an aggregator primed after the run reads the new AUM anyway.
+    """
+    aggregator = _aggregator
+    if aggregator is not None and aggregator.store_path == store.path:
+        aggregator.record_aum_change(delta_musd, nav_date)
@@ -0,0 +1,223 @@
+"""End-of-day NAV engine.
+
+NAV per fund is the value of its positions at the latest price on or before
+the NAV date plus its unsettled accruals; it is split across share classes
+in proportion to each class's capital (units x prior NAV per unit, or the
+launch price before the first run). Every step is an array operation over
+the positions of a whole batch of funds: positions are mapped to fund slots
+with searchsorted and summed with bincount, never looped over.
+
+Funds are partitioned into contiguous id ranges; each range is read and
+valued by its own worker process, and the parent writes every result in one
+transaction, updating funds.aum_musd so the Dashboard cards, AUM pie and
+Fund Overview all show the published NAV: the run moves the process-wide KPI
+totals by the change in AUM and drops the cached datasets.
+
+    python -m fund_admin.nav --date 2023-12-29 --workers 8
+"""
+import argparse
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from fund_admin import data, kpis
+from fund_admin.store import Store, get_store
+
+logger = logging.getLogger(__name__)
+
+FUNDS_PER_TASK = int(os.environ.get('FUND_ADMIN_NAV_FUNDS_PER_TASK', 500))
+
+PRICES_SQL = """
+SELECT security_id, price, MAX(price_date) FROM prices WHERE price_date <= ? GROUP BY security_id
+"""
+POSITIONS_SQL = "SELECT fund_id, security_id, quantity FROM positions WHERE fund_id BETWEEN ? AND ?"
+ACCRUALS_SQL = """
+SELECT fund_id, SUM(amount) FROM accruals
+WHERE settled = 0 AND accrual_date <= ? AND fund_id BETWEEN ? AND ? GROUP BY fund_id
+"""
+CLASSES_SQL = """
+SELECT c.fund_id, c.class_name, c.units, COALESCE((
+    SELECT n.nav_per_unit FROM nav n
+    WHERE n.fund_id = c.fund_id AND n.class_name = c.class_name AND n.nav_date < ? AND n.nav_per_unit IS NOT NULL
+    ORDER BY n.nav_date DESC LIMIT 1
+), c.launch_price)
+FROM share_classes c WHERE c.fund_id BETWEEN ? AND ? ORDER BY c.fund_id, c.class_name
+"""
+TOTAL_AUM_SQL = "SELECT COALESCE(SUM(aum_musd), 0) FROM funds"
+UPSERT_NAV_SQL = """
+INSERT OR REPLACE INTO nav (fund_id, class_name, nav_date, gross_assets, accruals, nav, units, nav_per_unit)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+@dataclass
+class NavRun:
+    nav_date: str
+    funds: int = 0
+    classes: int = 0
+    nav_musd: float = 0.0
+    # Funds left unpublished because a position has no price on or before nav_date
+    unpriced_funds: list = field(default_factory=list)
+    seconds: float = 0.0
+
+
+def compute_nav(fund_ids, positions, prices, accruals, classes):
+    """Value one batch of funds.
+
+    ``fund_ids`` is sorted; ``positions`` is (fund_id, security_id, quantity),
+    ``accruals`` (fund_id, amount) and ``classes`` (fund_id, units, prior
+    NAV per unit), each as a tuple of aligned arrays, with classes grouped by
+    fund. ``prices`` is indexed by security id (NaN where unpriced). Returns
+    per-fund (gross, accrued, nav, priced) and per-class (gross, accrued,
+    nav, nav_per_unit) arrays.
+    """
+    n = len(fund_ids)
+    position_fund, security, quantity = positions
+    slot = np.searchsorted(fund_ids, position_fund)
+    value = quantity * prices[security]
+    unpriced = np.isnan(value)
+    gross = np.bincount(slot, weights=np.where(unpriced, 0.0, value), minlength=n)
+    priced = np.bincount(slot, weights=unpriced, minlength=n) == 0
+
+    accrual_fund, amount = accruals
+    accrued = np.bincount(np.searchsorted(fund_ids, accrual_fund), weights=amount, minlength=n)
+    fund_nav = gross + accrued
+
+    class_fund, units, prior_price = classes
+    class_slot = np.searchsorted(fund_ids, class_fund)
+    capital = units * prior_price
+    total = np.bincount(class_slot, weights=capital, minlength=n)[class_slot]
+    # A fund with no capital in issue yet books everything to its first class
+    first = np.r_[True, class_slot[1:] != class_slot[:-1]] if len(class_slot) else np.empty(0, dtype=bool)
+    share = np.divide(capital, total, out=first.astype(float), where=total > 0)
+    class_nav = fund_nav[class_slot] * share
+    nav_per_unit = np.divide(class_nav, units, out=np.full(len(units), np.nan), where=units > 0)
+    return (gross, accrued, fund_nav, priced), (gross[class_slot] * share, accrued[class_slot] * share,
+                                                class_nav, nav_per_unit)
+
+
+def _columns(rows, count):
+    if not rows:
+        return tuple(np.empty(0) for _ in range(count))
+    return tuple(np.array(column) for column in zip(*rows))
+
+
+def _known(fund_ids, fund_column, *columns):
+    keep = np.isin(fund_column, fund_ids)
+    return (fund_column[keep], *(column[keep] for column in columns))
+
+
+# Worker state: prices are sent once per process, not once per task
+_worker = {}
+
+
+def _init_worker(db_path, prices):
+    _worker['store'] = Store(db_path, pool_size=1)
+    _worker['prices'] = prices
+
+
+def _value_range(nav_date, fund_ids, store=None, prices=None):
+    """Read and value the funds in ``fund_ids`` (a sorted, contiguous id range)."""
+    store = store or _worker['store']
+    prices = _worker['prices'] if prices is None else prices
+    lo, hi = int(fund_ids[0]), int(fund_ids[-1])
+    with store.reader() as conn:
+        position_rows = conn.execute(POSITIONS_SQL, (lo, hi)).fetchall()
+        accrual_rows = conn.execute(ACCRUALS_SQL, (nav_date, lo, hi)).fetchall()
+        class_rows = conn.execute(CLASSES_SQL, (nav_date, lo, hi)).fetchall()
+    # Rows of funds deleted since the id list was read are dropped
+    position_fund, security, quantity = _known(fund_ids, *_columns(position_rows, 3))
+    positions = (position_fund.astype(np.int64), security.astype(np.int64), quantity.astype(float))
+    accruals = tuple(c.astype(float) for c in _known(fund_ids, *_columns(accrual_rows, 2)))
+    class_fund, class_names, units, prior_price = _known(fund_ids, *_columns(class_rows, 4))
+    classes = (class_fund.astype(np.int64), units.astype(float), prior_price.astype(float))
+    # Securities priced after the table was sized count as unpriced
+    if len(security) and security.max() >= len(prices):
+        prices = np.concatenate([prices, np.full(security.max() + 1 - len(prices), np.nan)])
+    funds, by_class = compute_nav(fund_ids, positions, prices, accruals, classes)
+    return fund_ids, funds, (class_fund, class_names, units, *by_class)
+
+
+def load_prices(store, nav_date):
+    """Latest price on or before ``nav_date`` per security, as an array indexed by security id."""
+    with store.reader() as conn:
+        rows = conn.execute(PRICES_SQL, (nav_date,)).fetchall()
+    security, price, _ = _columns(rows, 3)
+    prices = np.full(int(security.max()) + 1 if len(security) else 1, np.nan)
+    prices[security.astype(np.int64)] = price
+    return prices
+
+
+def latest_price_date(store):
+    return store.query_one("SELECT MAX(price_date) FROM prices")[0]
+
+
+def run_eod(nav_date=None, store=None, workers=None, funds_per_task=FUNDS_PER_TASK):
+    """Compute and publish NAV for every fund as of ``nav_date`` (default: the latest price date)."""
+    started = time.perf_counter()
+    store = store or get_store()
+    nav_date = nav_date or latest_price_date(store)
+    run = NavRun(nav_date=nav_date)
+    if nav_date is None:
+        return run
+    with store.reader() as conn:
+        fund_ids = np.array([row[0] for row in conn.execute("SELECT id FROM funds ORDER BY id")], dtype=np.int64)
+    if not len(fund_ids):
+        return run
+    prices = load_prices(store, nav_date)
+    batches = np.array_split(fund_ids, -(-len(fund_ids) // funds_per_task))
+
+    if len(batches) == 1 or workers == 1:
+        results = [_value_range(nav_date, batch, store, prices) for batch in batches]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(store.path, prices)) as pool:
+            results = list(pool.map(_value_range, [nav_date] * len(batches), batches))
+
+    nav_rows, aum_rows = [], []
+    for ids, (_, _, fund_nav, priced), (class_fund, class_names, units, *by_class) in results:
+        run.unpriced_funds.extend(ids[~priced].tolist())
+        aum_rows.extend(zip((fund_nav[priced] / 1e6).tolist(), ids[priced].tolist()))
+        run.nav_musd += float(fund_nav[priced].sum()) / 1e6
+        keep = priced[np.searchsorted(ids, class_fund)]
+        gross, accrued, class_nav, per_unit = (column[keep] for column in by_class)
+        nav_rows.extend(zip(
+            class_fund[keep].tolist(), class_names[keep].tolist(), [nav_date] * int(keep.sum()),
+            gross.tolist(), accrued.tolist(), class_nav.tolist(), units[keep].tolist(),
+            np.where(np.isnan(per_unit), None, per_unit).tolist(),
+        ))
+
+    with store.transaction() as conn:
+        aum_before = conn.execute(TOTAL_AUM_SQL).fetchone()[0]
+        conn.executemany(UPSERT_NAV_SQL, nav_rows)
+        conn.executemany("UPDATE funds SET aum_musd = ? WHERE id = ?", aum_rows)
+        aum_after = conn.execute(TOTAL_AUM_SQL).fetchone()[0]
+    kpis.record_nav(store, aum_after - aum_before, nav_date)
+    data.invalidate()
+    run.funds, run.classes = len(aum_rows), len(nav_rows)
+    run.seconds = time.perf_counter() - started
+    if run.unpriced_funds:
+        logger.warning("NAV %s: %d funds not published (unpriced positions)", nav_date, len(run.unpriced_funds))
+    return run
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="End-of-day NAV run")
+    parser.add_argument('--date', help="NAV date (YYYY-MM-DD); defaults to the latest price date")
+    parser.add_argument('--workers', type=int, help="worker processes (default: one per CPU)")
+    parser.add_argument('--funds-per-task', type=int, default=FUNDS_PER_TASK)
+    args = parser.parse_args(argv)
+
+    run = run_eod(args.date, workers=args.workers, funds_per_task=args.funds_per_task)
+    print(f"NAV {run.nav_date}: {run.funds:,} funds, {run.classes:,} share classes, "
+          f"${run.nav_musd:,.1f}M in {run.seconds:.1f}s")
+    if run.unpriced_funds:
+        print(f"{len(run.unpriced_funds):,} funds not published (unpriced positions)")
+
+
+if __name__ == '__main__':
+    main()
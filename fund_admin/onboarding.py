@@ -0,0 +1,287 @@
+"""Submit handlers for the onboarding and relationship forms.
+
+Each handler writes its record (and any KYC application it opens) in one
+transaction, then invalidates the cached dashboard datasets. Client, person
+and investor applicants are screened against the sanctions/PEP watchlist
+before their KYC application is opened, and the rest of their KYC checks
+are queued as a background job in the same transaction. They are also
+looked up in the entity index first, so the form can warn when the applicant
+looks like an existing party. Relationships that carry a stake or voting
+control also update the ownership graph. Once the transaction has committed,
+every handler appends an event to the activity log.
+"""
+from dataclasses import dataclass, field, replace
+from datetime import date
+
+from fund_admin import activity, checks, data, entities, jobs, kpis, ownership
+from fund_admin.store import get_store
+
+DEFAULT_SHARE_CLASS = 'A'
+
+
+@dataclass(frozen=True)
+class Submission:
+    id: int
+    screening_status: str = 'Not Screened'
+    matches: list = field(default_factory=list)
+    # Dealing date of the subscription an investor submission queued
+    dealing_date: str = None
+    # Background job running the applicant's KYC checks
+    job_id: int = None
+    # Existing parties (entities.Duplicate) the applicant is likely to be
+    duplicates: list = field(default_factory=list)
+
+
+def _screen(applicant_name):
+    from fund_admin import screening
+
+    return screening.screen_name(applicant_name)
+
+
+def _kyc_application(applicant_name, source, source_id, jurisdiction=None, investor_type=None, screening=None):
+    screening_status, screening_score, _ = screening or ('Not Screened', None, [])
+    return {
+        'applicant_name': applicant_name,
+        'application_date': date.today().isoformat(),
+        'status': 'Pending',
+        'risk_level': 'High' if screening_status == 'Potential Match' else 'Medium',
+        'documents': 'Pending',
+        'jurisdiction': jurisdiction,
+        'investor_type': investor_type,
+        'source': source,
+        'source_id': source_id,
+        'screening_status': screening_status,
+        'screening_score': screening_score,
+    }
+
+
+def _kyc_applications(names, source, first_id, jurisdiction=None, investor_type=None):
+    """Vectorised _kyc_application() for a batch of consecutive source ids.
+
+    ``jurisdiction`` and ``investor_type`` may be Series aligned with ``names``
+    or scalars applied to every row.
+    """
+    import pandas as pd
+
+    def values(column):
+        return column.to_numpy() if isinstance(column, pd.Series) else column
+
+    return pd.DataFrame({
+        'applicant_name': names.to_numpy(),
+        'application_date': date.today().isoformat(),
+        'status': 'Pending',
+        'risk_level': 'Medium',
+        'documents': 'Pending',
+        'jurisdiction': values(jurisdiction),
+        'investor_type': values(investor_type),
+        'source': source,
+        'source_id': range(first_id, first_id + len(names)),
+    })
+
+
+def _queue_checks(conn, kind, application_id):
+    return jobs.enqueue(conn, kind, {'application_id': application_id}, key=f'{kind}:{application_id}')
+
+
+def _queue_check_batches(conn, source, first_id, count):
+    # One job per BATCH_SIZE consecutive imported records, run by the app's worker process
+    kind = 'kyc_verification_batch'
+    starts = range(first_id, first_id + count, checks.BATCH_SIZE)
+    jobs.enqueue_many(conn, kind, (
+        ({'source': source, 'first_source_id': start, 'count': min(checks.BATCH_SIZE, first_id + count - start)},
+         f'{kind}:{source}:{start}') for start in starts))
+
+
+def _duplicate_of(duplicates):
+    """Activity event fields naming the best existing match, if any."""
+    if not duplicates:
+        return {}
+    return {'duplicate_of': {'source': duplicates[0].source, 'source_id': duplicates[0].source_id,
+                             'score': duplicates[0].score}}
+
+
+def _index_import(index, source, first_id, frame):
+    columns = [frame[column].astype(object).where(frame[column].notna(), None).tolist() if column in frame
+               else [None] * len(frame)
+               for column in ('first_name', 'last_name', 'email', 'phone', 'date_of_birth', 'postal_code')]
+    index.add_many(entities.Party.from_fields(source, source_id, *fields)
+                   for source_id, *fields in zip(range(first_id, first_id + len(frame)), *columns))
+
+
+def _screening_status(screening):
+    return activity.FLAGGED if screening[0] == 'Potential Match' else activity.PENDING
+
+
+def _next_id(conn, table):
+    # Writes are serialised by Store.transaction(), so rows inserted by the
+    # caller's executemany() receive consecutive ids starting here.
+    return conn.execute(f"SELECT COALESCE(MAX(id), 0) + 1 FROM {table}").fetchone()[0]
+
+
+def _full_name(record):
+    return f"{record.get('first_name', '')} {record.get('last_name', '')}".strip()
+
+
+def submit_fund(record):
+    store = get_store()
+    # Prime the aggregator before writing so the new fund is not counted twice
+    aggregator = kpis.get_aggregator()
+    with store.transaction() as conn:
+        fund_id = store.insert('funds', {**record, 'status': 'Pending'}, conn=conn)
+        store.insert('share_classes', {'fund_id': fund_id, 'class_name': DEFAULT_SHARE_CLASS}, conn=conn)
+    aggregator.record_fund('Pending')
+    activity.record(f"{record['name']} submitted for approval", activity.PENDING, record['name'],
+                    source='fund', source_id=fund_id)
+    data.invalidate()
+    return fund_id
+
+
+def submit_client(record):
+    store = get_store()
+    screening = _screen(_full_name(record))
+    # Loaded before writing so the new client is not indexed twice
+    index = entities.get_index()
+    party = entities.Party.from_record('client', None, record)
+    duplicates = index.find(party)
+    with store.transaction() as conn:
+        client_id = store.insert('clients', record, conn=conn)
+        application_id = store.insert('kyc_applications', _kyc_application(
+            _full_name(record), 'client', client_id,
+            jurisdiction=record.get('country'), investor_type='Individual', screening=screening,
+        ), conn=conn)
+        job_id = _queue_checks(conn, 'kyc_verification', application_id)
+    jobs.notify()
+    index.add(replace(party, source_id=client_id))
+    activity.record(f"Client application submitted for {_full_name(record)}", _screening_status(screening),
+                    source='client', source_id=client_id, **_duplicate_of(duplicates))
+    data.invalidate()
+    return Submission(client_id, screening[0], screening[2], job_id=job_id, duplicates=duplicates)
+
+
+def import_clients(frame):
+    """Bulk variant of submit_client() for a validated DataFrame; returns the row count."""
+    store = get_store()
+    names = frame['first_name'].str.strip() + ' ' + frame['last_name'].str.strip()
+    index = entities.get_index()
+    with store.transaction() as conn:
+        first_id = _next_id(conn, 'clients')
+        store.insert_many('clients', frame, conn=conn)
+        store.insert_many('kyc_applications', _kyc_applications(
+            names, 'client', first_id,
+            jurisdiction=frame['country'], investor_type='Individual',
+        ), conn=conn)
+        _queue_check_batches(conn, 'client', first_id, len(frame))
+    jobs.notify('kyc_verification_batch')
+    _index_import(index, 'client', first_id, frame)
+    activity.record(f"{len(frame):,} clients imported", activity.PENDING, source='client', source_id=first_id)
+    data.invalidate()
+    return len(frame)
+
+
+def submit_person(record):
+    store = get_store()
+    screening = _screen(_full_name(record))
+    index = entities.get_index()
+    party = entities.Party.from_record('person', None, record)
+    duplicates = index.find(party)
+    with store.transaction() as conn:
+        person_id = store.insert('persons', record, conn=conn)
+        application_id = store.insert('kyc_applications', _kyc_application(
+            _full_name(record), 'person', person_id,
+            jurisdiction=record.get('country'), investor_type='Individual', screening=screening,
+        ), conn=conn)
+        job_id = _queue_checks(conn, 'background_check', application_id)
+    jobs.notify()
+    index.add(replace(party, source_id=person_id))
+    activity.record(f"Person application submitted for {_full_name(record)}", _screening_status(screening),
+                    source='person', source_id=person_id, **_duplicate_of(duplicates))
+    data.invalidate()
+    return Submission(person_id, screening[0], screening[2], job_id=job_id, duplicates=duplicates)
+
+
+def submit_investor(record):
+    """Record an investor and queue its subscription; the AML check is the outcome of watchlist screening."""
+    from fund_admin import dealing
+
+    store = get_store()
+    aggregator = kpis.get_aggregator()
+    screening = _screen(_full_name(record))
+    index = entities.get_index()
+    party = entities.Party.from_record('investor', None, record)
+    duplicates = index.find(party)
+    record = {**record, 'aml_check': screening[0] == 'Clear', 'status': 'Pending'}
+    with store.transaction() as conn:
+        investor_id = store.insert('investors', record, conn=conn)
+        conn.execute("UPDATE funds SET investors = investors + 1 WHERE name = ?", (record['fund'],))
+        dealing_date, = dealing.queue_subscriptions(conn, [(investor_id, record['fund'], record['investment_amount'])])
+        application_id = store.insert('kyc_applications', _kyc_application(
+            _full_name(record), 'investor', investor_id, investor_type=record.get('investor_type'),
+            screening=screening,
+        ), conn=conn)
+        job_id = _queue_checks(conn, 'kyc_verification', application_id)
+    jobs.notify()
+    aggregator.record_investor()
+    index.add(replace(party, source_id=investor_id))
+    activity.record(f"New investor {_full_name(record)} onboarded to {record['fund']}", _screening_status(screening),
+                    record['fund'], source='investor', source_id=investor_id, **_duplicate_of(duplicates))
+    data.invalidate()
+    return Submission(investor_id, screening[0], screening[2], dealing_date, job_id, duplicates)
+
+
+def import_investors(frame):
+    """Bulk variant of submit_investor() for a validated DataFrame; returns the row count."""
+    from fund_admin import dealing
+
+    store = get_store()
+    aggregator = kpis.get_aggregator()
+    names = frame['first_name'].str.strip() + ' ' + frame['last_name'].str.strip()
+    per_fund = frame['fund'].value_counts()
+    index = entities.get_index()
+    with store.transaction() as conn:
+        first_id = _next_id(conn, 'investors')
+        store.insert_many('investors', frame.assign(status='Pending'), conn=conn)
+        conn.executemany("UPDATE funds SET investors = investors + ? WHERE name = ?",
+                         [(int(count), fund) for fund, count in per_fund.items()])
+        dealing.queue_subscriptions(conn, zip(range(first_id, first_id + len(frame)), frame['fund'].tolist(),
+                                              frame['investment_amount'].tolist()))
+        store.insert_many('kyc_applications', _kyc_applications(
+            names, 'investor', first_id, investor_type=frame['investor_type'],
+        ), conn=conn)
+        _queue_check_batches(conn, 'investor', first_id, len(frame))
+    jobs.notify('kyc_verification_batch')
+    aggregator.record_investor(len(frame))
+    _index_import(index, 'investor', first_id, frame)
+    activity.get_log().append_many({
+        'message': f"{int(count):,} investors imported into {fund}", 'status': activity.PENDING, 'fund': fund,
+        'source': 'investor',
+    } for fund, count in per_fund.items())
+    data.invalidate()
+    return len(frame)
+
+
+def _submit_relationship(table, record, edge, message):
+    store = get_store()
+    # Load the graph before writing so the new edge is not applied twice
+    graph = ownership.get_graph() if edge else None
+    with store.transaction() as conn:
+        relationship_id = store.insert(table, record, conn=conn)
+        if edge:
+            ownership.save_edge(conn, edge)
+    if edge:
+        graph.set_edge(*edge)
+    activity.record(message, fund=record['fund'], source=table, source_id=relationship_id)
+    data.invalidate()
+    return relationship_id
+
+
+def submit_fund_company_relationship(record):
+    edge = ownership.edge_from_relationship(record['company_name'], record['fund'], record.get('ownership_percentage'))
+    message = f"{record['company_name'] or 'Company'} added as {record['relationship_type']} of {record['fund']}"
+    return _submit_relationship('fund_company_relationships', record, edge, message)
+
+
+def submit_individual_fund_relationship(record):
+    edge = ownership.edge_from_relationship(record['individual_name'], record['fund'], record.get('ownership_percentage'),
+                                            record.get('voting_rights'), record.get('board_seat'))
+    message = f"{record['individual_name'] or 'Individual'} added as {record['role_in_fund']} of {record['fund']}"
+    return _submit_relationship('individual_fund_relationships', record, edge, message)
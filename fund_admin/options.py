@@ -0,0 +1,29 @@
+"""Choice lists and limits shared by the onboarding forms and bulk import."""
+
+FUND_NAMES = ["Alpha Growth Fund", "Beta Income Fund", "Gamma Tech Fund", "Delta Balanced Fund"]
+INVESTOR_TYPES = ["Individual", "Institutional", "Family Office", "Pension Fund", "Endowment"]
+SOURCES_OF_FUNDS = ["Personal Savings", "Inheritance", "Business Proceeds", "Investment Returns", "Other"]
+ANNUAL_INCOME_RANGES = ["$0-$50,000", "$50,001-$100,000", "$100,001-$250,000", "$250,001-$500,000", "$500,001+"]
+NET_WORTH_RANGES = ["$0-$100,000", "$100,001-$500,000", "$500,001-$1,000,000", "$1,000,001-$5,000,000", "$5,000,001+"]
+INVESTMENT_EXPERIENCE = ["Beginner", "Intermediate", "Advanced", "Professional"]
+RISK_TOLERANCE = ["Conservative", "Moderate", "Aggressive"]
+FUND_STATUSES = ["Active", "Pending"]
+KYC_STATUSES = ["Approved", "Pending", "Rejected"]
+KYC_RISK_LEVELS = ["Low", "Medium", "High"]
+COUNTRIES = ["United States", "Canada", "United Kingdom", "Germany", "France", "Australia"]
+
+MIN_INVESTMENT_AMOUNT = 10000
+
+# Column layout of bulk import files (see fund_admin.bulk_import)
+BULK_IMPORT_COLUMNS = {
+    'investors': [
+        'investor_type', 'first_name', 'last_name', 'email', 'phone', 'fund', 'investment_amount',
+        'source_of_funds', 'annual_income', 'net_worth', 'investment_experience', 'risk_tolerance',
+        'kyc_completed', 'aml_check', 'suitability_assessment',
+    ],
+    'clients': [
+        'first_name', 'last_name', 'email', 'phone', 'date_of_birth', 'address_line1', 'address_line2',
+        'city', 'state', 'postal_code', 'country', 'annual_income', 'net_worth', 'investment_experience',
+        'risk_tolerance', 'investment_goals', 'preferred_funds',
+    ],
+}
@@ -0,0 +1,214 @@
+"""Ownership graph behind the relationship pages.
+
+Ownership links (individual -> fund from Individual/Fund Relationship,
+company or fund -> fund from Fund/Company Relationship) are stored as edges
+and mirrored in memory as adjacency maps in both directions. Look-through
+ownership of an entity (for every ultimate owner, the sum over all paths of
+the product of the stakes along the path) is memoised per entity. Changing
+an edge drops the memo of the owned entity and of everything it holds in
+turn, which is exactly the set of results that depended on it, so UBO
+queries stay cheap enough to run inline on submit even on large graphs.
+
+Circular holdings are cut where the walk first meets them: the stake that
+flows round the cycle is ignored and no entity on it is memoised.
+"""
+import threading
+from dataclasses import dataclass
+
+UBO_THRESHOLD = 0.25
+CONTROL_THRESHOLD = 0.5
+# Paths whose effective stake falls below this are dropped from look-through
+# results, bounding their size on wide, deep structures.
+LOOK_THROUGH_FLOOR = 1e-6
+
+UPSERT_EDGE_SQL = """
+INSERT INTO ownership_edges (owner, owned, share, voting_rights, board_seat) VALUES (?, ?, ?, ?, ?)
+ON CONFLICT (owner, owned) DO UPDATE SET
+    share = excluded.share,
+    voting_rights = excluded.voting_rights,
+    board_seat = excluded.board_seat,
+    updated_at = CURRENT_TIMESTAMP
+"""
+
+
+@dataclass(frozen=True)
+class BeneficialOwner:
+    name: str
+    effective_share: float
+    controls: bool
+
+
+def edge_from_relationship(owner, owned, ownership_percentage, voting_rights=False, board_seat=False):
+    """Return the (owner, owned, share, voting_rights, board_seat) edge for a relationship, or None.
+
+    Relationships that carry neither a stake nor voting control (e.g. service
+    providers, employees) are not part of the ownership graph.
+    """
+    owner, owned = (owner or '').strip(), (owned or '').strip()
+    share = (ownership_percentage or 0) / 100
+    if not owner or not owned or owner == owned or not (share > 0 or (voting_rights and board_seat)):
+        return None
+    return owner, owned, share, bool(voting_rights), bool(board_seat)
+
+
+def save_edge(conn, edge):
+    conn.execute(UPSERT_EDGE_SQL, edge)
+
+
+class OwnershipGraph:
+    def __init__(self):
+        self._lock = threading.RLock()
+        # owned -> {owner: (share, controls)} and owner -> {owned}
+        self._owners = {}
+        self._holdings = {}
+        # entity -> {ultimate owner: effective share}
+        self._look_through = {}
+        # entity -> its controlling owner (or None)
+        self._controllers = {}
+
+    def __len__(self):
+        return sum(len(owners) for owners in self._owners.values())
+
+    @classmethod
+    def from_store(cls, store):
+        graph = cls()
+        with store.reader() as conn:
+            graph.load_edges(conn.execute("SELECT owner, owned, share, voting_rights, board_seat FROM ownership_edges"))
+        return graph
+
+    def load_edges(self, edges):
+        """Bulk-add (owner, owned, share, voting_rights, board_seat) edges and reset all memos."""
+        with self._lock:
+            owners, holdings = self._owners, self._holdings
+            for owner, owned, share, voting_rights, board_seat in edges:
+                owners.setdefault(owned, {})[owner] = (share, _controls(share, voting_rights, board_seat))
+                holdings.setdefault(owner, set()).add(owned)
+            self._look_through.clear()
+            self._controllers.clear()
+
+    def set_edge(self, owner, owned, share, voting_rights=False, board_seat=False):
+        with self._lock:
+            self._owners.setdefault(owned, {})[owner] = (share, _controls(share, voting_rights, board_seat))
+            self._holdings.setdefault(owner, set()).add(owned)
+            self._invalidate(owned)
+
+    def remove_edge(self, owner, owned):
+        with self._lock:
+            if self._owners.get(owned, {}).pop(owner, None) is not None:
+                self._holdings[owner].discard(owned)
+                self._invalidate(owned)
+
+    def _invalidate(self, entity):
+        self._controllers.pop(entity, None)
+        self._look_through.pop(entity, None)
+        # Below the changed entity, a holding that is not memoised cannot
+        # have memoised dependants either, so the walk stops there.
+        stack = list(self._holdings.get(entity, ()))
+        while stack:
+            node = stack.pop()
+            if self._look_through.pop(node, None) is not None:
+                stack.extend(self._holdings.get(node, ()))
+
+    def owners(self, entity):
+        """Direct owners of ``entity`` as {owner: share}."""
+        with self._lock:
+            return {owner: share for owner, (share, _) in self._owners.get(entity, {}).items()}
+
+    def look_through(self, entity):
+        """Effective ownership of ``entity`` by each ultimate owner, as {owner: share}."""
+        with self._lock:
+            return dict(self._resolve(entity))
+
+    def _resolve(self, entity):
+        memo, owners_of = self._look_through, self._owners
+        if entity in memo:
+            return memo[entity]
+        if not owners_of.get(entity):
+            return {entity: 1.0}
+        # Iterative post-order walk up the owner links (chains may be deeper
+        # than the recursion limit). Frame: [node, owner iterator, stake in
+        # the node below, partial result, touches a cycle].
+        stack = [[entity, iter(owners_of[entity].items()), 1.0, {}, False]]
+        on_path = {entity}
+        result = None
+        while stack:
+            frame = stack[-1]
+            node, owners, _, partial, _ = frame
+            for owner, (share, _) in owners:
+                if owner in memo:
+                    _accumulate(partial, memo[owner], share)
+                elif not owners_of.get(owner):
+                    partial[owner] = partial.get(owner, 0.0) + share
+                elif owner in on_path:
+                    for f in stack:
+                        f[4] = True
+                else:
+                    stack.append([owner, iter(owners_of[owner].items()), share, {}, False])
+                    on_path.add(owner)
+                    break
+            else:
+                stack.pop()
+                on_path.discard(node)
+                result = partial
+                if not frame[4]:
+                    memo[node] = result
+                if stack:
+                    _accumulate(stack[-1][3], result, frame[2])
+        return result
+
+    def _controller(self, entity):
+        if entity not in self._controllers:
+            controlling = [(share, owner) for owner, (share, controls) in self._owners.get(entity, {}).items()
+                           if controls]
+            self._controllers[entity] = max(controlling)[1] if controlling else None
+        return self._controllers[entity]
+
+    def control_chain(self, entity):
+        """[entity, its controlling owner, that owner's controlling owner, ...]."""
+        with self._lock:
+            chain, seen = [entity], {entity}
+            controller = self._controller(entity)
+            while controller is not None and controller not in seen:
+                chain.append(controller)
+                seen.add(controller)
+                controller = self._controller(controller)
+            return chain
+
+    def beneficial_owners(self, entity, threshold=UBO_THRESHOLD):
+        """Ultimate owners holding at least ``threshold`` of ``entity`` through any chain,
+        plus whoever sits at the top of its control chain; largest stake first."""
+        with self._lock:
+            shares = self._resolve(entity) if self._owners.get(entity) else {}
+            chain = self.control_chain(entity)
+        controller = chain[-1] if len(chain) > 1 else None
+        owners = [BeneficialOwner(name, share, name == controller)
+                  for name, share in shares.items() if share >= threshold or name == controller]
+        if controller is not None and controller not in shares:
+            owners.append(BeneficialOwner(controller, 0.0, True))
+        return sorted(owners, key=lambda o: o.effective_share, reverse=True)
+
+
+def _controls(share, voting_rights, board_seat):
+    return share > CONTROL_THRESHOLD or bool(voting_rights and board_seat)
+
+
+def _accumulate(target, shares, weight):
+    for owner, share in shares.items():
+        effective = share * weight
+        if effective >= LOOK_THROUGH_FLOOR:
+            target[owner] = target.get(owner, 0.0) + effective
+
+
+_graph = None
+_graph_lock = threading.Lock()
+
+
+def get_graph():
+    """Return the process-wide ownership graph, loading it from the store on first use."""
+    global _graph
+    if _graph is None:
+        with _graph_lock:
+            if _graph is None:
+                from fund_admin.store import get_store
+                _graph = OwnershipGraph.from_store(get_store())
+    return _graph
@@ -0,0 +1,200 @@
+"""Opt-in rerun profiler: timing spans, single-rerun cProfile and exports.
+
+Pages wrap their sections in ``with profiling.span('charts'):``. Profiling is
+off unless FUND_ADMIN_PROFILE=1, and while it is off span() hands back one
+shared no-op context manager, so an instrumented section costs a flag check.
+
+When it is on, Home.py brackets every rerun with start_rerun() and
+finish_rerun(). Each finished rerun (its spans, nested, in ms) is kept in a
+process-wide history of the last FUND_ADMIN_PROFILE_HISTORY reruns for the
+sidebar debug panel, logged as one JSON line on this module's logger, and
+added to cumulative per-page, per-span totals that are written in Prometheus
+text format to FUND_ADMIN_PROFILE_METRICS when that is set. A rerun started
+with ``profile=True`` also runs under cProfile; its top functions are kept
+with the rerun.
+"""
+import cProfile
+import io
+import json
+import logging
+import os
+import pstats
+import threading
+import time
+from collections import deque
+from contextlib import nullcontext
+from dataclasses import asdict, dataclass, field
+
+ENABLED = os.environ.get('FUND_ADMIN_PROFILE', '').lower() in ('1', 'true', 'yes')
+HISTORY = int(os.environ.get('FUND_ADMIN_PROFILE_HISTORY', 20))
+METRICS_PATH = os.environ.get('FUND_ADMIN_PROFILE_METRICS')
+# Functions listed from a cProfile capture, by cumulative time
+PROFILE_TOP = 40
+
+logger = logging.getLogger(__name__)
+
+_NOOP = nullcontext()
+
+
+@dataclass
+class Span:
+    # Names of the enclosing spans and this one, joined by '/'
+    path: str
+    depth: int
+    ms: float = 0.0
+
+    @property
+    def name(self):
+        return self.path.rsplit('/', 1)[-1]
+
+
+@dataclass
+class Rerun:
+    started_at: float
+    page: str = None
+    total_ms: float = 0.0
+    spans: list = field(default_factory=list)
+    # pstats listing when the rerun ran under cProfile
+    profile: str = None
+
+
+class _Recorder:
+    """Spans of the rerun running on the current thread."""
+
+    def __init__(self, profile):
+        self.rerun = Rerun(started_at=time.time())
+        self.stack = []
+        self.profiler = None
+        if profile:
+            profiler = cProfile.Profile()
+            try:
+                profiler.enable()
+            except ValueError:  # another profiler is active (Python 3.12+ allows one per process)
+                logger.warning("cProfile capture skipped: another profiler is active")
+            else:
+                self.profiler = profiler
+
+    def stop_profiler(self):
+        if self.profiler is None:
+            return None
+        self.profiler.disable()
+        out = io.StringIO()
+        pstats.Stats(self.profiler, stream=out).sort_stats('cumulative').print_stats(PROFILE_TOP)
+        self.profiler = None
+        return out.getvalue()
+
+
+class _Timer:
+    __slots__ = ('recorder', 'name', 'span', 'started')
+
+    def __init__(self, recorder, name):
+        self.recorder = recorder
+        self.name = name
+
+    def __enter__(self):
+        recorder = self.recorder
+        recorder.stack.append(self.name)
+        self.span = Span('/'.join(recorder.stack), len(recorder.stack) - 1)
+        recorder.rerun.spans.append(self.span)
+        self.started = time.perf_counter()
+        return self.span
+
+    def __exit__(self, *exc_info):
+        self.span.ms = (time.perf_counter() - self.started) * 1000
+        self.recorder.stack.pop()
+        return False
+
+
+_local = threading.local()
+_lock = threading.Lock()
+_history = deque(maxlen=HISTORY)
+# (page, span path) -> [count, seconds]; span path None is the whole rerun
+_totals = {}
+
+
+def span(name):
+    """Time the enclosed block as ``name``, nested under any enclosing span."""
+    if not ENABLED:
+        return _NOOP
+    recorder = getattr(_local, 'recorder', None)
+    return _NOOP if recorder is None else _Timer(recorder, name)
+
+
+def start_rerun(profile=False):
+    """Begin recording the rerun on this thread; ``profile`` also runs it under cProfile."""
+    if not ENABLED:
+        return
+    stale = getattr(_local, 'recorder', None)
+    if stale is not None:  # previous rerun was interrupted (st.rerun(), exception)
+        stale.stop_profiler()
+    _local.recorder = _Recorder(profile)
+
+
+def finish_rerun(page, started):
+    """Close the rerun that began at ``started`` (a perf_counter value) and export it; returns the Rerun."""
+    recorder = getattr(_local, 'recorder', None)
+    if recorder is None:
+        return None
+    _local.recorder = None
+    rerun = recorder.rerun
+    rerun.profile = recorder.stop_profiler()
+    rerun.page = page
+    rerun.total_ms = (time.perf_counter() - started) * 1000
+    with _lock:
+        _history.append(rerun)
+        for path, ms in [(None, rerun.total_ms)] + [(s.path, s.ms) for s in rerun.spans]:
+            totals = _totals.setdefault((page, path), [0, 0.0])
+            totals[0] += 1
+            totals[1] += ms / 1000
+        if METRICS_PATH:
+            _write_metrics(METRICS_PATH)
+    if logger.isEnabledFor(logging.INFO):
+        record = asdict(rerun)
+        record.pop('profile')
+        logger.info(json.dumps(record))
+    return rerun
+
+
+def history():
+    """The last HISTORY finished reruns, newest first."""
+    with _lock:
+        return list(reversed(_history))
+
+
+def _label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def metrics_text():
+    """Cumulative rerun and span timings in Prometheus text exposition format."""
+    with _lock:
+        return _metrics_text()
+
+
+def _metrics_text():
+    lines = [
+        "# HELP fund_admin_rerun_seconds Wall time of Streamlit reruns by page.",
+        "# TYPE fund_admin_rerun_seconds summary",
+    ]
+    reruns = sorted((page, totals) for (page, path), totals in _totals.items() if path is None)
+    for page, (count, seconds) in reruns:
+        lines.append(f'fund_admin_rerun_seconds_sum{{page="{_label(page)}"}} {seconds:.6f}')
+        lines.append(f'fund_admin_rerun_seconds_count{{page="{_label(page)}"}} {count}')
+    lines += [
+        "# HELP fund_admin_span_seconds Wall time of instrumented page sections.",
+        "# TYPE fund_admin_span_seconds summary",
+    ]
+    spans = sorted((key, totals) for key, totals in _totals.items() if key[1] is not None)
+    for (page, path), (count, seconds) in spans:
+        labels = f'page="{_label(page)}",span="{_label(path)}"'
+        lines.append(f'fund_admin_span_seconds_sum{{{labels}}} {seconds:.6f}')
+        lines.append(f'fund_admin_span_seconds_count{{{labels}}} {count}')
+    return '\n'.join(lines) + '\n'
+
+
+def _write_metrics(path):
+    # Written whole and renamed into place, so a scraper never reads a partial file
+    tmp = f'{path}.tmp'
+    with open(tmp, 'w') as f:
+        f.write(_metrics_text())
+    os.replace(tmp, path)
@@ -0,0 +1,268 @@
+"""Typed, columnar in-memory model of the investor register.
+
+The register holds four frames (funds, investors, holdings and KYC
+applications) in compact dtypes instead of the object columns a plain
+SQL read produces:
+
+- enums (status, risk level, investor type, jurisdiction, share class) are
+  categoricals, stored as small integer codes plus one dictionary per
+  column;
+- records reference each other through integer surrogate keys (``fund_id``,
+  ``investor_id``; 0 where the source row has none);
+- amounts are fixed-point int64 cents, dates are datetime64[s];
+- names are Arrow-backed strings.
+
+Frames are read from the store in CHUNK_ROWS slices and converted slice by
+slice, so building never holds the untyped result in memory. A built register
+can be written as uncompressed Arrow IPC files and memory-mapped back with
+load(): numeric columns then point straight into the page cache, which every
+worker process maps once. get_register() shares one register across all
+sessions of a process and refreshes it on its own schedule (a new snapshot,
+or REGISTER_TTL when built from the store) rather than on every submit;
+the static export reads its per-fund investor and KYC breakdowns from it.
+Parquet files with the same columns (e.g. from a warehouse export) are read
+with from_parquet().
+
+Memory budget per million rows (held in MEMORY_BUDGET and checked by
+``python -m fund_admin.register stats``):
+
+    investors   64 MB    holdings   40 MB    kyc   52 MB    funds   56 MB
+
+(about a fifth of the same rows read as plain SQL frames: 1M investors take
+309 MB untyped, 59 MB typed).
+
+    python -m fund_admin.register snapshot data/register
+    python -m fund_admin.register stats [--snapshot data/register]
+"""
+import argparse
+import os
+import threading
+import time
+from dataclasses import dataclass, fields
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from fund_admin.store import get_store
+
+SNAPSHOT_DIR = os.environ.get('FUND_ADMIN_REGISTER_SNAPSHOT')
+# Age at which a register built from the store is rebuilt
+REGISTER_TTL = int(os.environ.get('FUND_ADMIN_REGISTER_TTL', 15 * 60))
+CHUNK_ROWS = 250_000
+
+# Budgeted bytes per million rows, per frame (measured size plus headroom)
+MEMORY_BUDGET = {
+    'funds': 56 * 2 ** 20,
+    'investors': 64 * 2 ** 20,
+    'holdings': 40 * 2 ** 20,
+    'kyc': 52 * 2 ** 20,
+}
+
+# Column kinds: 'key' (int64 surrogate key, 0 for none), 'key32' (int32 key of
+# a small table), 'int32', 'category', 'string', 'cents', 'date', 'float'
+FUNDS_SQL = """
+SELECT id AS fund_id, name, status, aum_musd * 1000000 AS aum, investors, launch_date
+FROM funds ORDER BY id
+"""
+FUNDS_COLUMNS = {
+    'fund_id': 'key32', 'name': 'string', 'status': 'category', 'aum': 'cents', 'investors': 'int32',
+    'launch_date': 'date',
+}
+INVESTORS_SQL = """
+SELECT i.id AS investor_id, f.id AS fund_id, i.first_name, i.last_name, i.investor_type, i.status,
+       i.risk_tolerance, i.investment_amount, i.created_at
+FROM investors i LEFT JOIN funds f ON f.name = i.fund ORDER BY i.id
+"""
+INVESTORS_COLUMNS = {
+    'investor_id': 'key', 'fund_id': 'key32', 'first_name': 'string', 'last_name': 'string',
+    'investor_type': 'category', 'status': 'category', 'risk_tolerance': 'category',
+    'investment_amount': 'cents', 'created_at': 'date',
+}
+HOLDINGS_SQL = """
+SELECT id AS series_id, investor_id, fund_id, class_name, units, opened_on FROM fee_series ORDER BY id
+"""
+HOLDINGS_COLUMNS = {
+    'series_id': 'key', 'investor_id': 'key', 'fund_id': 'key32', 'class_name': 'category', 'units': 'float',
+    'opened_on': 'date',
+}
+KYC_SQL = """
+SELECT id AS application_id, applicant_name, application_date, status, risk_level, documents, jurisdiction,
+       investor_type, screening_status, source, source_id
+FROM kyc_applications ORDER BY id
+"""
+KYC_COLUMNS = {
+    'application_id': 'key', 'applicant_name': 'string', 'application_date': 'date', 'status': 'category',
+    'risk_level': 'category', 'documents': 'category', 'jurisdiction': 'category', 'investor_type': 'category',
+    'screening_status': 'category', 'source': 'category', 'source_id': 'key',
+}
+
+FRAMES = {
+    'funds': (FUNDS_SQL, FUNDS_COLUMNS),
+    'investors': (INVESTORS_SQL, INVESTORS_COLUMNS),
+    'holdings': (HOLDINGS_SQL, HOLDINGS_COLUMNS),
+    'kyc': (KYC_SQL, KYC_COLUMNS),
+}
+
+
+def _convert(values, kind):
+    """One column of raw SQL values (a list) as its register dtype."""
+    if kind in ('key', 'key32', 'int32'):
+        dtype = np.int64 if kind == 'key' else np.int32
+        return pd.Series(values, dtype='float64').fillna(0).astype(dtype)
+    if kind == 'cents':
+        return pd.Series(np.rint(pd.Series(values, dtype='float64').fillna(0).to_numpy() * 100), dtype=np.int64)
+    if kind == 'float':
+        return pd.Series(values, dtype='float64')
+    if kind == 'date':
+        return pd.Series(pd.to_datetime(pd.Series(values, dtype='str'), format='ISO8601', errors='coerce')
+                         .astype('datetime64[s]'))
+    if kind == 'category':
+        return pd.Series(pd.Categorical(values))
+    return pd.Series(values, dtype='string[pyarrow]')
+
+
+def _combine(parts, columns):
+    if not parts:
+        return pd.DataFrame({name: _convert([], kind) for name, kind in columns.items()})
+    combined = {}
+    for name, kind in columns.items():
+        if kind == 'category':
+            # Chunks have their own dictionaries; union them so codes stay compact
+            combined[name] = pd.Series(pd.api.types.union_categoricals([part[name] for part in parts]))
+        else:
+            combined[name] = pd.concat([part[name] for part in parts], ignore_index=True)
+    return pd.DataFrame(combined)
+
+
+def read_frame(store, sql, columns, chunk_rows=CHUNK_ROWS):
+    """Run ``sql`` and return its rows as a typed frame, converting ``chunk_rows`` rows at a time."""
+    parts = []
+    with store.reader() as conn:
+        cursor = conn.execute(sql)
+        while rows := cursor.fetchmany(chunk_rows):
+            raw = list(zip(*rows))
+            parts.append({name: _convert(list(values), kind)
+                          for (name, kind), values in zip(columns.items(), raw)})
+    return _combine(parts, columns)
+
+
+@dataclass(frozen=True)
+class Register:
+    funds: pd.DataFrame
+    investors: pd.DataFrame
+    holdings: pd.DataFrame
+    kyc: pd.DataFrame
+
+    @classmethod
+    def from_store(cls, store=None, chunk_rows=CHUNK_ROWS):
+        store = store or get_store()
+        return cls(**{name: read_frame(store, sql, columns, chunk_rows) for name, (sql, columns) in FRAMES.items()})
+
+    def frames(self):
+        return {f.name: getattr(self, f.name) for f in fields(self)}
+
+    def save(self, directory):
+        """Write every frame as an uncompressed Arrow IPC file (``<frame>.arrow``) for load()."""
+        import pyarrow as pa
+
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        for name, frame in self.frames().items():
+            table = pa.Table.from_pandas(frame, preserve_index=False)
+            # Written whole and renamed into place, so a reader never maps a partial file
+            tmp = directory / f'{name}.arrow.tmp'
+            with pa.OSFile(str(tmp), 'wb') as sink, pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+            os.replace(tmp, directory / f'{name}.arrow')
+
+    @classmethod
+    def load(cls, directory):
+        """Memory-map a register written by save(); numeric columns are not copied."""
+        import pyarrow as pa
+
+        frames = {}
+        for name in FRAMES:
+            with pa.memory_map(str(Path(directory) / f'{name}.arrow')) as source:
+                table = pa.ipc.open_file(source).read_all()
+            frames[name] = table.to_pandas(split_blocks=True, self_destruct=True)
+        return cls(**frames)
+
+    @classmethod
+    def from_parquet(cls, directory):
+        """Read ``<frame>.parquet`` files with the register's columns, keeping categoricals dictionary-encoded."""
+        import pyarrow.parquet as pq
+
+        frames = {}
+        for name, (_, columns) in FRAMES.items():
+            categorical = [column for column, kind in columns.items() if kind == 'category']
+            table = pq.read_table(Path(directory) / f'{name}.parquet', columns=list(columns),
+                                  read_dictionary=categorical, memory_map=True)
+            frame = table.to_pandas(split_blocks=True, self_destruct=True)
+            # Parquet has no second-resolution timestamps
+            dates = [column for column, kind in columns.items() if kind == 'date']
+            frames[name] = frame.astype(dict.fromkeys(dates, 'datetime64[s]'))
+        return cls(**frames)
+
+    def memory_usage(self):
+        """Per frame: (rows, bytes, bytes per million rows, budget per million rows)."""
+        usage = {}
+        for name, frame in self.frames().items():
+            rows, size = len(frame), int(frame.memory_usage(deep=True).sum())
+            usage[name] = (rows, size, size * 1_000_000 // rows if rows else 0, MEMORY_BUDGET[name])
+        return usage
+
+
+def _snapshot_version(directory):
+    return tuple(os.stat(Path(directory) / f'{name}.arrow').st_mtime_ns for name in FRAMES)
+
+
+_register = None  # (snapshot file versions or None, time loaded, Register)
+_register_lock = threading.Lock()
+
+
+def get_register():
+    """Return the process-wide register.
+
+    With FUND_ADMIN_REGISTER_SNAPSHOT set it is mapped from the snapshot and
+    remapped once a newer snapshot replaces the files; otherwise it is built
+    from the store and rebuilt when older than REGISTER_TTL seconds.
+    """
+    global _register
+    version = _snapshot_version(SNAPSHOT_DIR) if SNAPSHOT_DIR else None
+    kept = _register
+    if kept is None or kept[0] != version or (version is None and time.monotonic() - kept[1] > REGISTER_TTL):
+        with _register_lock:
+            if _register is kept:
+                register = Register.load(SNAPSHOT_DIR) if SNAPSHOT_DIR else Register.from_store()
+                _register = (version, time.monotonic(), register)
+    return _register[2]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Typed investor register")
+    commands = parser.add_subparsers(dest='command', required=True)
+    snapshot = commands.add_parser('snapshot', help="write the register as Arrow files")
+    snapshot.add_argument('directory', type=Path)
+    stats = commands.add_parser('stats', help="memory use per frame against the budget")
+    stats.add_argument('--snapshot', type=Path, help="load from Arrow files instead of the store")
+    args = parser.parse_args(argv)
+
+    if args.command == 'snapshot':
+        register = Register.from_store()
+        register.save(args.directory)
+        print(f"Wrote {', '.join(f'{name} ({len(frame):,})' for name, frame in register.frames().items())} "
+              f"to {args.directory}")
+        return
+    register = Register.load(args.snapshot) if args.snapshot else Register.from_store()
+    over = False
+    for name, (rows, size, per_million, budget) in register.memory_usage().items():
+        over |= rows >= 1000 and per_million > budget
+        print(f"{name:<10} {rows:>11,} rows {size / 2 ** 20:>9.1f} MB "
+              f"{per_million / 2 ** 20:>7.1f} MB/M rows (budget {budget / 2 ** 20:.0f})")
+    if over:
+        raise SystemExit("Register is over its memory budget")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,195 @@
+import numpy as np
+import pandas as pd
+
+SAMPLE_SEED = 42
+
+# Periods per year for the frequencies the generator is used with; anything
+# else falls back to calendar days.
+PERIODS_PER_YEAR = {'B': 252, 'D': 365, 'W': 52, 'W-FRI': 52, 'ME': 12, 'MS': 12, 'QE': 4, 'YE': 1}
+
+# Dashboard funds with their annual drift / volatility
+DASHBOARD_FUNDS = {
+    'Alpha Growth': (0.22, 0.12),
+    'Beta Income': (0.16, 0.07),
+    'Gamma Tech': (0.32, 0.20),
+    'Delta Balanced': (0.19, 0.09),
+}
+
+
+def generate_performance(n_funds=None, fund_names=None, start='2023-01-01', periods=12, freq='ME',
+                         drift=None, volatility=None, start_level=100.0, seed=SAMPLE_SEED):
+    """Simulate fund index levels as geometric random walks.
+
+    Returns a long-format frame with one row per (Date, Fund) and the index
+    level in 'Index'. Pass either ``fund_names`` or ``n_funds`` (funds are
+    then named 'Fund 00001', ...). ``drift`` and ``volatility`` are annualised
+    and may be scalars or per-fund arrays; when omitted they are drawn per fund.
+    Everything is generated as (funds x periods) arrays in one pass.
+    """
+    if fund_names is None:
+        if n_funds is None:
+            raise ValueError("Pass n_funds or fund_names")
+        fund_names = [f'Fund {i:05d}' for i in range(1, n_funds + 1)]
+    fund_names = list(fund_names)
+    n = len(fund_names)
+    rng = np.random.default_rng(seed)
+
+    dates = pd.date_range(start=start, periods=periods, freq=freq)
+    dt = 1.0 / PERIODS_PER_YEAR.get(freq, 365)
+    mu = rng.uniform(0.02, 0.15, n) if drift is None else np.broadcast_to(np.asarray(drift, dtype=float), n)
+    sigma = rng.uniform(0.05, 0.30, n) if volatility is None else np.broadcast_to(np.asarray(volatility, dtype=float), n)
+
+    # Log returns: (mu - sigma^2 / 2) dt + sigma sqrt(dt) Z, cumulated along time
+    levels = np.empty((n, periods))
+    levels[:, 0] = 0.0
+    log_returns = rng.standard_normal((n, periods - 1))
+    log_returns *= (sigma * np.sqrt(dt))[:, None]
+    log_returns += ((mu - 0.5 * sigma ** 2) * dt)[:, None]
+    np.cumsum(log_returns, axis=1, out=levels[:, 1:])
+    np.exp(levels, out=levels)
+    levels *= start_level
+
+    codes = np.repeat(np.arange(n, dtype=np.int32), periods)
+    return pd.DataFrame({
+        'Date': np.tile(dates.values, n),
+        'Fund': pd.Categorical.from_codes(codes, categories=fund_names),
+        'Index': levels.ravel(),
+    }, copy=False)
+
+
+def generate_dashboard_performance(seed=SAMPLE_SEED):
+    return generate_performance(
+        fund_names=list(DASHBOARD_FUNDS),
+        start='2023-01-31',
+        periods=12,
+        freq='ME',
+        drift=[mu for mu, _ in DASHBOARD_FUNDS.values()],
+        volatility=[sigma for _, sigma in DASHBOARD_FUNDS.values()],
+        seed=seed,
+    )
+
+
+def generate_nav_inputs(fund_ids, aum_musd, n_securities=400, positions_per_fund=100, start='2023-01-02',
+                        days=260, class_split=(('A', 0.6), ('I', 0.4)), seed=SAMPLE_SEED):
+    """Simulate the NAV engine inputs for funds with the given starting AUM.
+
+    Returns (positions, prices, share_classes, accruals) frames laid out like
+    the store tables. Each fund holds ``positions_per_fund`` securities (fewer
+    after de-duplication) sized so that it is worth ``aum_musd`` million at the
+    first price date; prices follow business-day random walks from there.
+    """
+    rng = np.random.default_rng(seed)
+    fund_ids = np.asarray(fund_ids, dtype=np.int64)
+    aum = np.asarray(aum_musd, dtype=float) * 1e6
+    n = len(fund_ids)
+
+    walks = generate_performance(n_funds=n_securities, periods=days, freq='B', start=start, seed=seed)
+    price_matrix = walks['Index'].to_numpy().reshape(n_securities, days)
+    price_dates = pd.DatetimeIndex(walks['Date'].iloc[:days]).strftime('%Y-%m-%d')
+    prices = pd.DataFrame({
+        'security_id': np.repeat(np.arange(1, n_securities + 1), days),
+        'price_date': np.tile(price_dates.to_numpy(), n_securities),
+        'price': price_matrix.ravel(),
+    })
+
+    # Sample with replacement, then drop repeated (fund, security) pairs
+    fund_idx = np.repeat(np.arange(n), positions_per_fund)
+    security_idx = rng.integers(0, n_securities, n * positions_per_fund)
+    pairs = np.unique(fund_idx * n_securities + security_idx)
+    fund_idx, security_idx = pairs // n_securities, pairs % n_securities
+    weights = rng.uniform(0.2, 1.0, len(pairs))
+    weights /= np.bincount(fund_idx, weights=weights, minlength=n)[fund_idx]
+    positions = pd.DataFrame({
+        'fund_id': fund_ids[fund_idx],
+        'security_id': security_idx + 1,
+        'quantity': weights * aum[fund_idx] / price_matrix[security_idx, 0],
+    })
+
+    names, fractions = zip(*class_split)
+    share_classes = pd.DataFrame({
+        'fund_id': np.repeat(fund_ids, len(names)),
+        'class_name': np.tile(names, n),
+        'units': (aum[:, None] * np.asarray(fractions) / 100.0).ravel(),
+    })
+
+    accruals = pd.DataFrame({
+        'fund_id': np.repeat(fund_ids, 2),
+        'accrual_date': price_dates[0],
+        'description': np.tile(['Accrued income', 'Accrued expenses'], n),
+        'amount': (aum[:, None] * np.array([0.0004, -0.0009])).ravel(),
+    })
+    return positions, prices, share_classes, accruals
+
+
+# Sample data generation
+def generate_sample_data(seed=SAMPLE_SEED):
+    # Fund data
+    funds_data = {
+        'Fund Name': ['Alpha Growth Fund', 'Beta Income Fund', 'Gamma Tech Fund', 'Delta Balanced Fund'],
+        'AUM (Million $)': [1250, 890, 2100, 750],
+        'Investors': [45, 32, 78, 28],
+        'Status': ['Active', 'Active', 'Active', 'Pending'],
+        'Launch Date': ['2020-01-15', '2019-06-20', '2021-03-10', '2023-11-01'],
+        'Management Fee (%)': [1.5, 1.0, 2.0, 1.25],
+        'Performance Fee (%)': [20.0, 10.0, 20.0, 15.0],
+        'Hurdle Rate (%)': [0.0, 5.0, 8.0, 4.0],
+    }
+
+    # Performance data (long format: Date, Fund, Index)
+    performance_df = generate_dashboard_performance(seed)
+
+    # Investor data
+    investors_data = {
+        'Investor Name': ['John Smith', 'Sarah Johnson', 'Michael Brown', 'Emily Davis', 'David Wilson'],
+        'Investment Amount ($)': [500000, 750000, 300000, 1200000, 450000],
+        'Fund': ['Alpha Growth Fund', 'Beta Income Fund', 'Gamma Tech Fund', 'Alpha Growth Fund', 'Delta Balanced Fund'],
+        'Status': ['Active', 'Active', 'Pending', 'Active', 'Active']
+    }
+
+    return pd.DataFrame(funds_data), performance_df, pd.DataFrame(investors_data)
+
+
+def generate_activities():
+    """The five events of the original Recent Activities list, oldest first."""
+    return [
+        {'ts': '2023-12-11T09:00:00', 'message': "AML check initiated for new client", 'status': 'In Progress'},
+        {'ts': '2023-12-12T09:00:00', 'message': "Quarterly report generated for Beta Income Fund",
+         'status': 'Completed', 'fund': 'Beta Income Fund'},
+        {'ts': '2023-12-13T09:00:00', 'message': "Delta Balanced Fund approval pending", 'status': 'Pending',
+         'fund': 'Delta Balanced Fund'},
+        {'ts': '2023-12-14T09:00:00', 'message': "KYC verification completed for Sarah Johnson", 'status': 'Completed'},
+        {'ts': '2023-12-15T09:00:00', 'message': "New investor onboarded to Alpha Growth Fund", 'status': 'Completed',
+         'fund': 'Alpha Growth Fund'},
+    ]
+
+
+def generate_kyc_applications(n=156, seed=SAMPLE_SEED):
+    # The five applications shown on the original AML/KYC page ...
+    named = pd.DataFrame({
+        'applicant_name': ['John Smith', 'Sarah Johnson', 'Michael Brown', 'Emily Davis', 'David Wilson'],
+        'application_date': ['2023-12-10', '2023-12-11', '2023-12-12', '2023-12-13', '2023-12-14'],
+        'status': ['Approved', 'Pending', 'Approved', 'Rejected', 'Pending'],
+        'risk_level': ['Low', 'Medium', 'Low', 'High', 'Medium'],
+        'documents': ['Complete', 'Pending', 'Complete', 'Incomplete', 'Pending'],
+        'jurisdiction': ['United States', 'United Kingdom', 'United States', 'Canada', 'Germany'],
+        'investor_type': ['Individual', 'Individual', 'Family Office', 'Individual', 'Institutional'],
+    })
+
+    # ... plus a seeded history spread over the year
+    rng = np.random.default_rng(seed)
+    k = max(n - len(named), 0)
+    first = np.array(['James', 'Olivia', 'Liam', 'Emma', 'Noah', 'Ava', 'Lucas', 'Mia', 'Ethan', 'Sophia'])
+    last = np.array(['Taylor', 'Anderson', 'Thomas', 'Moore', 'Martin', 'Lee', 'Clark', 'Lewis', 'Walker', 'Hall'])
+    status = rng.choice(['Approved', 'Pending', 'Rejected'], size=k, p=[0.91, 0.05, 0.04])
+    documents = np.where(status == 'Approved', 'Complete', np.where(status == 'Pending', 'Pending', 'Incomplete'))
+    days = rng.integers(0, 365, size=k)
+    generated = pd.DataFrame({
+        'applicant_name': pd.Series(rng.choice(first, k)) + ' ' + pd.Series(rng.choice(last, k)),
+        'application_date': (pd.Timestamp('2023-01-01') + pd.to_timedelta(np.sort(days), unit='D')).strftime('%Y-%m-%d'),
+        'status': status,
+        'risk_level': rng.choice(['Low', 'Medium', 'High'], size=k, p=[0.55, 0.29, 0.16]),
+        'documents': documents,
+        'jurisdiction': rng.choice(['United States', 'Canada', 'United Kingdom', 'Germany', 'France', 'Australia'], size=k),
+        'investor_type': rng.choice(['Individual', 'Institutional', 'Family Office', 'Pension Fund', 'Endowment'], size=k),
+    })
+    return pd.concat([generated, named], ignore_index=True)
@@ -0,0 +1,320 @@
+"""Sanctions / PEP name screening against a locally loaded watchlist.
+
+Names are transliterated to ASCII, lower-cased and token-sorted (so "Smith,
+John" and "JOHN SMITH" share a key), then split into character trigrams. A
+prebuilt inverted index maps each trigram to the watchlist entries that
+contain it; a query only scores the few entries that share most of its
+trigrams, using edit distance on the normalised keys. The index is pickled
+next to the watchlist and rebuilt when the watchlist file is newer.
+
+The watchlist is a CSV with a ``name`` column and optional ``list_type``
+(e.g. Sanctions, PEP), ``program`` and ``country`` columns:
+
+    python -m fund_admin.screening build data/watchlist.csv
+    python -m fund_admin.screening screen "Jon Smyth"
+"""
+import argparse
+import csv
+import os
+import pickle
+import re
+import threading
+import time
+import unicodedata
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+from fund_admin.store import DB_PATH
+
+WATCHLIST_PATH = Path(os.environ.get('FUND_ADMIN_WATCHLIST', DB_PATH.parent / 'watchlist.csv'))
+MATCH_THRESHOLD = float(os.environ.get('FUND_ADMIN_SCREENING_THRESHOLD', 0.85))
+CANDIDATE_LIMIT = 25
+# Trigrams shared by more entries than this carry little signal and are
+# skipped during candidate generation (blocking), unless nothing else is left.
+MAX_POSTING_LENGTH = 100_000
+BATCH_CHUNK_SIZE = 2_000
+
+# Letters NFKD does not decompose into ASCII, plus basic Cyrillic and Greek
+_TRANSLITERATION = str.maketrans({
+    'ß': 'ss', 'æ': 'ae', 'œ': 'oe', 'ø': 'o', 'đ': 'd', 'ð': 'd', 'þ': 'th', 'ł': 'l', 'ı': 'i',
+    'а': 'a', 'б': 'b', 'в': 'v', 'г': 'g', 'д': 'd', 'е': 'e', 'ё': 'e', 'ж': 'zh', 'з': 'z',
+    'и': 'i', 'й': 'y', 'к': 'k', 'л': 'l', 'м': 'm', 'н': 'n', 'о': 'o', 'п': 'p', 'р': 'r',
+    'с': 's', 'т': 't', 'у': 'u', 'ф': 'f', 'х': 'kh', 'ц': 'ts', 'ч': 'ch', 'ш': 'sh', 'щ': 'shch',
+    'ъ': '', 'ы': 'y', 'ь': '', 'э': 'e', 'ю': 'yu', 'я': 'ya',
+    'α': 'a', 'β': 'v', 'γ': 'g', 'δ': 'd', 'ε': 'e', 'ζ': 'z', 'η': 'i', 'θ': 'th', 'ι': 'i',
+    'κ': 'k', 'λ': 'l', 'μ': 'm', 'ν': 'n', 'ξ': 'x', 'ο': 'o', 'π': 'p', 'ρ': 'r', 'σ': 's',
+    'ς': 's', 'τ': 't', 'υ': 'y', 'φ': 'f', 'χ': 'ch', 'ψ': 'ps', 'ω': 'o',
+})
+_NON_ALNUM = re.compile(r'[^a-z0-9]+')
+
+
+def normalize(name):
+    """Return the matching key for ``name``: ASCII, lower case, tokens sorted."""
+    text = unicodedata.normalize('NFKD', str(name).lower().translate(_TRANSLITERATION))
+    text = text.encode('ascii', 'ignore').decode('ascii')
+    return ' '.join(sorted(_NON_ALNUM.sub(' ', text).split()))
+
+
+def trigrams(key):
+    padded = f' {key} '
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def similarity(a, b):
+    """1 - normalised Levenshtein distance between two keys."""
+    if a == b:
+        return 1.0
+    if len(a) < len(b):
+        a, b = b, a
+    if not b:
+        return 0.0
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb)))
+        previous = current
+    return 1.0 - previous[-1] / len(a)
+
+
+@dataclass(frozen=True)
+class Match:
+    name: str
+    list_type: str
+    program: str
+    country: str
+    score: float
+
+
+class WatchlistIndex:
+    def __init__(self, names, keys, list_types, programs, countries, vocabulary, postings, offsets, gram_counts):
+        self.names = names
+        self.keys = keys
+        self.list_types = list_types
+        self.programs = programs
+        self.countries = countries
+        self.vocabulary = vocabulary
+        self.postings = postings
+        self.offsets = offsets
+        self.gram_counts = gram_counts
+
+    def __len__(self):
+        return len(self.names)
+
+    @classmethod
+    def build(cls, entries):
+        """Build the index from an iterable of dicts with a 'name' key."""
+        names, keys, list_types, programs, countries = [], [], [], [], []
+        vocabulary = {}
+        entry_ids, gram_ids = array('i'), array('i')
+        gram_counts = array('i')
+        for entry_id, entry in enumerate(entries):
+            key = normalize(entry['name'])
+            names.append(entry['name'])
+            keys.append(key)
+            list_types.append(entry.get('list_type') or '')
+            programs.append(entry.get('program') or '')
+            countries.append(entry.get('country') or '')
+            grams = trigrams(key)
+            gram_counts.append(len(grams))
+            for gram in grams:
+                entry_ids.append(entry_id)
+                gram_ids.append(vocabulary.setdefault(gram, len(vocabulary)))
+
+        entry_ids = np.frombuffer(entry_ids, dtype=np.int32)
+        gram_ids = np.frombuffer(gram_ids, dtype=np.int32)
+        order = np.argsort(gram_ids, kind='stable')
+        offsets = np.zeros(len(vocabulary) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(gram_ids, minlength=len(vocabulary)), out=offsets[1:])
+        return cls(names, keys, list_types, programs, countries, vocabulary,
+                   entry_ids[order], offsets, np.frombuffer(gram_counts, dtype=np.int32))
+
+    def candidates(self, key, limit=CANDIDATE_LIMIT):
+        """Entry ids sharing the most trigrams with ``key`` (Dice coefficient order)."""
+        grams = [self.vocabulary[g] for g in trigrams(key) if g in self.vocabulary]
+        if not grams:
+            return np.empty(0, dtype=np.int32)
+        lengths = self.offsets[np.array(grams) + 1] - self.offsets[grams]
+        selective = [g for g, n in zip(grams, lengths) if n <= MAX_POSTING_LENGTH]
+        if not selective:
+            selective = [grams[int(np.argmin(lengths))]]
+        hits = np.concatenate([self.postings[self.offsets[g]:self.offsets[g + 1]] for g in selective])
+        # bincount over all entries is O(entries + hits), far cheaper than sorting the hits
+        shared = np.bincount(hits, minlength=len(self.names))
+        ids = np.flatnonzero(shared)
+        dice = 2 * shared[ids] / (len(trigrams(key)) + self.gram_counts[ids])
+        if len(ids) > limit:
+            top = np.argpartition(dice, -limit)[-limit:]
+            ids, dice = ids[top], dice[top]
+        return ids[np.argsort(-dice)]
+
+    def screen(self, name, threshold=MATCH_THRESHOLD, limit=CANDIDATE_LIMIT):
+        """Return watchlist matches for ``name`` scoring at least ``threshold``, best first."""
+        key = normalize(name)
+        if not key:
+            return []
+        matches = []
+        for entry_id in self.candidates(key, limit):
+            candidate = self.keys[entry_id]
+            # The length difference alone bounds the edit distance from below
+            if 1 - abs(len(key) - len(candidate)) / max(len(key), len(candidate)) < threshold:
+                continue
+            score = similarity(key, candidate)
+            if score >= threshold:
+                matches.append(Match(self.names[entry_id], self.list_types[entry_id], self.programs[entry_id],
+                                     self.countries[entry_id], round(score, 3)))
+        return sorted(matches, key=lambda m: m.score, reverse=True)
+
+    def save(self, path):
+        with open(path, 'wb') as f:
+            pickle.dump(self.__dict__, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as f:
+            return cls(**pickle.load(f))
+
+
+def index_path(watchlist_path):
+    return Path(watchlist_path).with_suffix('.idx.pkl')
+
+
+def read_watchlist(path):
+    with open(path, newline='', encoding='utf-8') as f:
+        yield from csv.DictReader(f)
+
+
+def load_index(watchlist_path=WATCHLIST_PATH):
+    """Load the prebuilt index for ``watchlist_path``, (re)building it if stale."""
+    watchlist_path = Path(watchlist_path)
+    cached = index_path(watchlist_path)
+    if cached.exists() and cached.stat().st_mtime >= watchlist_path.stat().st_mtime:
+        return WatchlistIndex.load(cached)
+    index = WatchlistIndex.build(read_watchlist(watchlist_path))
+    index.save(cached)
+    return index
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_index():
+    """Process-wide watchlist index, or None when no watchlist file is configured."""
+    global _index
+    if _index is None and WATCHLIST_PATH.exists():
+        with _index_lock:
+            if _index is None:
+                _index = load_index(WATCHLIST_PATH)
+    return _index
+
+
+def screen_name(name):
+    """Screen one applicant; returns (status, best score, matches)."""
+    index = get_index()
+    if index is None:
+        return 'Not Screened', None, []
+    matches = index.screen(name)
+    if matches:
+        return 'Potential Match', matches[0].score, matches
+    return 'Clear', None, []
+
+
+RESCREEN_UPDATE_SQL = """
+UPDATE kyc_applications SET screening_status = ?, screening_score = ?,
+    risk_level = CASE WHEN ? = 'Potential Match' THEN 'High' ELSE risk_level END
+WHERE applicant_name = ?
+"""
+
+# Batch rescreening: each worker process loads the index once
+_worker_index = None
+
+
+def _init_worker(watchlist_path):
+    global _worker_index
+    _worker_index = load_index(watchlist_path)
+
+
+def _screen_chunk(names):
+    return [(name, _worker_index.screen(name)) for name in names]
+
+
+def rescreen(names, workers=None, watchlist_path=WATCHLIST_PATH):
+    """Screen many names across a process pool; yields (name, matches) in input order."""
+    names = list(names)
+    load_index(watchlist_path)  # build the index once up front, not in every worker
+    chunks = [names[i:i + BATCH_CHUNK_SIZE] for i in range(0, len(names), BATCH_CHUNK_SIZE)]
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(watchlist_path,)) as pool:
+        for results in pool.map(_screen_chunk, chunks):
+            yield from results
+
+
+def rescreen_register(store=None, workers=None):
+    """Rescreen every KYC applicant and record the outcome; returns the number of potential matches.
+
+    As on submit, a potential match raises the application's risk level to High.
+    """
+    from fund_admin.store import get_store
+
+    store = store or get_store()
+    with store.reader() as conn:
+        applicants = [row[0] for row in conn.execute("SELECT DISTINCT applicant_name FROM kyc_applications")]
+    updates = []
+    for name, matches in rescreen(applicants, workers):
+        if matches:
+            updates.append(('Potential Match', matches[0].score, 'Potential Match', name))
+        else:
+            updates.append(('Clear', None, 'Clear', name))
+    with store.transaction() as conn:
+        conn.executemany(RESCREEN_UPDATE_SQL, updates)
+    return sum(status == 'Potential Match' for status, *_ in updates)
+
+
+def rescreen_key(store=None):
+    """Idempotency key of a rescreen job: the same watchlist file against the same applications."""
+    from fund_admin.store import get_store
+
+    last_application = (store or get_store()).query_one("SELECT MAX(id) FROM kyc_applications")[0]
+    return f'rescreen_register:{WATCHLIST_PATH.stat().st_mtime_ns}:{last_application}'
+
+
+def rescreen_job(payload, store=None):
+    """fund_admin.jobs handler: rescreen_register() across ``workers`` processes."""
+    from fund_admin import data
+
+    hits = rescreen_register(store, payload.get('workers'))
+    data.invalidate()
+    return {'potential_matches': hits}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sanctions / PEP watchlist screening")
+    commands = parser.add_subparsers(dest='command', required=True)
+    build = commands.add_parser('build', help="build (or rebuild) the index for a watchlist CSV")
+    build.add_argument('watchlist', type=Path, nargs='?', default=WATCHLIST_PATH)
+    screen = commands.add_parser('screen', help="screen one name")
+    screen.add_argument('name')
+    commands.add_parser('rescreen', help="rescreen the whole KYC register")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    if args.command == 'build':
+        index = WatchlistIndex.build(read_watchlist(args.watchlist))
+        index.save(index_path(args.watchlist))
+        print(f"Indexed {len(index):,} entries in {time.perf_counter() - started:.1f}s")
+    elif args.command == 'screen':
+        status, _, matches = screen_name(args.name)
+        print(f"{status} ({(time.perf_counter() - started) * 1000:.1f} ms)")
+        for match in matches:
+            print(f"  {match.score:.3f}  {match.name}  [{match.list_type} {match.program} {match.country}]")
+    else:
+        hits = rescreen_register()
+        print(f"{hits:,} potential matches ({time.perf_counter() - started:.1f}s)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,406 @@
+"""Periodic investor statements.
+
+    python -m fund_admin.statements out/ --period-end 2024-03-31 --workers 8 [--zip]
+
+renders one HTML statement per investor due at the period end: holdings
+valued at the closing NAV per unit, opening and closing value, capital
+activity (subscriptions and redemptions dealt or pending in the period) and
+the period's management and performance fees per series: those crystallised
+in it (fee_series_postings) plus, for a series not yet accrued past the
+period end, those accrued since its last crystallisation. An investor's
+reporting frequency is the one recorded on their Individual/Fund
+Relationship (matched on fund and email, else fund and name), or
+DEFAULT_FREQUENCY; a frequency is due when the period end closes one of its
+calendar periods (quarterly statements at the end of March, June, September
+and December), and each statement covers that period.
+
+Due investors are split into INVESTORS_PER_TASK id ranges rendered by worker
+processes. Each worker reads its range with one query per table and streams
+the statements from a template parsed once per process, either to
+``out/<period end>/statement-<period end>-<investor id>.html`` or, with
+``--zip``, to one zip archive per range. Finished ranges are appended to
+``out/<period end>/checkpoint.jsonl``; running again for the same period end
+skips them, so an interrupted run picks up where it stopped (``--restart``
+discards the checkpoint). A partial last line left by a killed run is cut
+off before the resumed run appends.
+"""
+import argparse
+import html
+import io
+import json
+import os
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+
+from fund_admin.dealing import PERIOD_MONTHS, REDEMPTION
+from fund_admin.export import STYLESHEET, Template, cards, table
+from fund_admin.store import Store, get_store
+
+INVESTORS_PER_TASK = int(os.environ.get('FUND_ADMIN_STATEMENTS_PER_TASK', 2_000))
+DEFAULT_FREQUENCY = 'Quarterly'
+CHECKPOINT_NAME = 'checkpoint.jsonl'
+
+STATEMENT_TEMPLATE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="UTF-8" />
+<title>$title</title>
+<style>$stylesheet</style>
+</head>
+<body>
+<div class="main-header"><h1>$title</h1></div>
+<p class="meta">$subtitle</p>
+<div class="cards">$cards</div>
+$body
+<p class="footer">Generated $generated</p>
+</body>
+</html>
+"""
+
+INVESTORS_SQL = "SELECT id, fund, email, first_name, last_name FROM investors ORDER BY id"
+RELATIONSHIPS_SQL = """
+SELECT fund, email, individual_name, reporting_frequency FROM individual_fund_relationships
+WHERE reporting_frequency IS NOT NULL ORDER BY id
+"""
+NAV_ON_SQL = """
+SELECT n.fund_id, n.class_name, n.nav_per_unit FROM nav n
+JOIN (SELECT fund_id, class_name, MAX(nav_date) AS nav_date FROM nav
+      WHERE nav_date <= ? AND nav_per_unit IS NOT NULL GROUP BY fund_id, class_name) latest
+  ON latest.fund_id = n.fund_id AND latest.class_name = n.class_name AND latest.nav_date = n.nav_date
+"""
+RANGE_INVESTORS_SQL = """
+SELECT id, first_name, last_name, email, investor_type, fund, investment_amount, status
+FROM investors WHERE id BETWEEN ? AND ? ORDER BY id
+"""
+RANGE_HOLDINGS_SQL = """
+SELECT s.investor_id, s.id, f.name, s.fund_id, s.class_name, s.units, s.opened_on, s.accrued_management,
+       s.accrued_performance, s.last_accrual_date
+FROM fee_series s JOIN funds f ON f.id = s.fund_id
+WHERE s.investor_id BETWEEN ? AND ? ORDER BY s.investor_id, s.id
+"""
+# Crystallisations from the earliest period start to the period end
+RANGE_FEE_POSTINGS_SQL = """
+SELECT s.investor_id, p.series_id, p.posting_date, p.management_fee, p.performance_fee
+FROM fee_series s JOIN fee_series_postings p ON p.series_id = s.id
+WHERE s.investor_id BETWEEN ? AND ? AND p.posting_date BETWEEN ? AND ? ORDER BY s.investor_id
+"""
+# Orders from the earliest period start onwards: those after the period end
+# are needed too, to roll current units back to the period end
+RANGE_ORDERS_SQL = """
+SELECT o.investor_id, o.series_id, o.dealing_date, f.name, o.class_name, o.order_type, o.status, o.amount, o.units,
+       o.dealt_amount, o.dealt_units, o.nav_per_unit
+FROM orders o JOIN funds f ON f.id = o.fund_id
+WHERE o.investor_id BETWEEN ? AND ? AND o.dealing_date >= ? ORDER BY o.investor_id, o.dealing_date, o.id
+"""
+
+
+@dataclass
+class StatementRun:
+    directory: Path
+    investors: int = 0
+    statements: int = 0
+    skipped: int = 0  # already written by an earlier, interrupted run
+    bytes: int = 0
+    seconds: float = 0.0
+
+
+def period_start(period_end, frequency):
+    """First day of the ``frequency`` period that ends at ``period_end``."""
+    month = np.datetime64(period_end, 'M') - (PERIOD_MONTHS[frequency] - 1)
+    return date.fromisoformat(str(month.astype('datetime64[D]')))
+
+
+def is_due(period_end, frequency):
+    return frequency in PERIOD_MONTHS and period_end.month % PERIOD_MONTHS[frequency] == 0
+
+
+def schedule(store, period_end):
+    """(investor ids, frequencies) of every investor with a statement due at ``period_end``, by id."""
+    with store.reader() as conn:
+        investors = conn.execute(INVESTORS_SQL).fetchall()
+        relationships = conn.execute(RELATIONSHIPS_SQL).fetchall()
+    by_email, by_name = {}, {}
+    # Later relationships win
+    for fund, email, name, frequency in relationships:
+        if email:
+            by_email[(fund, email.strip().lower())] = frequency
+        if name:
+            by_name[(fund, ' '.join(name.lower().split()))] = frequency
+    ids, frequencies = [], []
+    for investor_id, fund, email, first_name, last_name in investors:
+        frequency = by_email.get((fund, (email or '').strip().lower())) or by_name.get(
+            (fund, ' '.join(f'{first_name or ""} {last_name or ""}'.lower().split()))) or DEFAULT_FREQUENCY
+        if is_due(period_end, frequency):
+            ids.append(investor_id)
+            frequencies.append(frequency)
+    return np.array(ids, dtype=np.int64), frequencies
+
+
+def _group(rows):
+    """{investor_id: [rest of row, ...]} from rows ordered by investor id."""
+    grouped = {}
+    for investor_id, *rest in rows:
+        grouped.setdefault(investor_id, []).append(rest)
+    return grouped
+
+
+# Worker state: one store connection, the parsed template and the run's parameters per process
+_worker = {}
+
+
+def _init_worker(db_path, directory, period_end, prices, generated, as_zip):
+    _worker['store'] = Store(db_path, pool_size=1)
+    _worker['directory'] = Path(directory)
+    _worker['period_end'] = period_end
+    # {date: {(fund_id, class_name): NAV per unit on or before that date}}
+    _worker['prices'] = prices
+    _worker['generated'] = generated
+    _worker['zip'] = as_zip
+    _worker['template'] = Template(STATEMENT_TEMPLATE)
+
+
+def _money(amount):
+    return f'{amount:,.2f}'
+
+
+def _dollars(amount):
+    return f'-${-amount:,.2f}' if amount < 0 else f'${amount:,.2f}'
+
+
+def _section(headers, rows, empty):
+    return table(headers, rows) if rows else [f'<p class="meta">{empty}</p>']
+
+
+def _statement(f, investor, frequency, holdings, orders, fee_postings):
+    """Stream one investor's statement to the text file ``f``."""
+    investor_id, first_name, last_name, email, investor_type, fund, investment_amount, status = investor
+    period_end = _worker['period_end']
+    start = period_start(period_end, frequency)
+    opening_prices = _worker['prices'][start - timedelta(days=1)]
+    closing_prices = _worker['prices'][period_end]
+    start, end = start.isoformat(), period_end.isoformat()
+
+    # Roll each series' current units back to the period end and the period start
+    after_end, in_period = {}, {}
+    activity_rows, net_flows = [], 0.0
+    for series_id, dealing_date, fund_name, class_name, order_type, order_status, amount, units, dealt_amount, \
+            dealt_units, nav_per_unit in orders:
+        sign = -1 if order_type == REDEMPTION else 1
+        if order_status == 'Dealt' and series_id is not None:
+            moves = after_end if dealing_date > end else in_period
+            moves[series_id] = moves.get(series_id, 0.0) + sign * dealt_units
+        if start <= dealing_date <= end:
+            if order_status == 'Dealt':
+                net_flows += sign * dealt_amount
+            activity_rows.append((dealing_date, fund_name, f'Class {class_name}', order_type, order_status,
+                                  _money(dealt_amount if order_status == 'Dealt' else amount or 0),
+                                  f'{dealt_units if order_status == "Dealt" else units or 0:,.4f}',
+                                  _money(nav_per_unit) if nav_per_unit else ''))
+
+    # Fees each series paid in the period
+    paid = {}
+    for series_id, posting_date, management, performance in fee_postings:
+        if start <= posting_date:
+            previous = paid.get(series_id, (0.0, 0.0))
+            paid[series_id] = (previous[0] + management, previous[1] + performance)
+
+    holding_rows, fee_rows = [], []
+    opening = closing = 0.0
+    for series_id, fund_name, fund_id, class_name, units, opened_on, accrued_management, accrued_performance, \
+            last_accrual_date in holdings:
+        if opened_on > end:
+            continue
+        units_at_end = units - after_end.get(series_id, 0.0)
+        units_at_start = units_at_end - in_period.get(series_id, 0.0)
+        closing_price = closing_prices.get((fund_id, class_name))
+        value = units_at_end * (closing_price or 0.0)
+        closing += value
+        if opened_on >= start and series_id not in in_period:
+            # Opened in the period without a dealt order (a transferred or seeded holding): it comes in at its
+            # closing value rather than counting as investment result
+            units_at_start = 0.0
+            net_flows += value
+            activity_rows.append((opened_on, fund_name, f'Class {class_name}', 'Holding opened', '', _money(value),
+                                  f'{units_at_end:,.4f}', ''))
+        opening += units_at_start * (opening_prices.get((fund_id, class_name)) or 0.0)
+        holding_rows.append((fund_name, f'Class {class_name}', opened_on, f'{units_at_end:,.4f}',
+                             _money(closing_price) if closing_price else 'n/a', _money(value)))
+        management, performance = paid.get(series_id, (0.0, 0.0))
+        # The live accruals are the period's only while the series has not accrued past its end
+        if last_accrual_date <= end:
+            management += accrued_management
+            performance += accrued_performance
+        if management or performance:
+            fee_rows.append((fund_name, f'Class {class_name}', _money(management), _money(performance)))
+
+    body = ['<h2>📊 Holdings</h2>',
+            *_section(['Fund', 'Class', 'Opened', 'Units', 'NAV per Unit', 'Value ($)'], holding_rows,
+                      "No holdings at the period end."),
+            '<h2>🔄 Capital Activity</h2>',
+            *_section(['Dealing Date', 'Fund', 'Class', 'Type', 'Status', 'Amount ($)', 'Units', 'NAV per Unit'],
+                      activity_rows, "No subscriptions or redemptions in the period."),
+            '<h2>💸 Fees</h2>',
+            *_section(['Fund', 'Class', 'Management ($)', 'Performance ($)'], fee_rows,
+                      "No fees charged or accrued in the period.")]
+    name = ' '.join(part for part in (first_name, last_name) if part) or f'Investor {investor_id}'
+    subtitle = ' · '.join(html.escape(str(part)) for part in (
+        f'{frequency} statement for {start} to {end}', fund, investor_type, email) if part)
+    _worker['template'].stream(
+        f, title=html.escape(name), subtitle=subtitle, stylesheet=STYLESHEET, generated=_worker['generated'],
+        cards=cards([('📂 Opening Value', _dollars(opening)), ('🔄 Net Subscriptions', _dollars(net_flows)),
+                     ('📈 Investment Result', _dollars(closing - opening - net_flows)),
+                     ('💰 Closing Value', _dollars(closing))]),
+        body=body,
+    )
+
+
+def statement_name(period_end, investor_id):
+    return f'statement-{period_end.isoformat()}-{investor_id}.html'
+
+
+def _render_range(lo, hi, ids, frequencies):
+    """Render the statements of investors ``ids`` (all in ``lo``..``hi``); returns (statements, bytes)."""
+    period_end = _worker['period_end']
+    earliest = min(period_start(period_end, frequency) for frequency in set(frequencies)).isoformat()
+    with _worker['store'].reader() as conn:
+        investors = conn.execute(RANGE_INVESTORS_SQL, (lo, hi)).fetchall()
+        holdings = _group(conn.execute(RANGE_HOLDINGS_SQL, (lo, hi)))
+        orders = _group(conn.execute(RANGE_ORDERS_SQL, (lo, hi, earliest)))
+        fee_postings = _group(conn.execute(RANGE_FEE_POSTINGS_SQL, (lo, hi, earliest, period_end.isoformat())))
+    due = dict(zip(ids, frequencies))
+    investors = [investor for investor in investors if investor[0] in due]
+    directory = _worker['directory']
+    if _worker['zip']:
+        # Written whole and renamed into place, so a finished range is never half an archive
+        path = directory / f'statements-{period_end.isoformat()}-{lo}-{hi}.zip'
+        tmp = path.with_suffix('.zip.tmp')
+        with zipfile.ZipFile(tmp, 'w', zipfile.ZIP_DEFLATED) as archive:
+            for investor in investors:
+                with archive.open(statement_name(period_end, investor[0]), 'w') as member, \
+                        io.TextIOWrapper(member, encoding='utf-8') as f:
+                    _statement(f, investor, due[investor[0]], holdings.get(investor[0], ()),
+                               orders.get(investor[0], ()), fee_postings.get(investor[0], ()))
+        os.replace(tmp, path)
+        return len(investors), path.stat().st_size
+    written = 0
+    for investor in investors:
+        path = directory / statement_name(period_end, investor[0])
+        with open(path, 'w', encoding='utf-8') as f:
+            _statement(f, investor, due[investor[0]], holdings.get(investor[0], ()), orders.get(investor[0], ()),
+                       fee_postings.get(investor[0], ()))
+        written += path.stat().st_size
+    return len(investors), written
+
+
+def _read_checkpoint(path):
+    """[(lo, hi)] of the id ranges an earlier run finished, and their (statements, bytes) totals.
+
+    A run killed mid-append leaves a partial last line: it is cut off here, so
+    the next append starts on a line of its own, and that range is simply
+    rendered again.
+    """
+    ranges, statements, written = [], 0, 0
+    if path.exists():
+        with open(path, 'rb+') as f:
+            complete = 0
+            for line in f:
+                if not line.endswith(b'\n'):
+                    break
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    break
+                complete += len(line)
+                ranges.append((entry['lo'], entry['hi']))
+                statements += entry['statements']
+                written += entry['bytes']
+            f.truncate(complete)
+    return ranges, statements, written
+
+
+def run_statements(directory, period_end, store=None, workers=None, investors_per_task=INVESTORS_PER_TASK,
+                   as_zip=False, restart=False):
+    """Render every statement due at ``period_end`` under ``directory/<period end>``; returns a StatementRun."""
+    from fund_admin import activity
+
+    started = time.perf_counter()
+    store = store or get_store()
+    directory = Path(directory) / period_end.isoformat()
+    directory.mkdir(parents=True, exist_ok=True)
+    checkpoint = directory / CHECKPOINT_NAME
+    if restart:
+        checkpoint.unlink(missing_ok=True)
+    done, done_statements, done_bytes = _read_checkpoint(checkpoint)
+
+    ids, frequencies = schedule(store, period_end)
+    run = StatementRun(directory, investors=len(ids), skipped=done_statements, bytes=done_bytes)
+    pending = np.ones(len(ids), dtype=bool)
+    for lo, hi in done:
+        pending &= (ids < lo) | (ids > hi)
+    ids, frequencies = ids[pending], [frequency for frequency, keep in zip(frequencies, pending) if keep]
+    bounds = range(0, len(ids), investors_per_task)
+    tasks = [(int(ids[i]), int(ids[min(i + investors_per_task, len(ids)) - 1]), ids[i:i + investors_per_task].tolist(),
+              frequencies[i:i + investors_per_task]) for i in bounds]
+
+    with store.reader() as conn:
+        dates = {period_end} | {period_start(period_end, frequency) - timedelta(days=1)
+                                for frequency in set(frequencies)}
+        prices = {day: {(fund_id, class_name): nav_per_unit
+                        for fund_id, class_name, nav_per_unit in conn.execute(NAV_ON_SQL, (day.isoformat(),))}
+                  for day in dates}
+    initargs = (store.path, directory, period_end, prices, datetime.now().strftime('%Y-%m-%d %H:%M'), as_zip)
+
+    with open(checkpoint, 'a', encoding='utf-8') as log:
+        def finished(task, result):
+            log.write(json.dumps({'lo': task[0], 'hi': task[1], 'statements': result[0], 'bytes': result[1]}) + '\n')
+            log.flush()
+            os.fsync(log.fileno())
+            run.statements += result[0]
+            run.bytes += result[1]
+
+        if len(tasks) <= 1 or workers == 1:
+            _init_worker(*initargs)
+            for task in tasks:
+                finished(task, _render_range(*task))
+        else:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=initargs) as pool:
+                futures = {pool.submit(_render_range, *task): task for task in tasks}
+                for future in as_completed(futures):
+                    finished(futures[future], future.result())
+    run.seconds = time.perf_counter() - started
+    activity.record(f"Statement run for {period_end.isoformat()}: {run.statements + run.skipped:,} statements")
+    return run
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render investor statements due at a period end")
+    parser.add_argument('directory', type=Path)
+    parser.add_argument('--period-end', type=date.fromisoformat, help="YYYY-MM-DD (default: the latest NAV date)")
+    parser.add_argument('--workers', type=int, help="worker processes (default: one per CPU)")
+    parser.add_argument('--investors-per-task', type=int, default=INVESTORS_PER_TASK)
+    parser.add_argument('--zip', action='store_true', help="write one zip archive per task instead of HTML files")
+    parser.add_argument('--restart', action='store_true', help="ignore the checkpoint of an earlier run")
+    args = parser.parse_args(argv)
+
+    store = get_store()
+    period_end = args.period_end
+    if period_end is None:
+        latest = store.query_one("SELECT MAX(nav_date) FROM nav")[0]
+        if latest is None:
+            raise SystemExit("No NAV published yet; pass --period-end")
+        period_end = date.fromisoformat(latest)
+    run = run_statements(args.directory, period_end, store, workers=args.workers,
+                         investors_per_task=args.investors_per_task, as_zip=args.zip, restart=args.restart)
+    resumed = f" ({run.skipped:,} from an earlier run)" if run.skipped else ""
+    print(f"Wrote {run.statements + run.skipped:,} statements{resumed} for {run.investors:,} due investors "
+          f"({run.bytes / 2 ** 20:,.1f} MB) to {run.directory} in {run.seconds:.1f}s")
+
+
+if __name__ == '__main__':
+    main()
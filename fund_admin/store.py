@@ -0,0 +1,562 @@
+"""Embedded SQLite store for onboarding records and KYC applications.
+
+One Store per process holds a small pool of connections opened in WAL mode,
+so readers never block on the writer. Writes go through a single writer
+connection behind a lock and are grouped into explicit transactions;
+insert_many() pushes a whole batch through one executemany() call.
+"""
+import os
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+
+# pandas is imported inside the methods that need it, so pages that only
+# submit single records never load it.
+
+DEFAULT_DB_PATH = Path(__file__).resolve().parent.parent / 'data' / 'fund_admin.db'
+DB_PATH = Path(os.environ.get('FUND_ADMIN_DB', DEFAULT_DB_PATH))
+POOL_SIZE = int(os.environ.get('FUND_ADMIN_DB_POOL_SIZE', 8))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS funds (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    fund_type TEXT,
+    investment_strategy TEXT,
+    target_aum_musd REAL,
+    legal_entity TEXT,
+    jurisdiction TEXT,
+    launch_date TEXT,
+    management_fee REAL,
+    performance_fee REAL NOT NULL DEFAULT 0,
+    hurdle_rate REAL NOT NULL DEFAULT 0,
+    redemption_gate REAL NOT NULL DEFAULT 25,
+    risk_level TEXT,
+    min_investment REAL,
+    lock_period_months INTEGER,
+    redemption_frequency TEXT,
+    subscription_frequency TEXT,
+    aum_musd REAL NOT NULL DEFAULT 0,
+    investors INTEGER NOT NULL DEFAULT 0,
+    status TEXT NOT NULL DEFAULT 'Pending',
+    created_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+CREATE INDEX IF NOT EXISTS idx_funds_status ON funds(status);
+
+CREATE TABLE IF NOT EXISTS share_classes (
+    id INTEGER PRIMARY KEY,
+    fund_id INTEGER NOT NULL REFERENCES funds(id),
+    class_name TEXT NOT NULL,
+    units REAL NOT NULL DEFAULT 0,
+    launch_price REAL NOT NULL DEFAULT 100,
+    UNIQUE (fund_id, class_name)
+);
+
+-- NAV inputs: current holdings, security prices and unsettled accruals
+CREATE TABLE IF NOT EXISTS positions (
+    fund_id INTEGER NOT NULL,
+    security_id INTEGER NOT NULL,
+    quantity REAL NOT NULL,
+    PRIMARY KEY (fund_id, security_id)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS prices (
+    security_id INTEGER NOT NULL,
+    price_date TEXT NOT NULL,
+    price REAL NOT NULL,
+    PRIMARY KEY (security_id, price_date)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_prices_date ON prices(price_date);
+
+CREATE TABLE IF NOT EXISTS accruals (
+    id INTEGER PRIMARY KEY,
+    fund_id INTEGER NOT NULL,
+    accrual_date TEXT NOT NULL,
+    description TEXT,
+    amount REAL NOT NULL,
+    settled INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_accruals_fund ON accruals(fund_id, accrual_date);
+
+-- Daily NAV per fund and share class, written by fund_admin.nav
+CREATE TABLE IF NOT EXISTS nav (
+    fund_id INTEGER NOT NULL,
+    class_name TEXT NOT NULL,
+    nav_date TEXT NOT NULL,
+    gross_assets REAL NOT NULL,
+    accruals REAL NOT NULL,
+    nav REAL NOT NULL,
+    units REAL NOT NULL,
+    nav_per_unit REAL,
+    PRIMARY KEY (fund_id, class_name, nav_date)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_nav_date ON nav(nav_date);
+
+-- Fee state per investor series (one series per subscription); see fund_admin.fees
+CREATE TABLE IF NOT EXISTS fee_series (
+    id INTEGER PRIMARY KEY,
+    fund_id INTEGER NOT NULL,
+    class_name TEXT NOT NULL,
+    investor_id INTEGER,
+    opened_on TEXT NOT NULL,
+    units REAL NOT NULL,
+    high_water_mark REAL NOT NULL,
+    period_start TEXT NOT NULL,
+    period_start_nav REAL NOT NULL,
+    accrued_management REAL NOT NULL DEFAULT 0,
+    accrued_performance REAL NOT NULL DEFAULT 0,
+    last_accrual_date TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_fee_series_fund ON fee_series(fund_id, class_name);
+CREATE INDEX IF NOT EXISTS idx_fee_series_investor ON fee_series(investor_id);
+
+-- Daily fund totals: management fee accrued that day, performance fee accrued to date
+CREATE TABLE IF NOT EXISTS fee_accruals (
+    fund_id INTEGER NOT NULL,
+    accrual_date TEXT NOT NULL,
+    management_fee REAL NOT NULL,
+    performance_fee REAL NOT NULL,
+    PRIMARY KEY (fund_id, accrual_date)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS fee_postings (
+    id INTEGER PRIMARY KEY,
+    fund_id INTEGER NOT NULL,
+    posting_date TEXT NOT NULL,
+    fee_type TEXT NOT NULL,
+    amount REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_fee_postings_fund ON fee_postings(fund_id, posting_date);
+
+-- What each series paid at each crystallisation, for investor statements
+CREATE TABLE IF NOT EXISTS fee_series_postings (
+    series_id INTEGER NOT NULL,
+    posting_date TEXT NOT NULL,
+    management_fee REAL NOT NULL,
+    performance_fee REAL NOT NULL,
+    PRIMARY KEY (series_id, posting_date)
+) WITHOUT ROWID;
+
+-- Subscription and redemption orders, dealt by fund_admin.dealing
+CREATE TABLE IF NOT EXISTS orders (
+    id INTEGER PRIMARY KEY,
+    fund_id INTEGER NOT NULL,
+    class_name TEXT NOT NULL,
+    investor_id INTEGER,
+    series_id INTEGER,
+    order_type TEXT NOT NULL,
+    amount REAL,
+    units REAL,
+    trade_date TEXT NOT NULL,
+    dealing_date TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'Pending',
+    note TEXT,
+    dealt_units REAL NOT NULL DEFAULT 0,
+    dealt_amount REAL NOT NULL DEFAULT 0,
+    nav_per_unit REAL,
+    created_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+CREATE INDEX IF NOT EXISTS idx_orders_pending ON orders(status, fund_id, dealing_date);
+CREATE INDEX IF NOT EXISTS idx_orders_investor ON orders(investor_id);
+
+-- Background jobs, run by fund_admin.jobs workers
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY,
+    kind TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    idempotency_key TEXT UNIQUE,
+    status TEXT NOT NULL DEFAULT 'Queued',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL,
+    run_after REAL NOT NULL,
+    result TEXT,
+    last_error TEXT,
+    started_at REAL,
+    finished_at REAL,
+    created_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    updated_at REAL
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_due ON jobs(status, run_after, id);
+
+CREATE TABLE IF NOT EXISTS clients (
+    id INTEGER PRIMARY KEY,
+    first_name TEXT,
+    last_name TEXT,
+    email TEXT,
+    phone TEXT,
+    date_of_birth TEXT,
+    address_line1 TEXT,
+    address_line2 TEXT,
+    city TEXT,
+    state TEXT,
+    postal_code TEXT,
+    country TEXT,
+    annual_income TEXT,
+    net_worth TEXT,
+    investment_experience TEXT,
+    risk_tolerance TEXT,
+    investment_goals TEXT,
+    preferred_funds TEXT,
+    created_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+CREATE INDEX IF NOT EXISTS idx_clients_created_at ON clients(created_at);
+
+CREATE TABLE IF NOT EXISTS persons (
+    id INTEGER PRIMARY KEY,
+    first_name TEXT,
+    last_name TEXT,
+    email TEXT,
+    phone TEXT,
+    date_of_birth TEXT,
+    nationality TEXT,
+    job_title TEXT,
+    company TEXT,
+    industry TEXT,
+    years_experience INTEGER,
+    address_line1 TEXT,
+    address_line2 TEXT,
+    city TEXT,
+    state TEXT,
+    postal_code TEXT,
+    country TEXT,
+    education_level TEXT,
+    certifications TEXT,
+    created_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+CREATE INDEX IF NOT EXISTS idx_persons_created_at ON persons(created_at);
+
+CREATE TABLE IF NOT EXISTS investors (
+    id INTEGER PRIMARY KEY,
+    investor_type TEXT,
+    first_name TEXT,
+    last_name TEXT,
+    email TEXT,
+    phone TEXT,
+    fund TEXT NOT NULL,
+    investment_amount REAL NOT NULL,
+    source_of_funds TEXT,
+    annual_income TEXT,
+    net_worth TEXT,
+    investment_experience TEXT,
+    risk_tolerance TEXT,
+    kyc_completed INTEGER NOT NULL DEFAULT 0,
+    aml_check INTEGER NOT NULL DEFAULT 0,
+    suitability_assessment INTEGER NOT NULL DEFAULT 0,
+    status TEXT NOT NULL DEFAULT 'Pending',
+    created_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+CREATE INDEX IF NOT EXISTS idx_investors_fund ON investors(fund);
+CREATE INDEX IF NOT EXISTS idx_investors_status ON investors(status);
+CREATE INDEX IF NOT EXISTS idx_investors_created_at ON investors(created_at);
+
+CREATE TABLE IF NOT EXISTS fund_company_relationships (
+    id INTEGER PRIMARY KEY,
+    fund TEXT NOT NULL,
+    fund_manager TEXT,
+    fund_administrator TEXT,
+    company_name TEXT,
+    company_type TEXT,
+    relationship_type TEXT,
+    start_date TEXT,
+    contract_value REAL,
+    renewal_date TEXT,
+    status TEXT,
+    services TEXT,
+    ownership_percentage REAL,
+    created_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+CREATE INDEX IF NOT EXISTS idx_fund_company_fund ON fund_company_relationships(fund);
+CREATE INDEX IF NOT EXISTS idx_fund_company_status ON fund_company_relationships(status);
+
+CREATE TABLE IF NOT EXISTS individual_fund_relationships (
+    id INTEGER PRIMARY KEY,
+    individual_name TEXT,
+    individual_type TEXT,
+    email TEXT,
+    phone TEXT,
+    fund TEXT NOT NULL,
+    role_in_fund TEXT,
+    start_date TEXT,
+    investment_amount REAL,
+    ownership_percentage REAL,
+    voting_rights INTEGER NOT NULL DEFAULT 0,
+    board_seat INTEGER NOT NULL DEFAULT 0,
+    compensation_type TEXT,
+    reporting_frequency TEXT,
+    created_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+CREATE INDEX IF NOT EXISTS idx_individual_fund_fund ON individual_fund_relationships(fund);
+
+-- Ownership / control links derived from both relationship tables, one row per (owner, owned)
+CREATE TABLE IF NOT EXISTS ownership_edges (
+    owner TEXT NOT NULL,
+    owned TEXT NOT NULL,
+    share REAL NOT NULL,
+    voting_rights INTEGER NOT NULL DEFAULT 0,
+    board_seat INTEGER NOT NULL DEFAULT 0,
+    updated_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (owner, owned)
+);
+CREATE INDEX IF NOT EXISTS idx_ownership_owned ON ownership_edges(owned);
+
+CREATE TABLE IF NOT EXISTS kyc_applications (
+    id INTEGER PRIMARY KEY,
+    applicant_name TEXT NOT NULL,
+    application_date TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'Pending',
+    risk_level TEXT NOT NULL DEFAULT 'Medium',
+    documents TEXT NOT NULL DEFAULT 'Pending',
+    jurisdiction TEXT,
+    investor_type TEXT,
+    source TEXT,
+    source_id INTEGER,
+    screening_status TEXT NOT NULL DEFAULT 'Not Screened',
+    screening_score REAL,
+    -- Activity log sequence number of the event recording the background check's outcome
+    activity_seq INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_kyc_status ON kyc_applications(status);
+CREATE INDEX IF NOT EXISTS idx_kyc_risk_level ON kyc_applications(risk_level);
+CREATE INDEX IF NOT EXISTS idx_kyc_application_date ON kyc_applications(application_date);
+CREATE INDEX IF NOT EXISTS idx_kyc_applicant_name ON kyc_applications(applicant_name);
+CREATE INDEX IF NOT EXISTS idx_kyc_source ON kyc_applications(source, source_id);
+
+-- KYC application counts by month x jurisdiction x investor type x status x
+-- risk level, kept current by the triggers below so the AML/KYC page reads
+-- a few hundred rollup rows instead of grouping every application.
+-- Missing jurisdictions and investor types are stored as ''.
+CREATE TABLE IF NOT EXISTS kyc_rollup (
+    month TEXT NOT NULL,
+    jurisdiction TEXT NOT NULL,
+    investor_type TEXT NOT NULL,
+    status TEXT NOT NULL,
+    risk_level TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (month, jurisdiction, investor_type, status, risk_level)
+) WITHOUT ROWID;
+
+CREATE TRIGGER IF NOT EXISTS kyc_rollup_insert AFTER INSERT ON kyc_applications BEGIN
+    INSERT INTO kyc_rollup VALUES (substr(NEW.application_date, 1, 7), COALESCE(NEW.jurisdiction, ''),
+                                   COALESCE(NEW.investor_type, ''), NEW.status, NEW.risk_level, 1)
+    ON CONFLICT DO UPDATE SET count = count + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS kyc_rollup_delete AFTER DELETE ON kyc_applications BEGIN
+    UPDATE kyc_rollup SET count = count - 1
+    WHERE month = substr(OLD.application_date, 1, 7) AND jurisdiction = COALESCE(OLD.jurisdiction, '')
+      AND investor_type = COALESCE(OLD.investor_type, '') AND status = OLD.status AND risk_level = OLD.risk_level;
+END;
+
+CREATE TRIGGER IF NOT EXISTS kyc_rollup_update
+AFTER UPDATE OF application_date, jurisdiction, investor_type, status, risk_level ON kyc_applications
+WHEN substr(OLD.application_date, 1, 7) IS NOT substr(NEW.application_date, 1, 7)
+  OR OLD.jurisdiction IS NOT NEW.jurisdiction OR OLD.investor_type IS NOT NEW.investor_type
+  OR OLD.status IS NOT NEW.status OR OLD.risk_level IS NOT NEW.risk_level
+BEGIN
+    UPDATE kyc_rollup SET count = count - 1
+    WHERE month = substr(OLD.application_date, 1, 7) AND jurisdiction = COALESCE(OLD.jurisdiction, '')
+      AND investor_type = COALESCE(OLD.investor_type, '') AND status = OLD.status AND risk_level = OLD.risk_level;
+    INSERT INTO kyc_rollup VALUES (substr(NEW.application_date, 1, 7), COALESCE(NEW.jurisdiction, ''),
+                                   COALESCE(NEW.investor_type, ''), NEW.status, NEW.risk_level, 1)
+    ON CONFLICT DO UPDATE SET count = count + 1;
+END;
+"""
+
+# Recomputes kyc_rollup from scratch; run once for databases created before
+# the rollup existed (see Store._migrate()).
+KYC_ROLLUP_REBUILD_SQL = """
+INSERT INTO kyc_rollup
+SELECT substr(application_date, 1, 7), COALESCE(jurisdiction, ''), COALESCE(investor_type, ''), status, risk_level,
+       COUNT(*)
+FROM kyc_applications GROUP BY 1, 2, 3, 4, 5
+"""
+
+# Columns added after a table was first released: (table, column, declaration).
+# Store() adds any that an existing database is missing.
+ADDED_COLUMNS = [
+    ('kyc_applications', 'screening_status', "TEXT NOT NULL DEFAULT 'Not Screened'"),
+    ('kyc_applications', 'screening_score', 'REAL'),
+    ('kyc_applications', 'activity_seq', 'INTEGER'),
+    ('fund_company_relationships', 'ownership_percentage', 'REAL'),
+    ('funds', 'performance_fee', 'REAL NOT NULL DEFAULT 0'),
+    ('funds', 'hurdle_rate', 'REAL NOT NULL DEFAULT 0'),
+    ('funds', 'redemption_gate', 'REAL NOT NULL DEFAULT 25'),
+]
+
+
+def _connect(path):
+    conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=30)
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute('PRAGMA synchronous=NORMAL')
+    conn.execute('PRAGMA busy_timeout=30000')
+    conn.execute('PRAGMA temp_store=MEMORY')
+    return conn
+
+
+class Store:
+    def __init__(self, path=DB_PATH, pool_size=POOL_SIZE):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._write_lock = threading.Lock()
+        self._writer = _connect(self.path)
+        self._migrate()
+        # Read connections are created on demand up to pool_size and recycled.
+        self._readers = queue.LifoQueue()
+        self._reader_slots = threading.BoundedSemaphore(pool_size)
+
+    def _migrate(self):
+        conn = self._writer
+        for table, column, declaration in ADDED_COLUMNS:
+            columns = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+            if columns and column not in columns:
+                conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {declaration}")
+        conn.executescript(SCHEMA)
+        with self.transaction() as conn:
+            if conn.execute("SELECT NOT EXISTS (SELECT 1 FROM kyc_rollup) AND EXISTS (SELECT 1 FROM kyc_applications)"
+                            ).fetchone()[0]:
+                conn.execute(KYC_ROLLUP_REBUILD_SQL)
+
+    @contextmanager
+    def reader(self):
+        self._reader_slots.acquire()
+        try:
+            try:
+                conn = self._readers.get_nowait()
+            except queue.Empty:
+                conn = _connect(self.path)
+            try:
+                yield conn
+            finally:
+                self._readers.put(conn)
+        finally:
+            self._reader_slots.release()
+
+    @contextmanager
+    def transaction(self):
+        """Serialise a group of writes into one IMMEDIATE transaction."""
+        with self._write_lock:
+            conn = self._writer
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                yield conn
+            except BaseException:
+                conn.execute('ROLLBACK')
+                raise
+            conn.execute('COMMIT')
+
+    def insert(self, table, record, conn=None):
+        """Insert one record (a dict of column -> value) and return its rowid."""
+        columns = list(record)
+        sql = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})"
+        if conn is not None:
+            return conn.execute(sql, [record[c] for c in columns]).lastrowid
+        with self.transaction() as conn:
+            return conn.execute(sql, [record[c] for c in columns]).lastrowid
+
+    def insert_many(self, table, records, columns=None, conn=None):
+        """Insert a batch of records in a single transaction.
+
+        ``records`` is either a DataFrame or an iterable of dicts/tuples;
+        tuples must follow ``columns``. Returns the number of rows written.
+        """
+        import pandas as pd
+
+        if isinstance(records, pd.DataFrame):
+            columns = list(records.columns) if columns is None else columns
+            # Column-wise tolist() converts to Python scalars far faster than
+            # iterating rows (notably for Arrow-backed string columns).
+            rows = zip(*(records[c].tolist() for c in columns))
+        else:
+            records = list(records)
+            if not records:
+                return 0
+            if columns is None:
+                columns = list(records[0])
+            rows = (tuple(r[c] for c in columns) if isinstance(r, dict) else r for r in records)
+        sql = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})"
+        if conn is not None:
+            return conn.executemany(sql, rows).rowcount
+        with self.transaction() as conn:
+            return conn.executemany(sql, rows).rowcount
+
+    def query_df(self, sql, params=()):
+        import pandas as pd
+
+        with self.reader() as conn:
+            return pd.read_sql_query(sql, conn, params=params)
+
+    def query_one(self, sql, params=()):
+        with self.reader() as conn:
+            return conn.execute(sql, params).fetchone()
+
+    def is_empty(self, table):
+        return self.query_one(f"SELECT NOT EXISTS (SELECT 1 FROM {table})")[0] == 1
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store():
+    """Return the process-wide Store, creating (and seeding) it on first use."""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                store = Store()
+                seed_sample_data(store)
+                _store = store
+    return _store
+
+
+def seed_sample_data(store):
+    """Load the demo funds, holdings, investors, KYC applications and activity into an empty store."""
+    if not store.is_empty('funds'):
+        return
+    import pandas as pd
+
+    from fund_admin import activity, fees, nav
+    from fund_admin.sample_data import (
+        generate_activities, generate_kyc_applications, generate_nav_inputs, generate_sample_data,
+    )
+
+    funds_df, _, investors_df = generate_sample_data()
+    funds = funds_df.rename(columns={
+        'Fund Name': 'name',
+        'AUM (Million $)': 'aum_musd',
+        'Investors': 'investors',
+        'Status': 'status',
+        'Launch Date': 'launch_date',
+        'Management Fee (%)': 'management_fee',
+        'Performance Fee (%)': 'performance_fee',
+        'Hurdle Rate (%)': 'hurdle_rate',
+    })
+    names = investors_df['Investor Name'].str.split(' ', n=1, expand=True)
+    investors = pd.DataFrame({
+        'first_name': names[0],
+        'last_name': names[1],
+        'fund': investors_df['Fund'],
+        'investment_amount': investors_df['Investment Amount ($)'],
+        'status': investors_df['Status'],
+    })
+    kyc = generate_kyc_applications()
+    with store.transaction() as conn:
+        store.insert_many('funds', funds, conn=conn)
+        fund_ids = [row[0] for row in conn.execute("SELECT id FROM funds ORDER BY id")]
+        positions, prices, share_classes, accruals = generate_nav_inputs(fund_ids, funds['aum_musd'])
+        store.insert_many('positions', positions, conn=conn)
+        store.insert_many('prices', prices, conn=conn)
+        store.insert_many('share_classes', share_classes, conn=conn)
+        store.insert_many('accruals', accruals, conn=conn)
+        store.insert_many('investors', investors, conn=conn)
+        store.insert_many('kyc_applications', kyc, conn=conn)
+    # AUM shown on the Dashboard comes from the NAV run, not the seeded literals
+    run = nav.run_eod(store=store)
+    with store.transaction() as conn:
+        investor_rows = conn.execute("SELECT id, fund, investment_amount FROM investors ORDER BY id").fetchall()
+        fees.open_series(conn, investor_rows, run.nav_date)
+    log = activity.get_log()
+    if not len(log):
+        log.append_many(generate_activities())
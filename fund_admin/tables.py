@@ -0,0 +1,142 @@
+"""Server-side paginated, filterable tables.
+
+Filtering, sorting and paging run as SQL against the store, so only the
+visible page is materialised and sent to the browser. Row counts are
+cached until the next data.invalidate(); a source with a rollup table (per
+month of its date column and every filter column, like kyc_rollup) counts
+from the rollup unless a date range splits a month, and the others count
+over the indexed filter columns.
+"""
+import math
+from dataclasses import dataclass, field
+from datetime import timedelta
+
+import streamlit as st
+
+from fund_admin import data, options
+from fund_admin.store import get_store
+
+PAGE_SIZES = (25, 50, 100)
+
+
+@dataclass(frozen=True)
+class TableSource:
+    table: str
+    # Display label -> column, in display order
+    columns: dict
+    # Column -> allowed values, rendered as multiselect filters
+    filters: dict = field(default_factory=dict)
+    date_column: str = None
+    default_sort: str = 'id'
+    default_descending: bool = False
+    # Table of row counts by month ('YYYY-MM') of date_column and by every filter column
+    rollup: str = None
+
+
+FUNDS = TableSource(
+    table='funds',
+    columns={
+        'Fund Name': 'name',
+        'AUM (Million $)': 'aum_musd',
+        'Investors': 'investors',
+        'Status': 'status',
+        'Launch Date': 'launch_date',
+    },
+    filters={'status': options.FUND_STATUSES},
+    default_sort='id',
+)
+
+KYC_APPLICATIONS = TableSource(
+    table='kyc_applications',
+    columns={
+        'Applicant Name': 'applicant_name',
+        'Application Date': 'application_date',
+        'Status': 'status',
+        'Risk Level': 'risk_level',
+        'Documents': 'documents',
+        'Screening': 'screening_status',
+    },
+    filters={'status': options.KYC_STATUSES, 'risk_level': options.KYC_RISK_LEVELS},
+    date_column='application_date',
+    default_sort='application_date',
+    default_descending=True,
+    rollup='kyc_rollup',
+)
+
+
+def _where(date_column, selections, date_range):
+    clauses, params = [], []
+    for column, values in selections:
+        if values:
+            clauses.append(f"{column} IN ({', '.join('?' * len(values))})")
+            params.extend(values)
+    if date_column and date_range:
+        clauses.append(f"{date_column} BETWEEN ? AND ?")
+        params.extend(map(str, date_range))
+    return (' WHERE ' + ' AND '.join(clauses)) if clauses else '', params
+
+
+def _months(date_range):
+    """The first and last month of a date range made of whole months, () for no range, else None."""
+    if not date_range:
+        return ()
+    start, end = date_range
+    if start.day != 1 or (end + timedelta(days=1)).day != 1:
+        return None
+    return f'{start:%Y-%m}', f'{end:%Y-%m}'
+
+
+@data.cached
+def count_rows(table, date_column=None, selections=(), date_range=(), rollup=None):
+    months = _months(date_range) if rollup else None
+    if months is not None:
+        where, params = _where('month', selections, months)
+        return get_store().query_one(f"SELECT COALESCE(SUM(count), 0) FROM {rollup}{where}", params)[0]
+    where, params = _where(date_column, selections, date_range)
+    return get_store().query_one(f"SELECT COUNT(*) FROM {table}{where}", params)[0]
+
+
+def fetch_page(source, selections=(), date_range=(), sort=None, descending=False, page=1, page_size=PAGE_SIZES[0]):
+    sort = sort if sort in source.columns.values() else source.default_sort
+    where, params = _where(source.date_column, selections, date_range)
+    select = ', '.join(f'{column} AS "{label}"' for label, column in source.columns.items())
+    direction = 'DESC' if descending else 'ASC'
+    sql = (f"SELECT {select} FROM {source.table}{where} "
+           f"ORDER BY {sort} {direction}, id {direction} LIMIT ? OFFSET ?")
+    return get_store().query_df(sql, [*params, page_size, (page - 1) * page_size])
+
+
+def paginated_table(source, key):
+    """Render ``source`` with filter, sort and paging controls; returns the visible page."""
+    labels = {column: label for label, column in source.columns.items()}
+    controls = st.columns(len(source.filters) + (1 if source.date_column else 0) + 3)
+    selections = []
+    for i, (column, choices) in enumerate(source.filters.items()):
+        with controls[i]:
+            selections.append((column, tuple(st.multiselect(labels.get(column, column), choices, key=f"{key}_{column}"))))
+    date_range = ()
+    if source.date_column:
+        with controls[len(source.filters)]:
+            picked = st.date_input(labels[source.date_column], value=(), key=f"{key}_dates")
+            date_range = tuple(picked) if isinstance(picked, (list, tuple)) and len(picked) == 2 else ()
+    with controls[-3]:
+        sort_label = st.selectbox("Sort By", list(source.columns), key=f"{key}_sort",
+                                  index=list(source.columns.values()).index(source.default_sort)
+                                  if source.default_sort in source.columns.values() else 0)
+        descending = st.checkbox("Descending", value=source.default_descending, key=f"{key}_desc")
+    with controls[-2]:
+        page_size = st.selectbox("Rows per Page", PAGE_SIZES, key=f"{key}_page_size")
+
+    total = count_rows(source.table, source.date_column, tuple(selections), date_range, source.rollup)
+    pages = max(1, math.ceil(total / page_size))
+    page_key = f"{key}_page"
+    if st.session_state.get(page_key, 1) > pages:
+        st.session_state[page_key] = pages
+    with controls[-1]:
+        page = st.number_input("Page", min_value=1, max_value=pages, step=1, key=page_key)
+
+    page_df = fetch_page(source, tuple(selections), date_range, source.columns[sort_label], descending, page, page_size)
+    st.dataframe(page_df, use_container_width=True, hide_index=True)
+    offset = (page - 1) * page_size
+    st.caption(f"Showing {min(offset + 1, total):,}–{offset + len(page_df):,} of {total:,} (page {page:,} of {pages:,})")
+    return page_df
@@ -0,0 +1,36 @@
+"""Cold-start and per-rerun time budgets for Home.py.
+
+Home.py calls record_rerun() at the end of every script run. The first call
+in a process also reports the cold start, measured from when this module was
+first imported. Runs over budget are logged as warnings; tune the budgets
+with FUND_ADMIN_COLD_START_BUDGET_MS and FUND_ADMIN_RERUN_BUDGET_MS.
+"""
+import logging
+import os
+import time
+
+PROCESS_STARTED = time.perf_counter()
+COLD_START_BUDGET_MS = float(os.environ.get('FUND_ADMIN_COLD_START_BUDGET_MS', 2000))
+RERUN_BUDGET_MS = float(os.environ.get('FUND_ADMIN_RERUN_BUDGET_MS', 250))
+
+logger = logging.getLogger(__name__)
+_cold_start_ms = None
+
+
+def record_rerun(page, started):
+    """Log the duration of the rerun that began at ``started``; returns it in ms."""
+    global _cold_start_ms
+    finished = time.perf_counter()
+    elapsed_ms = (finished - started) * 1000
+    if _cold_start_ms is None:
+        _cold_start_ms = (finished - PROCESS_STARTED) * 1000
+        level = logging.WARNING if _cold_start_ms > COLD_START_BUDGET_MS else logging.INFO
+        logger.log(level, "Cold start to first render of %s: %.0f ms (budget %.0f ms)",
+                   page, _cold_start_ms, COLD_START_BUDGET_MS)
+    elif elapsed_ms > RERUN_BUDGET_MS:
+        logger.warning("Rerun of %s took %.0f ms (budget %.0f ms)", page, elapsed_ms, RERUN_BUDGET_MS)
+    return elapsed_ms
+
+
+def cold_start_ms():
+    return _cold_start_ms
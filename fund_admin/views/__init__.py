@@ -0,0 +1,23 @@
+"""Page modules rendered by Home.py.
+
+Each page lives in its own module with a render() function and is imported
+the first time it is visited, so heavy dependencies such as Plotly are only
+loaded by the pages that draw charts.
+"""
+import importlib
+
+PAGES = {
+    'Dashboard': 'fund_admin.views.dashboard',
+    'Analytics': 'fund_admin.views.analytics',
+    'Fund Onboarding': 'fund_admin.views.fund_onboarding',
+    'Client Onboarding': 'fund_admin.views.client_onboarding',
+    'Person Onboarding': 'fund_admin.views.person_onboarding',
+    'Investor Onboarding': 'fund_admin.views.investor_onboarding',
+    'AML / KYC': 'fund_admin.views.aml_kyc',
+    'Fund/Company Relationship': 'fund_admin.views.fund_company_relationship',
+    'Individual/Fund Relationship': 'fund_admin.views.individual_fund_relationship',
+}
+
+
+def render_page(name):
+    importlib.import_module(PAGES.get(name, PAGES['Dashboard'])).render()
@@ -0,0 +1,126 @@
+import time
+
+import streamlit as st
+import plotly.express as px
+import plotly.graph_objects as go
+
+from fund_admin import data, jobs, profiling, screening, tables
+from fund_admin.store import get_store
+from fund_admin.views.components import job_status
+
+
+def _dimension_label(value):
+    return "All" if value is None else value or "Unspecified"
+
+
+def render():
+    st.markdown('<div class="main-header"><h1>🔒 AML / KYC Compliance</h1></div>', unsafe_allow_html=True)
+    
+    with profiling.span('kyc_summary'):
+        dimensions = data.load_kyc_dimensions()
+        col1, col2 = st.columns(2)
+        jurisdiction = col1.selectbox("Jurisdiction", [None, *dimensions['jurisdiction']], key="kyc_jurisdiction",
+                                      format_func=_dimension_label)
+        investor_type = col2.selectbox("Investor Type", [None, *dimensions['investor_type']], key="kyc_investor_type",
+                                       format_func=_dimension_label)
+        kyc_summary = data.load_kyc_summary(jurisdiction=jurisdiction, investor_type=investor_type)
+    
+    # KYC Status Overview
+    with profiling.span('metric_cards'):
+        col1, col2, col3, col4 = st.columns(4)
+    
+        with col1:
+            st.markdown(f"""
+            <div class="metric-card">
+                <h3>📋 Total Applications</h3>
+                <h2>{kyc_summary.by_status.sum()}</h2>
+            </div>
+            """, unsafe_allow_html=True)
+    
+        with col2:
+            st.markdown(f"""
+            <div class="metric-card">
+                <h3>✅ Approved</h3>
+                <h2>{kyc_summary.by_status.get('Approved', 0)}</h2>
+            </div>
+            """, unsafe_allow_html=True)
+    
+        with col3:
+            st.markdown(f"""
+            <div class="metric-card">
+                <h3>⏳ Pending Review</h3>
+                <h2>{kyc_summary.by_status.get('Pending', 0)}</h2>
+            </div>
+            """, unsafe_allow_html=True)
+    
+        with col4:
+            st.markdown(f"""
+            <div class="metric-card">
+                <h3>❌ Rejected</h3>
+                <h2>{kyc_summary.by_status.get('Rejected', 0)}</h2>
+            </div>
+            """, unsafe_allow_html=True)
+    
+    # KYC Applications Table
+    st.subheader("📋 KYC Applications")
+    
+    with profiling.span('applications_table'):
+        tables.paginated_table(tables.KYC_APPLICATIONS, key="kyc_table")
+    
+    # Sanctions / PEP screening
+    st.subheader("🔎 Sanctions / PEP Screening")
+    with profiling.span('screening'):
+        with st.spinner("Loading watchlist index..."):
+            watchlist = screening.get_index()
+    
+        if watchlist is None:
+            st.info(f"No watchlist loaded. Place a CSV with a 'name' column at {screening.WATCHLIST_PATH} to enable screening.")
+        else:
+            col1, col2 = st.columns([3, 1])
+        
+            with col1:
+                applicant_name = st.text_input("Screen Applicant Name", key="screen_applicant_name")
+                if applicant_name:
+                    started = time.perf_counter()
+                    status, score, matches = screening.screen_name(applicant_name)
+                    elapsed_ms = (time.perf_counter() - started) * 1000
+                    if matches:
+                        st.warning(f"⚠️ {len(matches)} potential match(es) ({elapsed_ms:.1f} ms)")
+                        st.dataframe([match.__dict__ for match in matches], use_container_width=True)
+                    else:
+                        st.success(f"✅ No matches among {len(watchlist):,} watchlist entries ({elapsed_ms:.1f} ms)")
+        
+            with col2:
+                st.caption(f"{len(watchlist):,} watchlist entries")
+                if st.button("Rescreen Register", key="rescreen_btn"):
+                    store = get_store()
+                    with store.transaction() as conn:
+                        st.session_state.rescreen_job = jobs.enqueue(conn, 'rescreen_register', {},
+                                                                     key=screening.rescreen_key(store))
+                    jobs.notify('rescreen_register')
+                if 'rescreen_job' in st.session_state:
+                    job_status(st.session_state.rescreen_job, "Rescreen")
+    
+    # Risk Assessment
+    st.subheader("🎯 Risk Assessment")
+    with profiling.span('risk_charts'):
+        col1, col2 = st.columns(2)
+    
+        with col1:
+            # Risk distribution chart
+            risk_df = kyc_summary.by_risk.rename_axis('Risk Level').reset_index(name='Count')
+            fig_risk = px.bar(risk_df, x='Risk Level', y='Count', color='Risk Level',
+                             color_discrete_map={'Low': '#28a745', 'Medium': '#ffc107', 'High': '#dc3545'})
+            fig_risk.update_layout(height=300, title="Risk Level Distribution")
+            st.plotly_chart(fig_risk, use_container_width=True)
+    
+        with col2:
+            # Compliance timeline
+            timeline_df = kyc_summary.timeline
+            fig_timeline = go.Figure()
+            fig_timeline.add_trace(go.Scatter(x=timeline_df['Month'], y=timeline_df['Applications'], 
+                                            mode='lines+markers', name='Applications'))
+            fig_timeline.add_trace(go.Scatter(x=timeline_df['Month'], y=timeline_df['Approvals'], 
+                                            mode='lines+markers', name='Approvals'))
+            fig_timeline.update_layout(height=300, title="Monthly KYC Applications vs Approvals")
+            st.plotly_chart(fig_timeline, use_container_width=True)
@@ -0,0 +1,83 @@
+import pandas as pd
+import streamlit as st
+import plotly.express as px
+
+from fund_admin import analytics, charts, profiling
+
+# Window lengths offered, in months of history
+WINDOWS = {'3M': 3, '6M': 6, '1Y': 12, '3Y': 36}
+METRICS = {'Return': 'return', 'Volatility': 'volatility', 'Sharpe': 'sharpe', 'Sortino': 'sortino'}
+
+
+def _windows(levels):
+    """Window label -> periods, for the windows the loaded history can fill."""
+    periods = {label: max(round(months * levels.per_year / 12), 2) for label, months in WINDOWS.items()}
+    available = len(levels.dates) - 1
+    windows = {label: n for label, n in periods.items() if n <= available}
+    if available >= 2 and available not in windows.values():
+        windows['Full history'] = available
+    return windows
+
+
+def render():
+    st.markdown('<div class="main-header"><h1>📉 Risk / Return Analytics</h1></div>', unsafe_allow_html=True)
+
+    with profiling.span('levels'):
+        levels = analytics.load_levels()
+        windows = _windows(levels)
+    if not windows:
+        st.info("Not enough performance history for analytics yet.")
+        return
+
+    col1, col2 = st.columns([3, 1])
+    funds = col1.multiselect("Funds", levels.funds, default=levels.funds[:10], key="analytics_funds")
+    label = col2.selectbox("Window", list(windows), key="analytics_window")
+    window = windows[label]
+    dates = [pd.Timestamp(date).date() for date in levels.dates[window:]]
+    if len(dates) > 1:
+        as_of = st.select_slider("As of", options=dates, value=dates[-1], key="analytics_as_of")
+    else:
+        as_of = dates[-1]
+    if not funds:
+        st.caption("Select at least one fund.")
+        return
+
+    with profiling.span('snapshot'):
+        snapshot = analytics.snapshot(tuple(funds), window, as_of)
+
+    st.subheader(f"📋 {label} Metrics")
+    with profiling.span('metrics_table'):
+        st.dataframe(snapshot.stats, use_container_width=True, column_config={
+            'Return': st.column_config.NumberColumn(format="percent"),
+            'Volatility': st.column_config.NumberColumn(format="percent"),
+            'Sharpe': st.column_config.NumberColumn(format="%.2f"),
+            'Sortino': st.column_config.NumberColumn(format="%.2f"),
+            'Max Drawdown': st.column_config.NumberColumn(format="percent"),
+        })
+        st.caption(f"{window} periods to {as_of}; annualised at {levels.per_year} periods a year, "
+                   f"risk-free rate {analytics.RISK_FREE_RATE:.1%}")
+
+    col1, col2 = st.columns(2)
+
+    with col1, profiling.span('rolling_chart'):
+        st.subheader("📈 Rolling Metric")
+        metric = st.selectbox("Metric", list(METRICS), key="analytics_metric")
+        series_dates, metrics = analytics.rolling_series(tuple(funds), window, as_of)
+        with profiling.span('figure'):
+            frames = []
+            for i, fund in enumerate(funds):
+                x, y = charts.minmax_downsample(series_dates, metrics[METRICS[metric]][:, i],
+                                                charts.DEFAULT_WIDTH_PX)
+                frames.append(pd.DataFrame({'Date': x, metric: y, 'Fund': fund}))
+            fig_rolling = px.line(pd.concat(frames, ignore_index=True), x='Date', y=metric, color='Fund',
+                                  title=f"Rolling {label} {metric}")
+            fig_rolling.update_layout(height=400)
+        st.plotly_chart(fig_rolling, use_container_width=True)
+
+    with col2, profiling.span('correlation_chart'):
+        st.subheader("🔗 Correlation")
+        with profiling.span('figure'):
+            fig_correlation = px.imshow(snapshot.correlation, zmin=-1, zmax=1, color_continuous_scale='RdBu',
+                                        title=f"{label} Return Correlation")
+            fig_correlation.update_layout(height=400)
+        st.plotly_chart(fig_correlation, use_container_width=True)
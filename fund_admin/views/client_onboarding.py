@@ -0,0 +1,77 @@
+import streamlit as st
+
+from fund_admin import entities, onboarding, options, profiling
+from fund_admin.views.components import bulk_import_panel, duplicate_notice, job_status, screening_notice
+
+
+def render():
+    st.markdown('<div class="main-header"><h1>👥 Client Onboarding</h1></div>', unsafe_allow_html=True)
+    # Duplicate checks on submit need the entity index; load it while the form is filled in
+    entities.preload()
+    
+    bulk_import_panel('clients')
+    
+    with st.container():
+        st.markdown('<div class="form-container">', unsafe_allow_html=True)
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.subheader("Personal Information")
+            first_name = st.text_input("First Name")
+            last_name = st.text_input("Last Name")
+            email = st.text_input("Email Address")
+            phone = st.text_input("Phone Number")
+            date_of_birth = st.date_input("Date of Birth")
+        
+        with col2:
+            st.subheader("Address Information")
+            address_line1 = st.text_input("Address Line 1")
+            address_line2 = st.text_input("Address Line 2")
+            city = st.text_input("City")
+            state = st.text_input("State/Province")
+            postal_code = st.text_input("Postal Code")
+            country = st.selectbox("Country", options.COUNTRIES)
+        
+        st.subheader("Financial Information")
+        col3, col4 = st.columns(2)
+        
+        with col3:
+            annual_income = st.selectbox("Annual Income Range", options.ANNUAL_INCOME_RANGES)
+            net_worth = st.selectbox("Net Worth Range", options.NET_WORTH_RANGES)
+        
+        with col4:
+            investment_experience = st.selectbox("Investment Experience", options.INVESTMENT_EXPERIENCE)
+            risk_tolerance = st.select_slider("Risk Tolerance", options=options.RISK_TOLERANCE, value="Moderate")
+        
+        st.subheader("Investment Preferences")
+        investment_goals = st.multiselect("Investment Goals", ["Capital Preservation", "Income Generation", "Capital Growth", "Tax Efficiency", "Diversification"])
+        preferred_funds = st.multiselect("Preferred Fund Types", ["Growth Funds", "Income Funds", "Balanced Funds", "Tech Funds", "Real Estate Funds"])
+        
+        if st.button("Submit Client Application", type="primary"):
+            with profiling.span('submit'):
+                submission = onboarding.submit_client({
+                    'first_name': first_name,
+                    'last_name': last_name,
+                    'email': email,
+                    'phone': phone,
+                    'date_of_birth': date_of_birth.isoformat(),
+                    'address_line1': address_line1,
+                    'address_line2': address_line2,
+                    'city': city,
+                    'state': state,
+                    'postal_code': postal_code,
+                    'country': country,
+                    'annual_income': annual_income,
+                    'net_worth': net_worth,
+                    'investment_experience': investment_experience,
+                    'risk_tolerance': risk_tolerance,
+                    'investment_goals': ', '.join(investment_goals),
+                    'preferred_funds': ', '.join(preferred_funds),
+                })
+            st.success("✅ Client onboarding application submitted successfully!")
+            job_status(submission.job_id, "KYC verification")
+            screening_notice(submission)
+            duplicate_notice(submission)
+        
+        st.markdown('</div>', unsafe_allow_html=True)
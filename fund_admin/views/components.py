@@ -0,0 +1,126 @@
+from datetime import datetime
+
+import streamlit as st
+
+from fund_admin import jobs, options, ownership, profiling
+from fund_admin.store import DB_PATH
+
+
+# Bulk import panel shared by the Client and Investor onboarding pages
+def bulk_import_panel(kind):
+    with st.expander(f"📂 Bulk Import ({kind.title()})"):
+        st.caption("Upload a CSV or Parquet file with columns: " + ", ".join(options.BULK_IMPORT_COLUMNS[kind]))
+        uploaded = st.file_uploader("Import File", type=["csv", "parquet"], key=f"{kind}_import_file")
+        if uploaded is not None and st.button("Start Import", key=f"{kind}_import_btn"):
+            # Deferred: pulls in pandas/pyarrow, which the form itself never needs
+            from fund_admin import bulk_import
+
+            rejects_path = DB_PATH.parent / 'imports' / f"{kind}-rejects-{datetime.now():%Y%m%d-%H%M%S}.csv"
+            status = st.empty()
+            try:
+                result = bulk_import.import_file(
+                    uploaded, kind, rejects_path,
+                    progress=lambda r: status.info(f"⏳ {r.accepted:,} imported, {r.rejected:,} rejected so far..."),
+                )
+            except ValueError as exc:
+                status.error(f"❌ {exc}")
+            else:
+                status.success(f"✅ Imported {result.accepted:,} records ({result.rejected:,} rejected).")
+                if result.rejected:
+                    with open(result.rejects_path, 'rb') as f:
+                        st.download_button("Download Rejects", f, file_name=result.rejects_path.name, mime="text/csv")
+
+
+# Outcome of the sanctions/PEP screening run by the onboarding submit handlers
+def screening_notice(submission):
+    if submission.screening_status == 'Potential Match':
+        st.warning("⚠️ Potential sanctions/PEP match found. The application has been flagged as High risk "
+                   "for enhanced due diligence.")
+        st.dataframe([match.__dict__ for match in submission.matches], use_container_width=True)
+    elif submission.screening_status == 'Not Screened':
+        st.caption("ℹ️ No watchlist is loaded, so sanctions/PEP screening was skipped.")
+
+
+# Existing parties the onboarding submit handlers matched the applicant to
+def duplicate_notice(submission):
+    if submission.duplicates:
+        st.warning(f"⚠️ This applicant may already be on file ({len(submission.duplicates)} likely duplicate(s)). "
+                   "Check before starting another KYC review.")
+        st.dataframe([{
+            'Record': f"{duplicate.source.title()} #{duplicate.source_id}",
+            'Name': duplicate.name,
+            'Score': duplicate.score,
+            'Matched On': ", ".join(duplicate.matched).replace('_', ' '),
+        } for duplicate in submission.duplicates], use_container_width=True, hide_index=True)
+
+
+# Status of the background checks a submission queued, polled until they finish
+@st.fragment(run_every=2)
+def job_status(job_id, label):
+    job = jobs.get_job(job_id)
+    if job is None:
+        return
+    if job.status == jobs.SUCCEEDED:
+        result = job.result or {}
+        if 'potential_matches' in result:
+            st.success(f"✅ {label} complete: {result['potential_matches']:,} potential matches.")
+        elif result.get('documents') == 'Incomplete':
+            st.warning(f"⚠️ {label} complete: missing " + ", ".join(result['missing']).replace('_', ' ') + ".")
+        else:
+            st.success(f"✅ {label} complete (risk level: {result.get('risk_level', 'n/a')}).")
+    elif job.status == jobs.FAILED:
+        st.error(f"❌ {label} failed after {job.attempts} attempts; it will be reviewed manually.")
+    elif job.status == jobs.RUNNING:
+        st.info(f"⏳ {label} in progress...")
+    elif job.last_error:
+        st.info(f"⏳ {label} will be retried (attempt {job.attempts} of {job.max_attempts}).")
+    else:
+        st.info(f"⏳ {label} queued.")
+
+
+# Look-through ownership and control chain, shown on both relationship pages
+def ownership_look_through(entity, key):
+    with st.expander("🕸️ Ownership Look-Through", expanded=True):
+        entity = st.text_input("Entity", value=entity, key=f"{key}_ownership_entity").strip()
+        if not entity:
+            return
+        with profiling.span('ownership_look_through'):
+            graph = ownership.get_graph()
+            owners = graph.beneficial_owners(entity)
+            chain = graph.control_chain(entity)
+        if owners:
+            st.dataframe([{
+                'Beneficial Owner': owner.name,
+                'Effective Ownership (%)': round(owner.effective_share * 100, 2),
+                'Controls': owner.controls,
+            } for owner in owners], use_container_width=True, hide_index=True)
+        else:
+            st.caption(f"No owner holds {ownership.UBO_THRESHOLD:.0%} or more of {entity} through any chain.")
+        if len(chain) > 1:
+            st.caption("Control chain: " + " → ".join(chain))
+
+
+# Sidebar debug panel, shown when FUND_ADMIN_PROFILE is set
+def profiler_panel():
+    with st.sidebar.expander("⏱️ Profiler"):
+        if st.button("Profile Next Rerun", key="profile_rerun_btn", help="Run the next rerun under cProfile"):
+            st.session_state.profile_next_rerun = True
+            st.rerun()
+        reruns = profiling.history()
+        if not reruns:
+            st.caption("No reruns recorded yet.")
+            return
+        st.dataframe([{
+            'Time': datetime.fromtimestamp(rerun.started_at).strftime('%H:%M:%S'),
+            'Page': rerun.page,
+            'Total (ms)': round(rerun.total_ms, 1),
+            **{span.name: round(span.ms, 1) for span in rerun.spans if span.depth == 0},
+        } for rerun in reruns], use_container_width=True, hide_index=True)
+        labels = [f"{datetime.fromtimestamp(r.started_at):%H:%M:%S} {r.page} ({r.total_ms:,.0f} ms)" for r in reruns]
+        choice = st.selectbox("Rerun", range(len(reruns)), format_func=labels.__getitem__, key="profile_rerun")
+        rerun = reruns[choice]
+        covered = sum(span.ms for span in rerun.spans if span.depth == 0)
+        st.text('\n'.join([f"{'  ' * span.depth}{span.name:<{28 - 2 * span.depth}} {span.ms:>9,.1f} ms"
+                           for span in rerun.spans] + [f"{'(outside spans)':<28} {rerun.total_ms - covered:>9,.1f} ms"]))
+        if rerun.profile:
+            st.code(rerun.profile, language=None)
@@ -0,0 +1,135 @@
+import streamlit as st
+import pandas as pd
+import plotly.express as px
+
+from fund_admin import activity, charts, data, kpis, profiling, tables
+from fund_admin.store import get_store
+
+RECENT_ACTIVITIES = 10
+# Funds shown as their own slice of the AUM pie (as in export.PIE_SLICES); the rest are merged into "Other"
+PIE_SLICES = 20
+# Funds offered by the activity fund picker at a time; the search box narrows the rest
+FUND_PICKER_OPTIONS = 50
+
+
+def _fund_picker(container, names):
+    """A fund chosen from the first FUND_PICKER_OPTIONS names matching a search, or None for all funds."""
+    search = container.text_input("Fund", placeholder="Search funds", key="activity_fund_search").strip()
+    if search:
+        names = names[names.str.contains(search, case=False, regex=False)]
+    options = ["All Funds", *names.head(FUND_PICKER_OPTIONS)]
+    if len(names) > FUND_PICKER_OPTIONS:
+        container.caption(f"Showing {FUND_PICKER_OPTIONS} of {len(names):,} funds; search to narrow.")
+    fund = container.selectbox("Matching Funds", options, key="activity_fund", label_visibility="collapsed")
+    return None if fund == "All Funds" else fund
+
+
+def render():
+    st.markdown('<div class="main-header"><h1>📊 Dashboard Overview</h1></div>', unsafe_allow_html=True)
+    
+    # Load shared datasets (built once per process, not on every rerun)
+    with profiling.span('datasets'):
+        datasets = data.load_datasets()
+        funds_df, performance_df = datasets.funds, datasets.performance
+        aggregator = kpis.get_aggregator()
+        totals = aggregator.snapshot()
+        # A NAV published by another process: bring the cards up to the datasets
+        if datasets.nav_date and datasets.nav_date > (totals.nav_date or ''):
+            aggregator.resync(get_store())
+            totals = aggregator.snapshot()
+    
+    # Key metrics
+    with profiling.span('metric_cards'):
+        col1, col2, col3, col4 = st.columns(4)
+    
+        with col1:
+            st.markdown(f"""
+            <div class="metric-card">
+                <h3>💰 Total AUM</h3>
+                <h2>${totals.aum_musd:,.0f}M</h2>
+            </div>
+            """, unsafe_allow_html=True)
+    
+        with col2:
+            st.markdown(f"""
+            <div class="metric-card">
+                <h3>👥 Total Investors</h3>
+                <h2>{totals.investors}</h2>
+            </div>
+            """, unsafe_allow_html=True)
+    
+        with col3:
+            st.markdown(f"""
+            <div class="metric-card">
+                <h3>📈 Active Funds</h3>
+                <h2>{totals.active_funds}</h2>
+            </div>
+            """, unsafe_allow_html=True)
+    
+        with col4:
+            st.markdown(f"""
+            <div class="metric-card">
+                <h3>⏳ Pending Approvals</h3>
+                <h2>{totals.pending_funds}</h2>
+            </div>
+            """, unsafe_allow_html=True)
+    
+    # Charts
+    col1, col2 = st.columns(2)
+    
+    with col1, profiling.span('performance_chart'):
+        st.subheader("📈 Fund Performance")
+        fund_series = charts.load_performance_series()
+        first_date, last_date = charts.performance_date_bounds()
+        selected_funds = st.multiselect("Funds", list(fund_series), default=list(fund_series)[:10], key="performance_funds")
+        if first_date < last_date:
+            window = st.slider("Date Range", min_value=first_date, max_value=last_date,
+                               value=(first_date, last_date), format="YYYY-MM-DD", key="performance_window")
+        else:
+            window = (first_date, last_date)
+        with profiling.span('figure'):
+            fig_performance = charts.performance_figure(selected_funds, *window)
+        with profiling.span('plotly_chart'):
+            st.plotly_chart(fig_performance, use_container_width=True)
+    
+    with col2, profiling.span('aum_chart'):
+        st.subheader("💰 AUM Distribution")
+        with profiling.span('figure'):
+            fig_aum = px.pie(
+                data.load_aum_slices(PIE_SLICES), 
+                values='AUM (Million $)', 
+                names='Fund Name',
+                title="Assets Under Management by Fund"
+            )
+            fig_aum.update_layout(height=400)
+        with profiling.span('plotly_chart'):
+            st.plotly_chart(fig_aum, use_container_width=True)
+        if datasets.nav_date:
+            st.caption(f"NAV as of {datasets.nav_date}")
+    
+    # Fund table
+    st.subheader("📋 Fund Overview")
+    with profiling.span('fund_table'):
+        tables.paginated_table(tables.FUNDS, key="funds_table")
+    
+    # Recent activities
+    st.subheader("🔄 Recent Activities")
+    with profiling.span('activities'):
+        col1, col2 = st.columns(2)
+        fund = _fund_picker(col1, funds_df['Fund Name'])
+        status = col2.selectbox("Status", ["All Statuses", *activity.STATUSES], key="activity_status")
+        activities = activity.get_log().tail(
+            RECENT_ACTIVITIES,
+            fund=fund,
+            status=None if status == "All Statuses" else status,
+        )
+        
+        if activities:
+            activities_df = pd.DataFrame({
+                "Date": [event['ts'].replace('T', ' ')[:16] for event in activities],
+                "Activity": [event['message'] for event in activities],
+                "Status": [event['status'] for event in activities],
+            })
+            st.dataframe(activities_df, use_container_width=True, hide_index=True)
+        else:
+            st.caption("No matching activity recorded yet.")
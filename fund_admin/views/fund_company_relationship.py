@@ -0,0 +1,63 @@
+import streamlit as st
+
+from fund_admin import onboarding, options, profiling
+from fund_admin.views.components import ownership_look_through
+
+
+def render():
+    st.markdown('<div class="main-header"><h1>🔗 Fund / Company Relationship</h1></div>', unsafe_allow_html=True)
+    
+    with st.container():
+        st.markdown('<div class="form-container">', unsafe_allow_html=True)
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.subheader("Fund Information")
+            fund_name = st.selectbox("Fund Name", options.FUND_NAMES)
+            fund_manager = st.text_input("Fund Manager")
+            fund_administrator = st.text_input("Fund Administrator")
+        
+        with col2:
+            st.subheader("Company Information")
+            company_name = st.text_input("Company Name")
+            company_type = st.selectbox("Company Type", ["Investment Manager", "Administrator", "Custodian", "Auditor", "Legal Counsel", "Holding Company", "Feeder Fund", "Fund of Funds"])
+            relationship_type = st.selectbox("Relationship Type", ["Primary", "Secondary", "Advisory", "Service Provider"])
+        
+        st.subheader("Relationship Details")
+        col3, col4 = st.columns(2)
+        
+        with col3:
+            start_date = st.date_input("Relationship Start Date")
+            contract_value = st.number_input("Contract Value ($)", min_value=0, value=50000)
+            ownership_percentage = st.number_input("Ownership in Fund (%)", min_value=0.0, max_value=100.0, value=0.0, step=0.1,
+                                                   help="Stake the company holds in the fund, e.g. a feeder or fund of funds")
+        
+        with col4:
+            renewal_date = st.date_input("Contract Renewal Date")
+            status = st.selectbox("Status", ["Active", "Pending", "Terminated", "Under Review"])
+        
+        st.subheader("Services Provided")
+        services = st.multiselect("Services", ["Fund Administration", "Custody Services", "Audit Services", "Legal Services", "Compliance Monitoring", "Risk Management"])
+        
+        if st.button("Submit Relationship", type="primary"):
+            with profiling.span('submit'):
+                onboarding.submit_fund_company_relationship({
+                    'fund': fund_name,
+                    'fund_manager': fund_manager,
+                    'fund_administrator': fund_administrator,
+                    'company_name': company_name,
+                    'company_type': company_type,
+                    'relationship_type': relationship_type,
+                    'start_date': start_date.isoformat(),
+                    'contract_value': contract_value,
+                    'renewal_date': renewal_date.isoformat(),
+                    'status': status,
+                    'services': ', '.join(services),
+                    'ownership_percentage': ownership_percentage,
+                })
+            st.success("✅ Fund/Company relationship recorded successfully!")
+
+        ownership_look_through(fund_name, key="fund_company")
+        
+        st.markdown('</div>', unsafe_allow_html=True)
@@ -0,0 +1,73 @@
+import sqlite3
+
+import streamlit as st
+
+from fund_admin import onboarding, profiling
+
+
+def render():
+    st.markdown('<div class="main-header"><h1>📝 Fund Onboarding</h1></div>', unsafe_allow_html=True)
+    
+    with st.container():
+        st.markdown('<div class="form-container">', unsafe_allow_html=True)
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.subheader("Fund Information")
+            fund_name = st.text_input("Fund Name")
+            fund_type = st.selectbox("Fund Type", ["Growth Fund", "Income Fund", "Balanced Fund", "Tech Fund", "Real Estate Fund"])
+            investment_strategy = st.text_area("Investment Strategy")
+            target_aum = st.number_input("Target AUM (Million $)", min_value=1, value=100)
+        
+        with col2:
+            st.subheader("Legal Information")
+            legal_entity = st.text_input("Legal Entity Name")
+            jurisdiction = st.selectbox("Jurisdiction", ["Cayman Islands", "Luxembourg", "Ireland", "Singapore", "United States"])
+            launch_date = st.date_input("Expected Launch Date")
+            management_fee = st.number_input("Management Fee (%)", min_value=0.0, max_value=5.0, value=1.5, step=0.1)
+            performance_fee = st.number_input("Performance Fee (%)", min_value=0.0, max_value=50.0, value=20.0, step=0.5)
+            hurdle_rate = st.number_input("Hurdle Rate (% p.a.)", min_value=0.0, max_value=20.0, value=0.0, step=0.25)
+        
+        st.subheader("Risk Profile")
+        risk_level = st.select_slider("Risk Level", options=["Conservative", "Moderate", "Aggressive"], value="Moderate")
+        
+        col3, col4 = st.columns(2)
+        with col3:
+            min_investment = st.number_input("Minimum Investment ($)", min_value=1000, value=100000)
+            lock_period = st.number_input("Lock Period (Months)", min_value=0, value=12)
+        
+        with col4:
+            redemption_frequency = st.selectbox("Redemption Frequency", ["Monthly", "Quarterly", "Semi-annually", "Annually"])
+            subscription_frequency = st.selectbox("Subscription Frequency", ["Daily", "Weekly", "Monthly", "Quarterly"])
+            redemption_gate = st.number_input("Redemption Gate (% of NAV)", min_value=1.0, max_value=100.0, value=25.0,
+                                              step=5.0)
+        
+        if st.button("Submit Fund Application", type="primary"):
+            try:
+                with profiling.span('submit'):
+                    onboarding.submit_fund({
+                        'name': fund_name,
+                        'fund_type': fund_type,
+                        'investment_strategy': investment_strategy,
+                        'target_aum_musd': target_aum,
+                        'legal_entity': legal_entity,
+                        'jurisdiction': jurisdiction,
+                        'launch_date': launch_date.isoformat(),
+                        'management_fee': management_fee,
+                        'performance_fee': performance_fee,
+                        'hurdle_rate': hurdle_rate,
+                        'risk_level': risk_level,
+                        'min_investment': min_investment,
+                        'lock_period_months': lock_period,
+                        'redemption_frequency': redemption_frequency,
+                        'subscription_frequency': subscription_frequency,
+                        'redemption_gate': redemption_gate,
+                    })
+            except sqlite3.IntegrityError:
+                st.error(f"❌ A fund named '{fund_name}' is already registered.")
+            else:
+                st.success("✅ Fund onboarding application submitted successfully!")
+                st.info("Your application will be reviewed within 3-5 business days.")
+        
+        st.markdown('</div>', unsafe_allow_html=True)
@@ -0,0 +1,64 @@
+import streamlit as st
+
+from fund_admin import onboarding, options, profiling
+from fund_admin.views.components import ownership_look_through
+
+
+def render():
+    st.markdown('<div class="main-header"><h1>👤 Individual / Fund Relationship</h1></div>', unsafe_allow_html=True)
+    
+    with st.container():
+        st.markdown('<div class="form-container">', unsafe_allow_html=True)
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.subheader("Individual Information")
+            individual_name = st.text_input("Individual Name")
+            individual_type = st.selectbox("Individual Type", ["Investor", "Fund Manager", "Board Member", "Advisor", "Employee"])
+            email = st.text_input("Email Address")
+            phone = st.text_input("Phone Number")
+        
+        with col2:
+            st.subheader("Fund Information")
+            fund_name = st.selectbox("Fund Name", options.FUND_NAMES)
+            role_in_fund = st.selectbox("Role in Fund", ["Investor", "Fund Manager", "Board Member", "Advisor", "Employee"])
+            start_date = st.date_input("Start Date")
+        
+        st.subheader("Relationship Details")
+        col3, col4 = st.columns(2)
+        
+        with col3:
+            investment_amount = st.number_input("Investment Amount ($)", min_value=0, value=100000)
+            ownership_percentage = st.number_input("Ownership Percentage (%)", min_value=0.0, max_value=100.0, value=5.0, step=0.1)
+        
+        with col4:
+            voting_rights = st.checkbox("Voting Rights")
+            board_seat = st.checkbox("Board Seat")
+        
+        st.subheader("Additional Information")
+        compensation_type = st.selectbox("Compensation Type", ["Salary", "Performance Fee", "Management Fee", "Carried Interest", "None"])
+        reporting_frequency = st.selectbox("Reporting Frequency", ["Monthly", "Quarterly", "Semi-annually", "Annually"])
+        
+        if st.button("Submit Relationship", type="primary"):
+            with profiling.span('submit'):
+                onboarding.submit_individual_fund_relationship({
+                    'individual_name': individual_name,
+                    'individual_type': individual_type,
+                    'email': email,
+                    'phone': phone,
+                    'fund': fund_name,
+                    'role_in_fund': role_in_fund,
+                    'start_date': start_date.isoformat(),
+                    'investment_amount': investment_amount,
+                    'ownership_percentage': ownership_percentage,
+                    'voting_rights': voting_rights,
+                    'board_seat': board_seat,
+                    'compensation_type': compensation_type,
+                    'reporting_frequency': reporting_frequency,
+                })
+            st.success("✅ Individual/Fund relationship recorded successfully!")
+
+        ownership_look_through(fund_name, key="individual_fund")
+        
+        st.markdown('</div>', unsafe_allow_html=True)
@@ -0,0 +1,79 @@
+import streamlit as st
+
+from fund_admin import entities, onboarding, options, profiling
+from fund_admin.views.components import bulk_import_panel, duplicate_notice, job_status, screening_notice
+
+
+def render():
+    st.markdown('<div class="main-header"><h1>💼 Investor Onboarding</h1></div>', unsafe_allow_html=True)
+    # Duplicate checks on submit need the entity index; load it while the form is filled in
+    entities.preload()
+    
+    bulk_import_panel('investors')
+    
+    with st.container():
+        st.markdown('<div class="form-container">', unsafe_allow_html=True)
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.subheader("Investor Information")
+            investor_type = st.selectbox("Investor Type", options.INVESTOR_TYPES)
+            first_name = st.text_input("First Name")
+            last_name = st.text_input("Last Name")
+            email = st.text_input("Email Address")
+            phone = st.text_input("Phone Number")
+        
+        with col2:
+            st.subheader("Investment Details")
+            target_fund = st.selectbox("Target Fund", options.FUND_NAMES)
+            investment_amount = st.number_input("Investment Amount ($)", min_value=options.MIN_INVESTMENT_AMOUNT, value=100000, step=10000)
+            investment_source = st.selectbox("Source of Funds", options.SOURCES_OF_FUNDS)
+        
+        st.subheader("Financial Profile")
+        col3, col4 = st.columns(2)
+        
+        with col3:
+            annual_income = st.selectbox("Annual Income Range", options.ANNUAL_INCOME_RANGES)
+            net_worth = st.selectbox("Net Worth Range", options.NET_WORTH_RANGES)
+        
+        with col4:
+            investment_experience = st.selectbox("Investment Experience", options.INVESTMENT_EXPERIENCE)
+            risk_tolerance = st.select_slider("Risk Tolerance", options=options.RISK_TOLERANCE, value="Moderate")
+        
+        st.subheader("Documentation")
+        kyc_completed = st.checkbox("KYC Documentation Completed")
+        st.caption("🔎 AML sanctions/PEP screening runs automatically when the application is submitted.")
+        suitability_assessment = st.checkbox("Suitability Assessment Completed")
+        
+        if st.button("Submit Investor Application", type="primary"):
+            if kyc_completed and suitability_assessment:
+                with profiling.span('submit'):
+                    submission = onboarding.submit_investor({
+                        'investor_type': investor_type,
+                        'first_name': first_name,
+                        'last_name': last_name,
+                        'email': email,
+                        'phone': phone,
+                        'fund': target_fund,
+                        'investment_amount': investment_amount,
+                        'source_of_funds': investment_source,
+                        'annual_income': annual_income,
+                        'net_worth': net_worth,
+                        'investment_experience': investment_experience,
+                        'risk_tolerance': risk_tolerance,
+                        'kyc_completed': kyc_completed,
+                        'suitability_assessment': suitability_assessment,
+                    })
+                st.success("✅ Investor onboarding application submitted successfully!")
+                if submission.dealing_date:
+                    st.info(f"Your subscription will be dealt at the NAV of {submission.dealing_date}.")
+                else:
+                    st.info("Your investment will be processed within 2-3 business days.")
+                job_status(submission.job_id, "KYC verification")
+                screening_notice(submission)
+                duplicate_notice(submission)
+            else:
+                st.error("❌ Please complete all required documentation before submitting.")
+        
+        st.markdown('</div>', unsafe_allow_html=True)
@@ -0,0 +1,77 @@
+import streamlit as st
+
+from fund_admin import entities, onboarding, options, profiling
+from fund_admin.views.components import duplicate_notice, job_status, screening_notice
+
+
+def render():
+    st.markdown('<div class="main-header"><h1>👤 Person Onboarding</h1></div>', unsafe_allow_html=True)
+    # Duplicate checks on submit need the entity index; load it while the form is filled in
+    entities.preload()
+    
+    with st.container():
+        st.markdown('<div class="form-container">', unsafe_allow_html=True)
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.subheader("Personal Details")
+            first_name = st.text_input("First Name")
+            last_name = st.text_input("Last Name")
+            email = st.text_input("Email Address")
+            phone = st.text_input("Phone Number")
+            date_of_birth = st.date_input("Date of Birth")
+            nationality = st.selectbox("Nationality", ["US Citizen", "Canadian", "UK Citizen", "German", "French", "Other"])
+        
+        with col2:
+            st.subheader("Professional Information")
+            job_title = st.text_input("Job Title")
+            company = st.text_input("Company")
+            industry = st.selectbox("Industry", ["Finance", "Technology", "Healthcare", "Real Estate", "Manufacturing", "Other"])
+            years_experience = st.number_input("Years of Experience", min_value=0, value=5)
+        
+        st.subheader("Address Information")
+        col3, col4 = st.columns(2)
+        
+        with col3:
+            address_line1 = st.text_input("Address Line 1")
+            address_line2 = st.text_input("Address Line 2")
+            city = st.text_input("City")
+        
+        with col4:
+            state = st.text_input("State/Province")
+            postal_code = st.text_input("Postal Code")
+            country = st.selectbox("Country", options.COUNTRIES)
+        
+        st.subheader("Additional Information")
+        education_level = st.selectbox("Education Level", ["High School", "Bachelor's Degree", "Master's Degree", "PhD", "Professional Certification"])
+        certifications = st.multiselect("Professional Certifications", ["CFA", "CPA", "CAIA", "FRM", "PMP", "None"])
+        
+        if st.button("Submit Person Application", type="primary"):
+            with profiling.span('submit'):
+                submission = onboarding.submit_person({
+                    'first_name': first_name,
+                    'last_name': last_name,
+                    'email': email,
+                    'phone': phone,
+                    'date_of_birth': date_of_birth.isoformat(),
+                    'nationality': nationality,
+                    'job_title': job_title,
+                    'company': company,
+                    'industry': industry,
+                    'years_experience': years_experience,
+                    'address_line1': address_line1,
+                    'address_line2': address_line2,
+                    'city': city,
+                    'state': state,
+                    'postal_code': postal_code,
+                    'country': country,
+                    'education_level': education_level,
+                    'certifications': ', '.join(certifications),
+                })
+            st.success("✅ Person onboarding application submitted successfully!")
+            job_status(submission.job_id, "Background verification")
+            screening_notice(submission)
+            duplicate_notice(submission)
+        
+        st.markdown('</div>', unsafe_allow_html=True)
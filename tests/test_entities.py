@@ -0,0 +1,20 @@
+from fund_admin import entities
+from fund_admin.store import Store
+
+COLUMNS = ['first_name', 'last_name', 'email', 'phone', 'date_of_birth']
+
+
+def test_dedupe_scores_pairs_whose_first_shared_block_is_oversized(tmp_path):
+    store = Store(tmp_path / 'fund_admin.db', pool_size=1)
+    # A placeholder email shared by more parties than a block may hold
+    placeholder = [(f'Person{i}', f'Surname{i}', 'noreply@example.com', None, None)
+                   for i in range(entities.MAX_BLOCK_SIZE + 1)]
+    pair = [('Jon', 'Smith', 'noreply@example.com', '+1 212 555 0100', '1980-01-02'),
+            ('John', 'Smith', 'noreply@example.com', '212-555-0100', '1980-01-02')]
+    store.insert_many('clients', placeholder + pair, columns=COLUMNS)
+
+    parties, pairs, clusters = entities.dedupe(store, workers=1)
+
+    first, second = len(parties) - 2, len(parties) - 1
+    assert entities.EntityIndex(parties).find(parties[second])[0].source_id == parties[first].source_id
+    assert [sorted(cluster) for cluster in clusters] == [[first, second]]